@@ -0,0 +1,21 @@
+"""Benchmarks for the breakdown tables the dashboard builds after each calculation."""
+
+import pytest
+
+import eugene_roi_dashboard as dashboard
+
+
+@pytest.mark.benchmark(group="revenue_breakdown")
+def test_revenue_breakdown(benchmark, scenario, results):
+    frame = benchmark(dashboard.revenue_breakdown, results)
+    assert len(frame) == 2 * len(scenario["test_configs"])
+
+@pytest.mark.benchmark(group="savings_breakdown")
+def test_savings_breakdown(benchmark, results):
+    frame = benchmark(dashboard.savings_breakdown, results)
+    assert len(frame) == len(results["variants"]["test_type"])
+
+@pytest.mark.benchmark(group="patient_savings_breakdown")
+def test_patient_savings_breakdown(benchmark, results):
+    frame = benchmark(dashboard.patient_savings_breakdown, results)
+    assert len(frame) == len(results["variants"]["test_type"]) // 2
@@ -0,0 +1,40 @@
+"""Benchmarks for the engine calculation functions."""
+
+import pytest
+
+import eugene_roi_engine as engine
+
+
+@pytest.mark.benchmark(group="calculate_annual_staff_costs")
+def test_calculate_annual_staff_costs(benchmark, scenario):
+    total = benchmark(
+        engine.calculate_annual_staff_costs,
+        scenario["staff"], scenario["test_configs"], scenario["practice"]["weeks_year"]
+    )
+    assert total > 0
+
+@pytest.mark.benchmark(group="calculate_efficiency_savings")
+def test_calculate_efficiency_savings(benchmark, scenario):
+    savings, patient_savings = benchmark(
+        engine.calculate_efficiency_savings,
+        scenario["test_configs"], scenario["staff"], scenario["practice"]["weeks_year"], scenario["simplified_mode"]
+    )
+    assert len(savings) == 2 * len(scenario["test_configs"])
+
+@pytest.mark.benchmark(group="calculate_revenue")
+def test_calculate_revenue(benchmark, scenario):
+    total_revenue, _, _, table = benchmark(
+        engine.calculate_revenue,
+        scenario["test_configs"], scenario["practice"]["specialty"], scenario["billing"], scenario["practice"]
+    )
+    assert total_revenue > 0
+    assert len(table["test_type"]) == 2 * len(scenario["test_configs"])
+
+@pytest.mark.benchmark(group="run_calculations")
+def test_run_calculations(benchmark, scenario):
+    results = benchmark(
+        engine.run_calculations,
+        scenario["practice"], scenario["staff"], scenario["billing"],
+        scenario["test_configs"], scenario["logistics"], scenario["simplified_mode"]
+    )
+    assert results["net_annual_benefit"] != 0
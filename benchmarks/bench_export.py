@@ -0,0 +1,13 @@
+"""Benchmarks for the Excel report behind `export_to_excel` (built uncached on every round)."""
+
+import pytest
+
+import eugene_roi_export as export
+
+
+@pytest.mark.benchmark(group="export_to_excel")
+@pytest.mark.parametrize("show_logistics", [False, True], ids=["clinician", "owner"])
+def test_report_bytes(benchmark, results, show_logistics):
+    data = benchmark(export.report_bytes, results, show_logistics)
+    assert data[:2] == b"PK"
+
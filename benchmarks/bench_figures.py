@@ -0,0 +1,64 @@
+"""
+Benchmarks for the dashboard's headline charts: build + serialize time per rerun and payload size.
+
+`plotly_express` rebuilds the chart the way the dashboard did before
+`eugene_roi_figures` (kept here as the reference point); `graph_objects` and
+`compact` build it fresh each round, `cached` is a rerun with unchanged
+results. Each round also serializes the figure as Streamlit does, and the
+figure JSON size is recorded in `extra_info["payload_bytes"]`.
+"""
+
+import plotly.express as px
+import plotly.io as pio
+import pytest
+
+import eugene_roi_figures as figures
+
+
+def express_impact_figure(results, show_logistics=False):
+    """Impact chart built with Plotly Express (the pre-`eugene_roi_figures` dashboard code)."""
+    labels = list(figures.IMPACT_COLORS)[:3 if show_logistics else 2]
+    values = [results["total_annual_savings"], results["total_revenue"], results["logistical_costs"]][:len(labels)]
+    fig = px.bar(
+        {"Category": labels, "Amount": values, "Explanation": [figures.IMPACT_EXPLANATIONS[label] for label in labels]},
+        x="Category", y="Amount", color="Category", text="Amount",
+        hover_data={"Explanation": True, "Amount": False, "Category": False},
+        color_discrete_map=figures.IMPACT_COLORS
+    )
+    fig.update_traces(texttemplate="%{text:$.0f}", textposition="outside", hovertemplate="%{customdata[0]}")
+    fig.update_layout(
+        title="Eugene’s Impact: Savings and Revenue Opportunities",
+        yaxis=dict(title="Amount", tickformat=",.0f"),
+        **figures.TRANSPARENT_LAYOUT
+    )
+    return fig
+
+def render(fig):
+    """What `st.plotly_chart` does with a figure on every rerun."""
+    fig.to_dict()
+    return pio.to_json(fig, validate=False)
+
+
+@pytest.mark.benchmark(group="impact_chart")
+@pytest.mark.parametrize("path", ["plotly_express", "graph_objects", "compact", "cached"])
+def test_impact_chart(benchmark, results, path):
+    cache = figures.FigureCache()
+    values = (results["total_annual_savings"], results["total_revenue"], results["logistical_costs"], True)
+
+    def build():
+        if path == "plotly_express":
+            return express_impact_figure(results, True)
+        if path == "cached":
+            return cache.get("impact", lambda: figures.impact_figure(results, True), *values)
+        return figures.impact_figure(results, True, compact=path == "compact")
+
+    payload = benchmark(lambda: render(build()))
+    benchmark.extra_info["payload_bytes"] = len(payload.encode("utf-8"))
+    if path != "plotly_express":
+        assert len(payload) < len(render(express_impact_figure(results, True)))
+
+@pytest.mark.benchmark(group="before_after_chart")
+@pytest.mark.parametrize("compact", [False, True], ids=["full", "compact"])
+def test_before_after_chart(benchmark, results, compact):
+    payload = benchmark(lambda: render(figures.before_after_figure(results, compact)))
+    benchmark.extra_info["payload_bytes"] = len(payload.encode("utf-8"))
@@ -0,0 +1,45 @@
+"""Benchmarks for the network rollup: evaluating a table of sites and summing it per group."""
+
+import random
+
+import pandas as pd
+import pytest
+
+import eugene_roi_engine as engine
+import eugene_roi_network as network
+from conftest import SEED
+
+# ✅ Sites per network (a 40-site group, a few hundred sites, a national chain)
+NETWORK_SIZES = [40, 400, 4_000]
+
+
+def synthetic_sites(n_sites, seed=SEED):
+    """`n_sites` editor rows with random regions, specialties, billing models and volumes."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n_sites):
+        model = rng.choice(["Bulk Bill", "Mixed", "Private"])
+        rows.append({
+            "site": f"Site {i + 1}",
+            "region": rng.choice(["Metro", "Regional", "Remote"]),
+            "specialty": rng.choice(list(engine.SPECIALTY_MBS)),
+            "billing_model": model,
+            "private_hourly": 0.0 if model == "Bulk Bill" else float(rng.randint(100, 800)),
+            "bulk_rate": float(rng.randint(0, 100)) if model == "Mixed" else 0.0,
+            **{column: rng.randint(0, 100) for column in network.BASE_VOLUME_COLUMNS}
+        })
+    return pd.DataFrame(rows)
+
+
+@pytest.mark.benchmark(group="network_rollup")
+@pytest.mark.parametrize("n_sites", NETWORK_SIZES)
+def test_network_rollup(benchmark, n_sites):
+    sites = synthetic_sites(n_sites)
+
+    def rerun():
+        site_results = network.evaluate_sites(sites)
+        return site_results, {by: network.rollup(site_results, by) for by in network.GROUP_COLUMNS}
+
+    site_results, rollups = benchmark(rerun)
+    assert len(site_results) == n_sites
+    assert rollups["region"]["sites"].sum() == n_sites
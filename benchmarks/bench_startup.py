@@ -0,0 +1,97 @@
+"""
+Startup import-time report with regression budgets.
+
+    python benchmarks/bench_startup.py            # report, exit 1 on regression
+    python benchmarks/bench_startup.py --repeats 5
+
+Each module is imported in a fresh interpreter under `python -X importtime`;
+the best cumulative time over the repeats is compared with its budget. The
+script also checks that heavy libraries stay out of import paths that do not
+need them (e.g. the engine must not pull in streamlit or plotly, and the
+dashboard must not load pandas or matplotlib before a calculation runs).
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ✅ Cumulative import budgets (seconds); generous enough for slow CI machines
+BUDGETS = {
+    "eugene_roi_engine": 0.05,
+    "eugene_roi_batch": 1.5,
+    "eugene_roi_dashboard": 2.0,
+}
+
+# ✅ Top-level packages that must not be imported by each module
+FORBIDDEN = {
+    "eugene_roi_engine": ["numpy", "pandas", "streamlit", "plotly", "matplotlib", "xlsxwriter"],
+    "eugene_roi_batch": ["streamlit", "plotly", "matplotlib", "xlsxwriter"],
+    "eugene_roi_dashboard": ["pandas", "matplotlib", "xlsxwriter", "eugene_roi_batch", "eugene_roi_export", "eugene_roi_figures"],
+}
+
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def import_profile(module):
+    """Imports `module` in a fresh interpreter; returns ({package: cumulative seconds}, total seconds)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr}")
+
+    loaded = {}
+    total = 0.0
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        name, cumulative = match.group(4), int(match.group(2)) / 1e6
+        loaded[name] = cumulative
+        if name == module:
+            total = cumulative
+    return loaded, total
+
+def check(module, repeats=3):
+    """Returns (best seconds, list of problems) for one module."""
+    best, loaded = None, {}
+    for _ in range(repeats):
+        loaded, total = import_profile(module)
+        best = total if best is None else min(best, total)
+
+    problems = []
+    if best > BUDGETS[module]:
+        problems.append(f"{best:.3f}s exceeds the {BUDGETS[module]:.3f}s budget")
+    top_level = {name.split(".")[0] for name in loaded}
+    for package in FORBIDDEN.get(module, []):
+        if package in top_level:
+            problems.append(f"imports {package} at startup")
+    return best, problems
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report module import times against startup budgets.")
+    parser.add_argument("modules", nargs="*", default=list(BUDGETS), help="Modules to check (default: all).")
+    parser.add_argument("--repeats", type=int, default=3, help="Fresh-interpreter imports per module (best is reported).")
+    args = parser.parse_args(argv)
+    unknown = [module for module in args.modules if module not in BUDGETS]
+    if unknown:
+        parser.error(f"no budget for {', '.join(unknown)} (choose from {', '.join(BUDGETS)})")
+
+    failed = False
+    for module in args.modules:
+        best, problems = check(module, args.repeats)
+        status = "FAIL" if problems else "ok"
+        print(f"{module:<24} {best * 1000:8.1f} ms  (budget {BUDGETS[module] * 1000:.0f} ms)  {status}")
+        for problem in problems:
+            print(f"    - {problem}")
+        failed = failed or bool(problems)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
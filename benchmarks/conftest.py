@@ -0,0 +1,79 @@
+"""
+Synthetic scenarios for the benchmark suite.
+
+Each size is one clinic profile whose test configuration holds a given number
+of test variants: "small" is the dashboard's own three test categories (six
+variants), "medium" and "huge" replicate those categories under numbered
+names so every per-variant loop, breakdown table and report sheet grows with
+the size. Inputs are generated from a fixed seed, so runs are comparable.
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import eugene_roi_engine as engine
+
+# ✅ Test categories per size (each category holds a base and a complex variant)
+SIZES = {
+    "small": 1,
+    "medium": 100,
+    "huge": 10_000,
+}
+
+SEED = 20240601
+
+# ✅ A benchmark whose fastest round is this much slower than the compared baseline fails the run
+# (the minimum is the statistic least moved by other load on the machine)
+REGRESSION_THRESHOLD = "min:25%"
+
+
+def pytest_configure(config):
+    """Applies REGRESSION_THRESHOLD to `--benchmark-compare` runs that do not set their own."""
+    if config.getoption("benchmark_compare", None) and not config.getoption("benchmark_compare_fail", None):
+        from pytest_benchmark.utils import parse_compare_fail
+
+        config.option.benchmark_compare_fail = [parse_compare_fail(REGRESSION_THRESHOLD)]
+
+
+def synthetic_scenario(repeats, seed=SEED, specialty="Fertility Specialist", billing_model="Mixed"):
+    """Builds one clinic profile with `repeats` copies of every test category, in Simplified mode."""
+    rng = random.Random(seed)
+    practice = {"specialty": specialty, "operation_days": 5, "weeks_year": 48, "consults_per_hour": 4}
+    staff = engine.default_staff(specialty, num_doctors=3)
+    billing = {"model": billing_model, "private_hourly": 400, "bulk_rate": 60}
+
+    test_configs = {}
+    for i in range(repeats):
+        for category in engine.TEST_TYPES:
+            name = category if repeats == 1 else f"{category} #{i + 1}"
+            test_configs[name] = engine.simplified_test_config(category, rng.randint(1, 100))
+
+    return {
+        "practice": practice,
+        "staff": staff,
+        "billing": billing,
+        "test_configs": test_configs,
+        "logistics": dict(engine.LOGISTICS_COSTS),
+        "simplified_mode": True,
+    }
+
+
+@pytest.fixture(params=list(SIZES), scope="session")
+def scenario(request):
+    """One synthetic scenario per size; the size name is available as `scenario["size"]`."""
+    data = synthetic_scenario(SIZES[request.param])
+    data["size"] = request.param
+    return data
+
+@pytest.fixture(scope="session")
+def results(scenario):
+    """Engine results for the scenario."""
+    return engine.run_calculations(
+        scenario["practice"], scenario["staff"], scenario["billing"],
+        scenario["test_configs"], scenario["logistics"], scenario["simplified_mode"]
+    )
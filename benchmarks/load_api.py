@@ -0,0 +1,217 @@
+"""
+Load test for the HTTP/JSON API (`eugene_roi_api.py`) on one machine.
+
+    python benchmarks/load_api.py                          # starts a local server, 10 s at 32 connections
+    python benchmarks/load_api.py --duration 30 --connections 64 --unique 0.2
+    python benchmarks/load_api.py --url http://127.0.0.1:8600 --endpoint batch
+    python benchmarks/load_api.py --min-rps 500            # exit 1 below 500 requests/second
+
+Each connection is a keep-alive HTTP/1.1 client sending requests back to back
+for `--duration` seconds. A `--unique` share of the requests carries fresh
+random clinic inputs (cache misses that run the engine); the rest repeat a
+small pool of clinics, as a CRM showing the same accounts does. The report
+gives sustained requests/second, latency percentiles, error count and the
+server's cache counters. Only the standard library is used on the client
+side, so the numbers include no client framework overhead.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.insert(0, ROOT)
+
+import eugene_roi_engine as engine
+
+# ✅ Distinct clinics behind the repeated (cacheable) requests
+REPEATED_CLINICS = 50
+
+# ✅ Clinics per batch request and values per sweep request
+BATCH_SIZE = 100
+SWEEP_POINTS = 50
+
+ENDPOINTS = {"roi": "/v1/roi", "batch": "/v1/roi/batch", "sweep": "/v1/roi/sweep"}
+
+
+# -------------------- PAYLOADS --------------------
+
+def random_clinic(rng):
+    """One clinic request with random specialty, billing model and weekly volumes."""
+    model = rng.choice(["Bulk Bill", "Mixed", "Private"])
+    billing = {"model": model}
+    if model != "Bulk Bill":
+        billing["private_hourly"] = rng.randint(100, 800)
+    if model == "Mixed":
+        billing["bulk_rate"] = rng.randint(0, 100)
+    return {
+        "practice": {"specialty": rng.choice(list(engine.SPECIALTY_MBS)), "consults_per_hour": rng.randint(1, 6)},
+        "billing": billing,
+        "weekly_volumes": {category: rng.randint(0, 100) for category in engine.TEST_TYPES}
+    }
+
+def request_body(endpoint, clinic, rng):
+    if endpoint == "batch":
+        return {"clinics": [clinic] + [random_clinic(rng) for _ in range(BATCH_SIZE - 1)]}
+    if endpoint == "sweep":
+        return {"clinic": clinic, "parameter": "core_weekly_volume", "values": list(range(0, SWEEP_POINTS * 2, 2))}
+    return clinic
+
+def payloads(endpoint, unique_share, seed):
+    """Endless stream of encoded request bodies: repeated clinics mixed with a `unique_share` of fresh ones."""
+    rng = random.Random(seed)
+    repeated = [
+        json.dumps(request_body(endpoint, random_clinic(random.Random(i)), random.Random(i))).encode("utf-8")
+        for i in range(REPEATED_CLINICS)
+    ]
+    while True:
+        if rng.random() < unique_share:
+            yield json.dumps(request_body(endpoint, random_clinic(rng), rng)).encode("utf-8")
+        else:
+            yield rng.choice(repeated)
+
+
+# -------------------- CLIENT --------------------
+
+async def read_response(reader):
+    """Reads one HTTP/1.1 response; returns (status, body)."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("server closed the connection")
+    status = int(status_line.split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+async def connection(host, port, path, bodies, deadline, latencies, errors):
+    """Sends requests back to back on one keep-alive connection until `deadline`."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            body = next(bodies)
+            started = time.perf_counter()
+            writer.write(
+                f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+            )
+            await writer.drain()
+            status, _ = await read_response(reader)
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+async def run_load(url, endpoint, connections, duration, unique_share, seed):
+    parts = urlsplit(url)
+    bodies = payloads(endpoint, unique_share, seed)
+    latencies, errors = [], []
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(
+        connection(parts.hostname, parts.port or 80, ENDPOINTS[endpoint], bodies, deadline, latencies, errors)
+        for _ in range(connections)
+    ))
+    return latencies, errors, time.perf_counter() - started
+
+
+# -------------------- SERVER --------------------
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def get_json(url):
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return json.loads(response.read())
+
+def start_server(port, workers):
+    """Starts `eugene_roi_api.py` in a separate process and waits until /health answers."""
+    server = subprocess.Popen(
+        [sys.executable, "eugene_roi_api.py", "--port", str(port), "--workers", str(workers)],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            get_json(f"{url}/health")
+            return server, url
+        except OSError:
+            if server.poll() is not None:
+                raise RuntimeError(f"API server exited:\n{server.stderr.read().decode()}")
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("API server did not start within 10 s")
+
+
+# -------------------- REPORT --------------------
+
+def percentile(sorted_values, share):
+    return sorted_values[min(len(sorted_values) - 1, int(share * len(sorted_values)))]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="Test a running server instead of starting one.")
+    parser.add_argument("--endpoint", choices=list(ENDPOINTS), default="roi")
+    parser.add_argument("--connections", type=int, default=32, help="Concurrent keep-alive connections.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load.")
+    parser.add_argument("--unique", type=float, default=0.1, help="Share of requests with fresh (uncached) inputs.")
+    parser.add_argument("--workers", type=int, default=1, help="Server processes when starting a local server.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--min-rps", type=float, help="Exit 1 when sustained requests/second fall below this.")
+    args = parser.parse_args(argv)
+
+    server = None
+    url = args.url
+    if url is None:
+        server, url = start_server(free_port(), args.workers)
+    try:
+        latencies, errors, elapsed = asyncio.run(
+            run_load(url, args.endpoint, args.connections, args.duration, args.unique, args.seed)
+        )
+        health = get_json(f"{url}/health")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    if not latencies:
+        print("No requests completed.")
+        return 1
+    latencies.sort()
+    rps = len(latencies) / elapsed
+    cache = health["cache"]
+    print(f"{ENDPOINTS[args.endpoint]}: {args.connections} connections, {elapsed:.1f} s, {args.unique:.0%} unique inputs")
+    print(f"  requests      {len(latencies):>10,}   ({rps:,.0f} req/s sustained)")
+    print(f"  errors        {len(errors):>10,}")
+    print(
+        f"  latency ms    p50 {percentile(latencies, 0.5) * 1000:,.1f}   p95 {percentile(latencies, 0.95) * 1000:,.1f}"
+        f"   p99 {percentile(latencies, 0.99) * 1000:,.1f}   max {latencies[-1] * 1000:,.1f}"
+    )
+    print(f"  server cache  {cache['hits']:,} hits, {cache['misses']:,} misses ({cache['hit_rate']:.0%}), "
+          f"{health['shared']:,} shared in-flight")
+
+    if args.min_rps is not None and rps < args.min_rps:
+        print(f"FAIL: {rps:,.0f} req/s is below the {args.min_rps:,.0f} req/s budget")
+        return 1
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,397 @@
+"""
+Stateless HTTP/JSON API over the ROI engine, for CRMs and other services.
+
+    python eugene_roi_api.py --port 8600
+    uvicorn eugene_roi_api:app --port 8600 --workers 4
+
+Endpoints (JSON in, JSON out):
+
+- GET  /health          assumptions version, cache and request counters
+- POST /v1/roi          one clinic -> `run_calculations` results (headline
+                        metrics plus the per-variant `variants` table)
+- POST /v1/roi/batch    {"clinics": [clinic, ...]} -> headline metrics per
+                        clinic, evaluated in one vectorized pass
+- POST /v1/roi/sweep    {"clinic": clinic, "parameter": "core_weekly_volume",
+                        "values": [...]} -> headline metrics per value
+
+A clinic is the engine's input dicts: {"practice", "billing", "staff",
+"test_configs", "logistics", "simplified_mode"}. Only `practice.specialty`
+and either `test_configs` or `weekly_volumes` ({"Core": 20, ...}, expanded
+with the Simplified-mode assumptions) are required; missing staff and
+practice fields take the dashboard's defaults. Any request may name an
+`assumptions_version`; otherwise the version in effect today is used.
+
+Nothing is kept per client. Responses are cached as JSON bytes against the
+endpoint, the canonical request body and the assumptions fingerprint (in
+memory, plus the shared disk cache when EUGENE_ROI_DISK_CACHE is set), so a
+repeated lookup skips both the calculation and serialization. Handlers are
+async: cache lookups (which may read SQLite) and calculations run on a worker
+thread so the event loop keeps accepting requests, and identical requests
+that arrive while one is being calculated wait for that calculation instead
+of starting their own.
+
+Numeric inputs must be finite JSON numbers (NaN and Infinity are rejected),
+non-negative, and positive for `operation_days`, `weeks_year` and
+`consults_per_hour`; `simplified_mode` must be a JSON boolean. Invalid
+requests get HTTP 400 with an "error" message.
+
+`benchmarks/load_api.py` measures sustained requests/second on localhost.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+import eugene_roi_assumptions
+import eugene_roi_engine as engine
+from eugene_roi_cache import ResultCache, canonical_key, open_disk_cache
+
+logger = logging.getLogger("eugene_roi.api")
+
+# -------------------- CONSTANTS --------------------
+
+# ✅ Responses kept in memory per server process
+DEFAULT_API_CACHE_SIZE = 4096
+
+# ✅ Request limits (larger jobs belong to the command-line batch runner)
+MAX_BODY_BYTES = 8 * 1024 * 1024
+MAX_BATCH_CLINICS = 10_000
+MAX_SWEEP_VALUES = 10_000
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8600
+
+BILLING_MODELS = ["Bulk Bill", "Mixed", "Private"]
+
+# ✅ Practice fields a request may leave out (dashboard defaults)
+PRACTICE_DEFAULTS = {"operation_days": 5, "weeks_year": 48, "consults_per_hour": 3}
+
+# ✅ Inputs that must be positive (every other numeric input must be non-negative)
+POSITIVE_FIELDS = {"operation_days", "weeks_year", "consults_per_hour"}
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+class RequestError(ValueError):
+    """A request the API cannot evaluate (reported as HTTP 400)."""
+
+
+# -------------------- REQUEST PARSING --------------------
+
+def _object(data, name, required=True):
+    value = data.get(name)
+    if value is None and not required:
+        return {}
+    if not isinstance(value, dict):
+        raise RequestError(f"'{name}' must be a JSON object")
+    return value
+
+def _reject_constant(name):
+    """json.loads hook for the non-standard NaN / Infinity literals."""
+    raise RequestError(f"'{name}' is not a valid JSON number")
+
+def _number(value, name, positive=False):
+    """A finite JSON number; non-negative, or positive for rates such as consults_per_hour."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise RequestError(f"'{name}' must be a number")
+    if not math.isfinite(value):
+        raise RequestError(f"'{name}' must be a finite number")
+    if positive and value <= 0:
+        raise RequestError(f"'{name}' must be positive")
+    if value < 0:
+        raise RequestError(f"'{name}' must not be negative")
+    return value
+
+def _numbers(values, prefix):
+    """Checks every field of a JSON object of numeric inputs."""
+    for name, value in values.items():
+        _number(value, f"{prefix}.{name}", positive=name in POSITIVE_FIELDS)
+
+def _test_configs(test_configs):
+    for category, variants in test_configs.items():
+        if not isinstance(variants, dict):
+            raise RequestError(f"'test_configs.{category}' must be a JSON object")
+        for variant, params in variants.items():
+            if not isinstance(params, dict):
+                raise RequestError(f"'test_configs.{category}.{variant}' must be a JSON object")
+            _numbers(params, f"test_configs.{category}.{variant}")
+    return test_configs
+
+def parse_clinic(clinic, assumptions):
+    """Engine input arguments (practice, staff, billing, test_configs, logistics, simplified_mode) for one JSON clinic."""
+    if not isinstance(clinic, dict):
+        raise RequestError("a clinic must be a JSON object")
+
+    practice = {**PRACTICE_DEFAULTS, **_object(clinic, "practice")}
+    specialty = practice.get("specialty")
+    if specialty not in assumptions["specialty_mbs"]:
+        raise RequestError(
+            f"unknown specialty '{specialty}' (expected one of {', '.join(assumptions['specialty_mbs'])})"
+        )
+    _numbers({field: practice[field] for field in PRACTICE_DEFAULTS}, "practice")
+
+    billing = {"model": "Bulk Bill", **_object(clinic, "billing", required=False)}
+    if billing["model"] not in BILLING_MODELS:
+        raise RequestError(f"unknown billing model '{billing['model']}' (expected one of {', '.join(BILLING_MODELS)})")
+    if billing["model"] != "Bulk Bill" and "private_hourly" not in billing:
+        raise RequestError(f"billing.private_hourly is required for the {billing['model']} model")
+    if billing["model"] == "Mixed" and "bulk_rate" not in billing:
+        raise RequestError("billing.bulk_rate is required for the Mixed model")
+    _numbers({field: billing[field] for field in ("private_hourly", "bulk_rate") if field in billing}, "billing")
+    if billing.get("bulk_rate", 0) > 100:
+        raise RequestError("'billing.bulk_rate' is a percentage and must not exceed 100")
+
+    staff = {
+        **engine.default_staff(specialty, assumptions=assumptions),
+        **_object(clinic, "staff", required=False)
+    }
+    _numbers(staff, "staff")
+
+    if "test_configs" in clinic:
+        test_configs = _test_configs(_object(clinic, "test_configs"))
+    elif "weekly_volumes" in clinic:
+        test_configs = {}
+        for category, volume in _object(clinic, "weekly_volumes").items():
+            if category not in engine.TEST_TYPES:
+                raise RequestError(f"unknown test category '{category}' (expected one of {', '.join(engine.TEST_TYPES)})")
+            _number(volume, f"weekly_volumes.{category}")
+            test_configs[category] = engine.simplified_test_config(category, volume, assumptions)
+    else:
+        raise RequestError("a clinic needs 'test_configs' or 'weekly_volumes'")
+
+    logistics = _object(clinic, "logistics", required=False)
+    _numbers(logistics, "logistics")
+    simplified_mode = clinic.get("simplified_mode", True)
+    if not isinstance(simplified_mode, bool):
+        raise RequestError("'simplified_mode' must be a JSON boolean (true or false)")
+    return practice, staff, billing, test_configs, logistics, simplified_mode
+
+def _items(data, name, limit):
+    values = data.get(name)
+    if not isinstance(values, list) or not values:
+        raise RequestError(f"'{name}' must be a non-empty JSON array")
+    if len(values) > limit:
+        raise RequestError(f"'{name}' holds {len(values):,} items; the limit is {limit:,}")
+    return values
+
+
+# -------------------- CALCULATIONS --------------------
+
+def calculate_clinic(body, assumptions):
+    """POST /v1/roi: full results for one clinic."""
+    return {
+        "assumptions_version": assumptions["version"],
+        "results": engine.run_calculations(*parse_clinic(body, assumptions), assumptions=assumptions)
+    }
+
+def calculate_batch(body, assumptions):
+    """POST /v1/roi/batch: headline metrics for every clinic, in one vectorized pass."""
+    import pandas as pd
+
+    import eugene_roi_batch as batch
+
+    rows = [
+        batch.profile_to_row(*parse_clinic(clinic, assumptions))
+        for clinic in _items(body, "clinics", MAX_BATCH_CLINICS)
+    ]
+    metrics = batch.evaluate_batch(pd.DataFrame(rows), batch.tables_for(assumptions))
+    return {"assumptions_version": assumptions["version"], "results": metrics.to_dict("records")}
+
+def calculate_sweep(body, assumptions):
+    """POST /v1/roi/sweep: headline metrics at each value of one input, as columns."""
+    import eugene_roi_batch as batch
+    import eugene_roi_sensitivity as sensitivity
+
+    row = batch.profile_to_row(*parse_clinic(_object(body, "clinic"), assumptions))
+    parameter = body.get("parameter")
+    if parameter not in sensitivity.PARAMETER_LABELS:
+        raise RequestError(f"'{parameter}' is not a sweepable parameter")
+    values = [
+        _number(value, f"values[{i}]", positive=parameter in POSITIVE_FIELDS)
+        for i, value in enumerate(_items(body, "values", MAX_SWEEP_VALUES))
+    ]
+
+    frame = sensitivity.sweep(row, parameter, values, batch.tables_for(assumptions))
+    return {
+        "assumptions_version": assumptions["version"],
+        "parameter": parameter,
+        "values": frame[parameter].tolist(),
+        "results": {metric: frame[metric].tolist() for metric in batch.OUTPUT_COLUMNS}
+    }
+
+ENDPOINTS = {
+    "/v1/roi": calculate_clinic,
+    "/v1/roi/batch": calculate_batch,
+    "/v1/roi/sweep": calculate_sweep
+}
+
+
+# -------------------- SERVICE --------------------
+
+class ROIService:
+    """Shared state of one server process: assumptions, the response cache and request counters."""
+
+    def __init__(self, cache=None, store=None):
+        self.cache = cache or ResultCache(
+            maxsize=DEFAULT_API_CACHE_SIZE, copy_values=False, backend=open_disk_cache(namespace="api")
+        )
+        self.store = store or eugene_roi_assumptions.AssumptionStore()
+        self.requests = 0
+        self.errors = 0
+        self.shared = 0
+        self._inflight = {}
+
+    def assumptions(self, body):
+        label = body.get("assumptions_version")
+        if label is None:
+            return self.store.current()
+        try:
+            return self.store.get(label)
+        except ValueError as e:
+            raise RequestError(str(e)) from None
+
+    def _compute(self, key, calculate, body, assumptions):
+        """Runs one calculation (on a worker thread) and caches its JSON response body."""
+        try:
+            payload = calculate(body, assumptions)
+        except RequestError:
+            raise
+        except (KeyError, TypeError, ValueError) as e:
+            # Malformed engine inputs, e.g. an unknown test variant or a non-numeric volume
+            raise RequestError(f"invalid clinic inputs: {e!r}") from None
+        try:
+            content = json.dumps(payload, separators=(",", ":"), allow_nan=False).encode("utf-8")
+        except ValueError:
+            # Finite inputs whose results overflow, e.g. volumes near the float limit
+            raise RequestError("the results are not finite numbers; check the input magnitudes") from None
+        self.cache.put(key, content)
+        return content
+
+    def _cached_or_compute(self, key, calculate, body, assumptions):
+        """Cached JSON bytes for `key` (the disk cache may be read), else a fresh calculation."""
+        content = self.cache.get(key)
+        if content is not None:
+            return content
+        return self._compute(key, calculate, body, assumptions)
+
+    async def respond(self, path, body):
+        """JSON bytes for a request: cached, shared with an identical request in flight, or calculated."""
+        self.requests += 1
+        assumptions = self.assumptions(body)
+        key = canonical_key(path, body, assumptions["fingerprint"])
+
+        # The cache lookup can hit SQLite, so it runs on the worker thread with the calculation
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                run_in_threadpool(self._cached_or_compute, key, ENDPOINTS[path], body, assumptions)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "shared": self.shared,
+            "in_flight": len(self._inflight),
+            "cache": self.cache.stats()
+        }
+
+
+# -------------------- HTTP --------------------
+
+def error_response(status, message):
+    return JSONResponse({"error": message}, status_code=status)
+
+async def read_body(request):
+    """The request body, or None once it is known to be over MAX_BODY_BYTES."""
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > MAX_BODY_BYTES:
+        return None
+
+    # Chunked or under-declared bodies are counted as they arrive, never buffered past the limit
+    chunks = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > MAX_BODY_BYTES:
+            return None
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+async def calculate(request):
+    service = request.app.state.service
+    raw = await read_body(request)
+    if raw is None:
+        service.errors += 1
+        return error_response(413, f"request body over {MAX_BODY_BYTES:,} bytes")
+
+    try:
+        body = json.loads(raw, parse_constant=_reject_constant)
+        if not isinstance(body, dict):
+            raise RequestError("request body must be a JSON object")
+        content = await service.respond(request.url.path, body)
+    except (RequestError, json.JSONDecodeError) as e:
+        service.errors += 1
+        return error_response(400, str(e))
+    except Exception as e:
+        service.errors += 1
+        logger.exception("Failed to calculate %s", request.url.path)
+        return error_response(500, f"calculation failed: {e}")
+    return Response(content, media_type=JSON_MEDIA_TYPE)
+
+async def health(request):
+    service = request.app.state.service
+    assumptions = service.store.current()
+    return JSONResponse({
+        "status": "ok",
+        "assumptions_version": assumptions["version"],
+        "effective_date": assumptions["effective_date"],
+        **service.stats()
+    })
+
+def create_app(service=None):
+    """The ASGI application (one `ROIService` per app)."""
+    app = Starlette(routes=[
+        Route("/health", health, methods=["GET"]),
+        *(Route(path, calculate, methods=["POST"]) for path in ENDPOINTS)
+    ])
+    app.state.service = service or ROIService()
+    return app
+
+app = create_app()
+
+
+# -------------------- COMMAND LINE --------------------
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the Eugene ROI engine as a local HTTP/JSON API.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Interface to bind (default {DEFAULT_HOST}).")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port to listen on (default {DEFAULT_PORT}).")
+    parser.add_argument("--workers", type=int, default=1, help="Server processes (each with its own memory cache).")
+    parser.add_argument("--log-level", default="warning", help="uvicorn log level (default warning).")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    import uvicorn
+
+    args = parse_args(argv)
+    uvicorn.run(
+        "eugene_roi_api:app", host=args.host, port=args.port, workers=args.workers,
+        log_level=args.log_level, access_log=False
+    )
+
+
+if __name__ == "__main__":
+    main()
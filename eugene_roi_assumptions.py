@@ -0,0 +1,225 @@
+"""
+Versioned reference assumptions loaded from `data/assumptions.json`.
+
+MBS rates, Simplified-mode salaries and times, default staff costs, logistics
+costs and complex-case probabilities live in one JSON file as a list of
+versions, each with a `version` label and an `effective_date`. The first
+version lists every table; later versions list only what changed and inherit
+the rest, so a new MBS schedule is a few lines:
+
+    {"version": "2025.1", "effective_date": "2025-07-01",
+     "specialty_mbs": {"GP": {"Core": {"rate": 44.10}}}}
+
+A loaded version is a plain dict keyed like the file (`specialty_mbs`,
+`simplified_salary`, ...) plus `version`, `effective_date` and a content
+`fingerprint` for cache keys. The engine, incremental calculator and batch
+tables take one through their `assumptions` argument; without it they use the
+version in effect when the engine was imported.
+
+`AssumptionStore` keeps the parsed file in memory and re-reads it when its
+modification time or size changes (checked at most every `check_interval`
+seconds), so a running dashboard picks up an edited file on the next rerun.
+A file that fails to parse or validate is logged and the previous versions
+stay in use.
+"""
+
+import copy
+import datetime
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger("eugene_roi.assumptions")
+
+# -------------------- CONSTANTS --------------------
+
+# ✅ Bundled assumptions file (override with the EUGENE_ROI_ASSUMPTIONS environment variable)
+DEFAULT_PATH = os.environ.get(
+    "EUGENE_ROI_ASSUMPTIONS",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "assumptions.json")
+)
+
+# ✅ Seconds between modification checks of the assumptions file
+DEFAULT_CHECK_INTERVAL = 2.0
+
+# Tables every version must end up with (after inheriting from earlier versions)
+TABLE_KEYS = [
+    "specialty_mbs",
+    "simplified_salary",
+    "simplified_time",
+    "simplified_genetic_time",
+    "default_staff_costs",
+    "logistics_costs",
+    "genetic_counseling_private_cost",
+    "complex_case_probabilities",
+    "default_complex_case_probability"
+]
+
+# Per-version metadata that is not inherited
+META_KEYS = ["version", "effective_date", "description", "sources"]
+
+
+# -------------------- PARSING --------------------
+
+def _merge(base, changes):
+    """Deep-merges `changes` into a copy of `base` (existing keys keep their order)."""
+    merged = copy.deepcopy(base)
+    for key, value in changes.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+def fingerprint(version):
+    """Short content hash of a version's tables (changes whenever any assumption does)."""
+    payload = json.dumps({key: version[key] for key in TABLE_KEYS}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+def validate(version):
+    """Raises ValueError if a merged version is missing a table or holds out-of-range values."""
+    label = version.get("version", "?")
+    missing = [key for key in TABLE_KEYS if key not in version]
+    if missing:
+        raise ValueError(f"assumptions version {label} is missing {', '.join(missing)}")
+
+    for specialty, rates in version["specialty_mbs"].items():
+        for variant, item in rates.items():
+            rate = item.get("rate") if isinstance(item, dict) else None
+            if not isinstance(rate, (int, float)) or rate < 0:
+                raise ValueError(f"assumptions version {label}: invalid MBS rate for {specialty} / {variant}")
+
+    probabilities = dict(version["complex_case_probabilities"], default=version["default_complex_case_probability"])
+    for variant, probability in probabilities.items():
+        if not isinstance(probability, (int, float)) or not 0 <= probability <= 1:
+            raise ValueError(f"assumptions version {label}: probability for {variant} must be between 0 and 1")
+
+def parse_versions(document):
+    """Turns the file's version list into complete, validated versions sorted by effective date."""
+    entries = document.get("versions") if isinstance(document, dict) else None
+    if not entries:
+        raise ValueError("assumptions file has no versions")
+
+    try:
+        entries = sorted(entries, key=lambda entry: datetime.date.fromisoformat(entry["effective_date"]))
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"every assumptions version needs an ISO effective_date: {e}")
+
+    versions = []
+    inherited = {}
+    seen = set()
+    for entry in entries:
+        label = str(entry.get("version", ""))
+        if not label or label in seen:
+            raise ValueError(f"assumptions version labels must be present and unique (got '{label}')")
+        seen.add(label)
+
+        inherited = _merge(inherited, {key: value for key, value in entry.items() if key not in META_KEYS})
+        version = dict(inherited, **{key: entry[key] for key in META_KEYS if key in entry})
+        version["version"] = label
+        validate(version)
+        version["fingerprint"] = fingerprint(version)
+        versions.append(version)
+    return versions
+
+def load_versions(path=DEFAULT_PATH):
+    """Reads and parses an assumptions file."""
+    with open(path, encoding="utf-8") as f:
+        return parse_versions(json.load(f))
+
+
+# -------------------- VERSION LOOKUP --------------------
+
+def effective_version(versions, on=None):
+    """Returns the latest version whose effective date is on or before `on` (a date or ISO string; default today)."""
+    if on is None:
+        on = datetime.date.today()
+    elif isinstance(on, str):
+        on = datetime.date.fromisoformat(on)
+
+    current = None
+    for version in versions:
+        if datetime.date.fromisoformat(version["effective_date"]) <= on:
+            current = version
+    if current is None:
+        raise ValueError(f"no assumptions version is in effect on {on.isoformat()}")
+    return current
+
+def find_version(versions, label):
+    """Returns the version with the given label."""
+    for version in versions:
+        if version["version"] == label:
+            return version
+    raise ValueError(f"unknown assumptions version '{label}' (available: {', '.join(v['version'] for v in versions)})")
+
+
+# -------------------- HOT-RELOADING STORE --------------------
+
+class AssumptionStore:
+    """Parsed assumptions file kept in memory and reloaded when the file changes on disk."""
+
+    def __init__(self, path=DEFAULT_PATH, check_interval=DEFAULT_CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self.loads = 0
+        self.error = None
+        self._versions = None
+        self._signature = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        self.refresh(force=True)
+
+    def _stat(self):
+        status = os.stat(self.path)
+        return status.st_mtime_ns, status.st_size
+
+    def refresh(self, force=False):
+        """Re-reads the file if it changed since the last load; returns True when new versions were loaded."""
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._checked < self.check_interval:
+                return False
+            self._checked = now
+            signature = None
+            try:
+                signature = self._stat()
+                if not force and signature == self._signature:
+                    return False
+                versions = load_versions(self.path)
+            except (OSError, ValueError) as e:
+                if self._versions is None:
+                    raise
+                # Keep serving the last good versions until the file changes again
+                self._signature = signature or self._signature
+                self.error = str(e)
+                logger.warning("Keeping assumptions from %s after a failed reload: %s", self.path, e)
+                return False
+
+            self._versions = versions
+            self._signature = signature
+            self.error = None
+            self.loads += 1
+            return True
+
+    def versions(self):
+        """All versions, oldest first (reloading first if the file changed)."""
+        self.refresh()
+        return self._versions
+
+    def current(self, on=None):
+        """The version in effect on `on` (default today)."""
+        return effective_version(self.versions(), on)
+
+    def get(self, label):
+        return find_version(self.versions(), label)
+
+    def stats(self):
+        return {
+            "path": self.path,
+            "versions": [version["version"] for version in self._versions],
+            "loads": self.loads,
+            "error": self.error
+        }
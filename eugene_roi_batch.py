@@ -0,0 +1,432 @@
+"""
+Vectorized batch evaluation of many clinic profiles at once.
+
+Each row of the input frame is one clinic, flattened from the dicts that
+`eugene_roi_engine.run_calculations` takes. Per-test parameters use the column
+name `<variant slug>_<field>`, e.g. `core_weekly_volume` or
+`couples_complex_research_time` (see `variant_columns`). The six variants are
+evaluated together as an N x 6 array, so the annual volume and role hours are
+computed once per batch instead of once per clinic per calculation.
+
+Missing per-test and logistics columns are treated as 0, matching the
+`params.get(..., 0)` defaults in the engine; `simplified_mode` defaults to True.
+
+The engine's nested reference dicts are compiled once by `build_tables` into
+read-only arrays indexed by integer codes (specialty x variant
+rates, category x role Simplified times, ...), so evaluation never looks up
+a string inside the per-clinic math. `pack` goes one step further and turns
+a frame into integer codes plus one clinics x variants x fields float array.
+
+`build_tables(version)` compiles any assumptions version (see
+`eugene_roi_assumptions`) and `evaluate_versions` scores the same clinics
+under several versions for year-over-year comparisons.
+"""
+
+import re
+from enum import IntEnum
+
+import numpy as np
+import pandas as pd
+
+import eugene_roi_engine as engine
+
+# -------------------- CONSTANTS --------------------
+
+# ✅ Variant order used for every N x 6 array (base then complex, per category)
+VARIANTS = [
+    variant
+    for category in engine.TEST_TYPES.values()
+    for variant in (category["base"], category["curly"])
+]
+
+VARIANT_SLUGS = [variant.lower().replace(" cases", "").replace(" ", "_") for variant in VARIANTS]
+
+VARIANT_CATEGORIES = [
+    test_type
+    for test_type, category in engine.TEST_TYPES.items()
+    for _ in (category["base"], category["curly"])
+]
+
+TEST_FIELDS = ["weekly_volume", "admin_time", "nurse_time", "doctor_time", "research_time", "genetic_time"]
+
+TIME_FIELDS = TEST_FIELDS[1:]
+
+BILLING_MODELS = ["Bulk Bill", "Mixed", "Private"]
+
+# ✅ Roles in the Simplified time table (research is doctor time spent on complex cases)
+SIMPLIFIED_TIME_ROLES = ["admin", "nurse", "doctor", "research"]
+
+REQUIRED_COLUMNS = [
+    "specialty", "weeks_year", "consults_per_hour",
+    "admin_hourly", "nurse_hourly", "doctor_hourly", "genetic_hourly",
+    "billing_model"
+]
+
+OPTIONAL_COLUMNS = {
+    "private_hourly": 0.0,
+    "bulk_rate": 0.0,
+    "shipping": 0.0,
+    "storage": 0.0,
+    "admin_logistics": 0.0,
+    "misc_logistics": 0.0,
+    "simplified_mode": True
+}
+
+LOGISTICS_COLUMNS = list(engine.LOGISTICS_COSTS.keys())
+
+OUTPUT_COLUMNS = [
+    "staff_costs",
+    "logistical_costs",
+    "total_annual_savings",
+    "total_revenue",
+    "additional_revenue",
+    "total_doctor_hours_saved",
+    "potential_patient_savings",
+    "total_staff_hours_saved",
+    "net_annual_benefit"
+]
+
+
+def variant_columns(field):
+    """Returns the six flat column names holding `field` for every variant."""
+    return [f"{slug}_{field}" for slug in VARIANT_SLUGS]
+
+def _enum(name, labels):
+    """Integer enum over `labels` (in order), with member names derived from the labels."""
+    return IntEnum(name, [(re.sub(r"\W+", "_", label).strip("_").upper(), i) for i, label in enumerate(labels)])
+
+
+# -------------------- ENUMS --------------------
+
+# Codes are positions along the matching table axis, e.g. rates[specialty_code("GP"), Variant.CORE_COMPLEX].
+# Specialties come from each assumptions version, so their codes live in the tables (see `specialty_code`).
+Variant = _enum("Variant", VARIANT_SLUGS)
+Category = _enum("Category", list(engine.TEST_TYPES))
+BillingModel = _enum("BillingModel", BILLING_MODELS)
+Role = _enum("Role", engine.ROLES)
+TestField = _enum("TestField", TEST_FIELDS)
+
+
+# -------------------- REFERENCE TABLES --------------------
+
+def build_tables(assumptions=None):
+    """Compiles an assumptions version (default: the engine's) into read-only arrays indexed by integer codes."""
+    assumptions = assumptions or engine.ASSUMPTIONS
+    specialty_mbs = assumptions["specialty_mbs"]
+    specialties = list(specialty_mbs.keys())
+    categories = list(engine.TEST_TYPES)
+    rates = np.array(
+        [[specialty_mbs[specialty][variant]["rate"] for variant in VARIANTS] for specialty in specialties],
+        dtype=float
+    )
+    is_complex = np.array(["Complex Cases" in variant for variant in VARIANTS])
+    probabilities = np.array([
+        assumptions["complex_case_probabilities"].get(variant, assumptions["default_complex_case_probability"])
+        if complex_case else 0.0
+        for variant, complex_case in zip(VARIANTS, is_complex)
+    ])
+    variant_category = np.array([categories.index(category) for category in VARIANT_CATEGORIES], dtype=np.intp)
+    base_variant = np.array(
+        [VARIANTS.index(engine.TEST_TYPES[category]["base"]) for category in VARIANT_CATEGORIES], dtype=np.intp
+    )
+
+    # Category x role minutes, as in SIMPLIFIED_TIME
+    simplified_times = np.array(
+        [[assumptions["simplified_time"][category][role] for role in SIMPLIFIED_TIME_ROLES] for category in categories],
+        dtype=float
+    )
+
+    # Variant x time-field Simplified defaults, and which of them Simplified mode sets
+    default_times = np.zeros((len(VARIANTS), len(TIME_FIELDS)))
+    default_time_mask = np.zeros((len(VARIANTS), len(TIME_FIELDS)), dtype=bool)
+    for v, (category, complex_case) in enumerate(zip(variant_category, is_complex)):
+        if complex_case:
+            fields = {"research_time": simplified_times[category, SIMPLIFIED_TIME_ROLES.index("research")],
+                      "genetic_time": assumptions["simplified_genetic_time"]}
+        else:
+            fields = {f"{role}_time": simplified_times[category, SIMPLIFIED_TIME_ROLES.index(role)]
+                      for role in ("admin", "nurse", "doctor")}
+        for field, minutes in fields.items():
+            default_times[v, TIME_FIELDS.index(field)] = minutes
+            default_time_mask[v, TIME_FIELDS.index(field)] = True
+
+    doctor_hourly = np.array(
+        [assumptions["simplified_salary"].get(specialty, 180) for specialty in specialties], dtype=float
+    )
+
+    tables = {
+        "specialties": specialties,
+        "rates": rates,
+        "is_complex": is_complex,
+        "complex_probabilities": probabilities,
+        "variant_category": variant_category,
+        "base_variant": base_variant,
+        "simplified_times": simplified_times,
+        "default_times": default_times,
+        "default_time_mask": default_time_mask,
+        "doctor_hourly": doctor_hourly,
+        "genetic_counseling_cost": float(assumptions["genetic_counseling_private_cost"]),
+        "assumptions_version": assumptions["version"]
+    }
+    for value in tables.values():
+        if isinstance(value, np.ndarray):
+            value.setflags(write=False)
+    return tables
+
+TABLES = build_tables()
+
+_VERSION_TABLES = {engine.ASSUMPTIONS["fingerprint"]: TABLES}
+
+def tables_for(assumptions):
+    """Compiled tables for an assumptions version, built once per distinct version content."""
+    if assumptions is None:
+        return TABLES
+    tables = _VERSION_TABLES.get(assumptions["fingerprint"])
+    if tables is None:
+        tables = _VERSION_TABLES[assumptions["fingerprint"]] = build_tables(assumptions)
+    return tables
+
+def specialty_code(specialty, tables=None):
+    """Position of `specialty` along the specialty axis of `tables` (default: the engine's version)."""
+    specialties = (tables or TABLES)["specialties"]
+    if specialty not in specialties:
+        raise ValueError(f"Unknown specialty value(s): {specialty}")
+    return specialties.index(specialty)
+
+
+# -------------------- INPUT HELPERS --------------------
+
+def profile_to_row(practice, staff, billing, test_configs, logistics=None, simplified_mode=True):
+    """Flattens one set of engine input dicts into a single batch row."""
+    row = {
+        "specialty": practice["specialty"],
+        "weeks_year": practice["weeks_year"],
+        "consults_per_hour": practice["consults_per_hour"],
+        "operation_days": practice.get("operation_days", engine.DEFAULT_WORK_SCHEDULE["days_per_week"]),
+        "admin_hourly": staff["admin_hourly"],
+        "nurse_hourly": staff["nurse_hourly"],
+        "doctor_hourly": staff["doctor_hourly"],
+        "genetic_hourly": staff["genetic_hourly"],
+        "billing_model": billing["model"],
+        "private_hourly": billing.get("private_hourly", 0.0),
+        "bulk_rate": billing.get("bulk_rate", 0.0),
+        "simplified_mode": simplified_mode
+    }
+
+    for column in LOGISTICS_COLUMNS:
+        row[column] = (logistics or {}).get(column, 0.0)
+
+    for test_variants in test_configs.values():
+        for variant, params in test_variants.items():
+            if "weekly_volume" not in params:
+                continue
+            slug = VARIANT_SLUGS[VARIANTS.index(variant)]
+            for field in TEST_FIELDS:
+                row[f"{slug}_{field}"] = params.get(field, 0)
+
+    return row
+
+def profiles_to_frame(profiles):
+    """Builds a batch frame from an iterable of engine input dicts."""
+    return pd.DataFrame([
+        profile_to_row(
+            profile["practice"], profile["staff"], profile["billing"], profile["test_configs"],
+            profile.get("logistics"), profile.get("simplified_mode", True)
+        )
+        for profile in profiles
+    ])
+
+def apply_simplified_defaults(frame, tables=None):
+    """Fills absent time and complex-volume columns with the Simplified-mode assumptions."""
+    tables = tables or TABLES
+    frame = frame.copy()
+
+    for v, slug in enumerate(VARIANT_SLUGS):
+        for f, field in enumerate(TIME_FIELDS):
+            column = f"{slug}_{field}"
+            if tables["default_time_mask"][v, f] and column not in frame:
+                frame[column] = tables["default_times"][v, f]
+
+        base_volume = f"{VARIANT_SLUGS[tables['base_variant'][v]]}_weekly_volume"
+        complex_volume = f"{slug}_weekly_volume"
+        if tables["is_complex"][v] and complex_volume not in frame and base_volume in frame:
+            frame[complex_volume] = frame[base_volume] * tables["complex_probabilities"][v]
+
+    return frame
+
+def pack(data, tables=None):
+    """Compacts clinic rows into integer codes, float columns and one n x variants x fields test array.
+
+    The result can be passed anywhere a frame is accepted by `evaluate_arrays`
+    and holds a few dozen numbers per clinic.
+    """
+    tables = tables or TABLES
+    n = _row_count(data)
+    packed = {
+        "specialty": _codes(data, "specialty", tables["specialties"], n).astype(np.int16),
+        "billing_model": _codes(data, "billing_model", BILLING_MODELS, n).astype(np.int8),
+        "simplified_mode": _column(data, "simplified_mode", n, OPTIONAL_COLUMNS["simplified_mode"]).astype(bool),
+        "tests": np.stack([_matrix(data, field, n) for field in TEST_FIELDS], axis=2)
+    }
+    for column in REQUIRED_COLUMNS + list(OPTIONAL_COLUMNS):
+        if column not in packed:
+            packed[column] = np.array(_column(data, column, n, OPTIONAL_COLUMNS.get(column)), dtype=float)
+    return packed
+
+
+# -------------------- BATCH EVALUATION --------------------
+
+def _column(data, name, n, default=None):
+    """Reads one input column as a length-n float array, broadcasting scalars."""
+    if name in data:
+        values = data[name]
+    elif default is not None:
+        values = default
+    else:
+        raise ValueError(f"Missing required column '{name}'")
+    return np.broadcast_to(np.asarray(values, dtype=float), (n,))
+
+def _matrix(data, field, n):
+    """Reads one per-test field for every variant as an n x 6 array (blank cells count as 0)."""
+    if "tests" in data:
+        return np.broadcast_to(data["tests"][..., TestField[field.upper()]], (n, len(VARIANTS)))
+    matrix = np.column_stack([_column(data, name, n, 0.0) for name in variant_columns(field)])
+    return np.nan_to_num(matrix, copy=False, nan=0.0)
+
+def _codes(data, name, labels, n):
+    """Maps a label column onto integer positions in `labels` (integer columns are taken as codes already)."""
+    if name not in data:
+        raise ValueError(f"Missing required column '{name}'")
+    values = data[name]
+    if np.ndim(values) == 0:
+        if isinstance(values, (int, np.integer)) and not isinstance(values, bool):
+            codes = np.asarray(values)
+        elif values in labels:
+            return np.full(n, labels.index(values), dtype=np.intp)
+        else:
+            raise ValueError(f"Unknown {name} value(s): {values}")
+    else:
+        if not hasattr(values, "dtype"):
+            values = np.asarray(values)
+        if pd.api.types.is_integer_dtype(values.dtype):
+            codes = np.asarray(values)
+        else:
+            codes = pd.Index(labels).get_indexer(values)
+            if (codes < 0).any():
+                unknown = sorted(set(np.asarray(values, dtype=object)[codes < 0].astype(str)))
+                raise ValueError(f"Unknown {name} value(s): {', '.join(unknown)}")
+            return codes.astype(np.intp)
+
+    if ((codes < 0) | (codes >= len(labels))).any():
+        raise ValueError(f"{name} code(s) out of range 0-{len(labels) - 1}")
+    return np.broadcast_to(codes.astype(np.intp), (n,))
+
+def _row_count(data):
+    if isinstance(data, pd.DataFrame):
+        return len(data)
+    lengths = [np.shape(value)[0] for value in data.values() if np.ndim(value) > 0]
+    return max(lengths) if lengths else 1
+
+def variant_components(data, tables=None):
+    """Computes the per-variant (n x 6) intermediates that every headline metric sums over."""
+    tables = tables or TABLES
+    n = _row_count(data)
+
+    weeks_year = _column(data, "weeks_year", n)
+    annual_volume = _matrix(data, "weekly_volume", n) * weeks_year[:, None]
+
+    doctor_minutes = _matrix(data, "doctor_time", n)
+    hours = {
+        "admin": _matrix(data, "admin_time", n) / 60 * annual_volume,
+        "nurse": _matrix(data, "nurse_time", n) / 60 * annual_volume,
+        "doctor": (doctor_minutes + _matrix(data, "research_time", n)) / 60 * annual_volume,
+        "genetic": _matrix(data, "genetic_time", n) / 60 * annual_volume
+    }
+
+    staff_cost = sum(hours[role] * _column(data, f"{role}_hourly", n)[:, None] for role in engine.ROLES)
+
+    simplified = _column(data, "simplified_mode", n, OPTIONAL_COLUMNS["simplified_mode"]).astype(bool)
+    probability = np.where(simplified[:, None], tables["complex_probabilities"], 1.0)
+    patient_savings = np.where(
+        tables["is_complex"],
+        hours["genetic"] * tables["genetic_counseling_cost"] * probability,
+        0.0
+    )
+
+    rates = tables["rates"][_codes(data, "specialty", tables["specialties"], n)]
+    model = _codes(data, "billing_model", BILLING_MODELS, n)
+    private_hourly = _column(data, "private_hourly", n, OPTIONAL_COLUMNS["private_hourly"])[:, None]
+    bulk_share = _column(data, "bulk_rate", n, OPTIONAL_COLUMNS["bulk_rate"])[:, None] / 100
+    revenue_doctor_hours = doctor_minutes / 60 * annual_volume
+
+    bulk_revenue = annual_volume * rates
+    private_revenue = revenue_doctor_hours * private_hourly
+    bulk_volume = annual_volume * bulk_share
+    mixed_revenue = bulk_volume * rates + (annual_volume - bulk_volume) * private_hourly * (doctor_minutes / 60)
+    revenue = np.choose(model[:, None], [bulk_revenue, mixed_revenue, private_revenue])
+
+    return {
+        "annual_volume": annual_volume,
+        "hours": hours,
+        "staff_cost": staff_cost,
+        "patient_savings": patient_savings,
+        "revenue": revenue,
+        "revenue_doctor_hours": revenue_doctor_hours,
+        "billing_model": model
+    }
+
+def evaluate_components(data, components):
+    """Aggregates per-variant intermediates into the headline metrics of `run_calculations`."""
+    n = len(components["billing_model"])
+
+    staff_costs = components["staff_cost"].sum(axis=1)
+    total_doctor_hours_saved = components["revenue_doctor_hours"].sum(axis=1)
+
+    private_hourly = _column(data, "private_hourly", n, OPTIONAL_COLUMNS["private_hourly"])
+    additional_revenue = np.where(
+        components["billing_model"] != BILLING_MODELS.index("Bulk Bill"),
+        total_doctor_hours_saved * _column(data, "consults_per_hour", n) * private_hourly,
+        0.0
+    )
+    total_revenue = components["revenue"].sum(axis=1) + additional_revenue
+
+    logistical_costs = sum(_column(data, column, n, OPTIONAL_COLUMNS[column]) for column in LOGISTICS_COLUMNS) * 12
+    total_staff_hours_saved = sum(components["hours"].values()).sum(axis=1)
+
+    # Efficiency savings value the same workload hours as the staff costs
+    total_annual_savings = staff_costs
+
+    return {
+        "staff_costs": staff_costs,
+        "logistical_costs": logistical_costs,
+        "total_annual_savings": total_annual_savings,
+        "total_revenue": total_revenue,
+        "additional_revenue": additional_revenue,
+        "total_doctor_hours_saved": total_doctor_hours_saved,
+        "potential_patient_savings": components["patient_savings"].sum(axis=1),
+        "total_staff_hours_saved": total_staff_hours_saved,
+        "net_annual_benefit": total_annual_savings + total_revenue - staff_costs - logistical_costs
+    }
+
+def evaluate_arrays(data, tables=None):
+    """Evaluates a mapping of column arrays (or scalars) and returns a dict of metric arrays."""
+    return evaluate_components(data, variant_components(data, tables))
+
+def evaluate_batch(frame, tables=None):
+    """Evaluates every clinic row in `frame` and returns one row of headline metrics per clinic."""
+    missing = [column for column in REQUIRED_COLUMNS if column not in frame]
+    if missing:
+        raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+
+    metrics = evaluate_arrays(frame, tables)
+    return pd.DataFrame(metrics, index=frame.index, columns=OUTPUT_COLUMNS)
+
+def evaluate_versions(frame, versions, simplified_defaults=False):
+    """Evaluates every clinic under each assumptions version; returns metrics indexed by (version, clinic row)."""
+    results = {}
+    for version in versions:
+        tables = tables_for(version)
+        # Simplified defaults (times, complex volumes) follow each version's own tables
+        data = apply_simplified_defaults(frame, tables) if simplified_defaults else frame
+        results[version["version"]] = evaluate_batch(data, tables)
+    return pd.concat(results, names=["version"])
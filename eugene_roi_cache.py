@@ -0,0 +1,338 @@
+"""
+Bounded, thread-safe LRU cache for ROI results.
+
+Keys are canonical hashes of the engine inputs, so dicts that differ only in
+key order or int-vs-float (20 vs 20.0) share an entry. Values are deep-copied
+on the way in and out, so callers can safely add keys to a cached result.
+
+`DiskCache` is an optional second tier in a local SQLite file, shared by
+every session, process and restart on the machine: pass one as a
+`ResultCache`'s `backend` and memory misses fall through to disk, while new
+values are written to both. Disk entries expire `ttl` seconds after they are
+written, and the least recently used ones are evicted once the file's
+entries exceed `max_bytes`. Values are pickled, so the file must only be
+writable by the app. Disk errors are logged and treated as misses.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger("eugene_roi.cache")
+
+# -------------------- CONSTANTS --------------------
+
+# ✅ Default number of scenarios kept per cache
+DEFAULT_CACHE_SIZE = 256
+
+# ✅ Shared disk cache file (unset or empty = no disk cache)
+DISK_CACHE_PATH = os.environ.get("EUGENE_ROI_DISK_CACHE", "")
+
+# ✅ Disk entries expire a week after they are written
+DEFAULT_DISK_TTL = 7 * 24 * 3600
+
+# ✅ Disk cache size bound (pickled values)
+DEFAULT_DISK_MAX_BYTES = 256 * 1024 * 1024
+
+
+# -------------------- CANONICAL KEYS --------------------
+
+def _normalize(value):
+    """Converts inputs into a JSON-stable form (sorted dicts, floats for all numbers)."""
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if type(value).__module__ == "numpy" and hasattr(value, "item"):
+        # numpy scalars, detected without importing numpy (keeps the dashboard import light)
+        value = value.item()
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    return repr(value)
+
+def canonical_key(*parts):
+    """Returns a stable SHA-256 hex digest for any combination of input dicts and scalars."""
+    payload = json.dumps(_normalize(parts), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def inputs_key(practice, staff, billing, test_configs, logistics, simplified_mode=True, assumptions_version=None):
+    """Canonical key for one `run_calculations` call (include the assumptions fingerprint when not the default)."""
+    return canonical_key(practice, staff, billing, test_configs, logistics or {}, simplified_mode, assumptions_version)
+
+
+# -------------------- LRU CACHE --------------------
+
+class ResultCache:
+    """Least-recently-used cache with a size limit and hit/miss counters."""
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE, copy_values=True, backend=None):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.copy_values = copy_values
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries or (self.backend is not None and key in self.backend)
+
+    def _copy(self, value):
+        return copy.deepcopy(value) if self.copy_values else value
+
+    def get(self, key, default=None):
+        """Returns the cached value for `key` (counting a hit or miss)."""
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                value = self._entries[key]
+                return self._copy(value)
+            self.misses += 1
+
+        if self.backend is None:
+            return default
+        sentinel = object()
+        value = self.backend.get(key, sentinel)
+        if value is sentinel:
+            return default
+        # Unpickled values are already private copies
+        self._store(key, value)
+        return self._copy(value)
+
+    def _store(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def put(self, key, value):
+        """Stores `value` (and writes it to the backend), evicting the least recently used entries beyond `maxsize`."""
+        self._store(key, self._copy(value))
+        if self.backend is not None:
+            self.backend.put(key, value)
+
+    def get_or_compute(self, key, compute):
+        """Returns the cached value, or computes, stores and returns it on a miss."""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Returns hit/miss counters and occupancy."""
+        lookups = self.hits + self.misses
+        stats = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+        if self.backend is not None:
+            stats["disk"] = self.backend.stats()
+        return stats
+
+
+# -------------------- DISK CACHE --------------------
+
+def open_disk_cache(path=DISK_CACHE_PATH, namespace="results", **options):
+    """Opens a `DiskCache`, or returns None when `path` is empty or the file cannot be opened."""
+    if not path:
+        return None
+    try:
+        return DiskCache(path, namespace, **options)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning("Disk cache disabled: cannot open %s: %s", path, e)
+        return None
+
+class DiskCache:
+    """SQLite-backed cache shared across sessions and processes, with a TTL and a size bound.
+
+    `namespace` separates kinds of values (e.g. "results" and "reports") in one file.
+    """
+
+    def __init__(self, path, namespace="results", ttl=DEFAULT_DISK_TTL, max_bytes=DEFAULT_DISK_MAX_BYTES):
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        self.path = path
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, size INTEGER NOT NULL, "
+            "created REAL NOT NULL, accessed REAL NOT NULL, PRIMARY KEY (namespace, key))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_created ON entries (created)")
+
+    def _failed(self, action, error):
+        self.errors += 1
+        logger.warning("Disk cache %s failed (%s): %s", action, self.path, error)
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM entries WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
+
+    def __contains__(self, key):
+        try:
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT created FROM entries WHERE namespace = ? AND key = ?", (self.namespace, key)
+                ).fetchone()
+        except sqlite3.Error as e:
+            self._failed("lookup", e)
+            return False
+        return row is not None and time.time() - row[0] <= self.ttl
+
+    def get(self, key, default=None):
+        """Returns the stored value for `key` unless it is missing or expired (counting a hit or miss)."""
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT value, created FROM entries WHERE namespace = ? AND key = ?", (self.namespace, key)
+                ).fetchone()
+                if row is not None and now - row[1] > self.ttl:
+                    self._db.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (self.namespace, key))
+                    self.expired += 1
+                    row = None
+                if row is None:
+                    self.misses += 1
+                    return default
+                self._db.execute(
+                    "UPDATE entries SET accessed = ? WHERE namespace = ? AND key = ?", (now, self.namespace, key)
+                )
+                self.hits += 1
+            return pickle.loads(row[0])
+        except (sqlite3.Error, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+            self._failed("read", e)
+            return default
+
+    def put(self, key, value):
+        """Stores `value`, then drops expired entries and the least recently used ones beyond `max_bytes`."""
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            self._failed("pickle", e)
+            return
+        if len(data) > self.max_bytes:
+            return
+
+        now = time.time()
+        try:
+            with self._lock:
+                self._db.execute("BEGIN IMMEDIATE")
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                        (self.namespace, key, data, len(data), now, now)
+                    )
+                    self.expired += self._db.execute("DELETE FROM entries WHERE created < ?", (now - self.ttl,)).rowcount
+                    self.evictions += self._evict()
+                    self._db.execute("COMMIT")
+                except BaseException:
+                    self._db.execute("ROLLBACK")
+                    raise
+        except sqlite3.Error as e:
+            self._failed("write", e)
+
+    def _evict(self):
+        """Deletes least recently used entries until the file's entries fit in `max_bytes`; returns how many."""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        evicted = 0
+        if total <= self.max_bytes:
+            return evicted
+        for namespace, key, size in self._db.execute(
+            "SELECT namespace, key, size FROM entries ORDER BY accessed"
+        ).fetchall():
+            self._db.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+            evicted += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+        return evicted
+
+    def get_or_compute(self, key, compute):
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        """Deletes this namespace's entries and resets the counters."""
+        try:
+            with self._lock:
+                self._db.execute("DELETE FROM entries WHERE namespace = ?", (self.namespace,))
+                self.hits = self.misses = self.expired = self.evictions = self.errors = 0
+        except sqlite3.Error as e:
+            self._failed("clear", e)
+
+    def stats(self):
+        """Hit/miss counters and this namespace's (and the whole file's) occupancy."""
+        try:
+            with self._lock:
+                entries, size = self._db.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries WHERE namespace = ?", (self.namespace,)
+                ).fetchone()
+                file_size = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        except sqlite3.Error as e:
+            self._failed("stats", e)
+            entries = size = file_size = None
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "namespace": self.namespace,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "errors": self.errors,
+            "entries": entries,
+            "bytes": size,
+            "file_bytes": file_size,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl
+        }
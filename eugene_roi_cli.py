@@ -0,0 +1,215 @@
+"""
+Command-line batch runner: a file of clinic profiles in, ROI results out.
+
+    python eugene_roi_cli.py clinics.csv -o results.parquet --excel report.xlsx
+
+Input rows use the flat column layout of `eugene_roi_batch` (CSV or Parquet).
+Rows are read, evaluated and written in chunks, so memory stays bounded by
+`--chunksize` regardless of input size; `--workers N` evaluates chunks on a
+process pool. Output format follows the extension
+of `--output` (.parquet or .csv); `--excel` additionally writes a workbook
+with a per-clinic "Clinic Results" sheet and a portfolio "Summary" sheet.
+"""
+
+import argparse
+import logging
+import os
+import sys
+from functools import partial
+from pathlib import Path
+
+import pandas as pd
+
+import eugene_roi_batch as batch
+import eugene_roi_export as export
+
+logger = logging.getLogger("eugene_roi.cli")
+
+# -------------------- CONSTANTS --------------------
+
+# ✅ Rows evaluated per chunk (bounds peak memory)
+DEFAULT_CHUNKSIZE = 100_000
+
+# ✅ Metric columns reported in hours rather than dollars
+HOURS_COLUMNS = {"total_doctor_hours_saved", "total_staff_hours_saved"}
+
+# Parquet types of the batch columns; any other (pass-through) column is written as a string
+LABEL_COLUMNS = {"specialty", "billing_model"}
+BOOLEAN_COLUMNS = {"simplified_mode"}
+NUMERIC_COLUMNS = (
+    set(batch.REQUIRED_COLUMNS) - LABEL_COLUMNS
+    | set(batch.OPTIONAL_COLUMNS) - BOOLEAN_COLUMNS
+    | {"operation_days"}
+    | set(batch.LOGISTICS_COLUMNS)
+    | {column for field in batch.TEST_FIELDS for column in batch.variant_columns(field)}
+    | set(batch.OUTPUT_COLUMNS)
+)
+
+
+# -------------------- READING --------------------
+
+def read_chunks(path, chunksize=DEFAULT_CHUNKSIZE):
+    """Yields DataFrame chunks from a CSV or Parquet file of clinic profiles."""
+    path = Path(path)
+    suffix = path.suffix.lower()
+
+    if suffix == ".csv":
+        yield from pd.read_csv(path, chunksize=chunksize)
+    elif suffix in (".parquet", ".pq"):
+        import pyarrow.parquet as pq
+
+        for record_batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield record_batch.to_pandas()
+    else:
+        raise ValueError(f"Unsupported input format '{suffix}' (expected .csv or .parquet)")
+
+
+# -------------------- WRITING --------------------
+
+def parquet_schema(chunk):
+    """Declared Parquet schema for result chunks shaped like `chunk`.
+
+    The types come from the column names alone, never from the chunk's
+    values: `simplified_mode` is bool, the batch's numeric inputs and metrics
+    are float64, and labels and every pass-through column (site names, notes)
+    are strings. A first chunk that infers int, or a blank text column read
+    as float, therefore cannot fix the file's types.
+    """
+    import pyarrow as pa
+
+    fields = []
+    for name in chunk.columns:
+        if name in BOOLEAN_COLUMNS:
+            field_type = pa.bool_()
+        elif name in NUMERIC_COLUMNS:
+            field_type = pa.float64()
+        else:
+            field_type = pa.string()
+        fields.append(pa.field(str(name), field_type))
+    return pa.schema(fields)
+
+class ResultWriter:
+    """Appends result chunks to a single Parquet or CSV file.
+
+    Chunks go to a `.partial` file next to `path`, which `close` renames into
+    place; `abort` deletes it, so a failed run never leaves a truncated file.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.suffix = self.path.suffix.lower()
+        if self.suffix not in (".csv", ".parquet", ".pq"):
+            raise ValueError(f"Unsupported output format '{self.suffix}' (expected .csv or .parquet)")
+        self.partial_path = self.path.with_name(self.path.name + ".partial")
+        self._parquet_writer = None
+        self._schema = None
+        self._wrote_header = False
+
+    def write(self, chunk):
+        if self.suffix == ".csv":
+            chunk.to_csv(self.partial_path, mode="a" if self._wrote_header else "w",
+                          header=not self._wrote_header, index=False)
+            self._wrote_header = True
+            return
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self._parquet_writer is None:
+            self._schema = parquet_schema(chunk)
+            self._parquet_writer = pq.ParquetWriter(self.partial_path, self._schema)
+        table = pa.Table.from_pandas(chunk, preserve_index=False).cast(self._schema)
+        self._parquet_writer.write_table(table)
+
+    def close(self):
+        """Finishes the file and moves it to `path`."""
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+        if self.partial_path.exists():
+            os.replace(self.partial_path, self.path)
+
+    def abort(self):
+        """Discards everything written so far."""
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+        self.partial_path.unlink(missing_ok=True)
+
+
+# -------------------- RUNNER --------------------
+
+def evaluate_chunk(chunk, simplified_defaults=True, metrics_only=False, tables=None):
+    """Evaluates one chunk of clinic profiles and returns inputs plus metric columns."""
+    if simplified_defaults:
+        chunk = batch.apply_simplified_defaults(chunk, tables)
+    metrics = batch.evaluate_batch(chunk, tables)
+    if metrics_only:
+        return metrics
+    return pd.concat([chunk.drop(columns=batch.OUTPUT_COLUMNS, errors="ignore"), metrics], axis=1)
+
+def run(input_path, output_path, excel_path=None, chunksize=DEFAULT_CHUNKSIZE,
+        simplified_defaults=True, metrics_only=False, workers=1):
+    """Evaluates every clinic in `input_path` chunk by chunk; returns the number of clinics processed."""
+    writer = ResultWriter(output_path)
+    excel = export.PortfolioReportWriter(excel_path, batch.OUTPUT_COLUMNS, HOURS_COLUMNS) if excel_path else None
+    clinics = 0
+
+    evaluate = partial(evaluate_chunk, simplified_defaults=simplified_defaults, metrics_only=metrics_only)
+    chunks = read_chunks(input_path, chunksize)
+    if workers > 1:
+        import eugene_roi_parallel as parallel
+
+        evaluated = parallel.iter_evaluate_parallel(chunks, evaluate, workers)
+    else:
+        evaluated = map(evaluate, chunks)
+
+    try:
+        for results in evaluated:
+            writer.write(results)
+            if excel:
+                excel.write(results)
+            clinics += len(results)
+            logger.info("Processed %d clinics", clinics)
+        writer.close()
+    except BaseException:
+        writer.abort()
+        raise
+    finally:
+        if excel:
+            excel.close()
+
+    return clinics
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate Eugene ROI for a file of clinic profiles.")
+    parser.add_argument("input", help="CSV or Parquet file of clinic profiles (one row per clinic).")
+    parser.add_argument("-o", "--output", required=True, help="Output .parquet or .csv file.")
+    parser.add_argument("--excel", help="Optional .xlsx report with Clinic Results and Summary sheets.")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="Rows evaluated per chunk.")
+    parser.add_argument("--no-simplified-defaults", action="store_true",
+                        help="Do not fill absent time/complex-volume columns with Simplified-mode assumptions.")
+    parser.add_argument("--metrics-only", action="store_true", help="Write only the metric columns.")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for chunk evaluation (default 1).")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Suppress progress logging.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING if args.quiet else logging.INFO, format="%(message)s")
+
+    try:
+        clinics = run(
+            args.input, args.output, args.excel, args.chunksize,
+            simplified_defaults=not args.no_simplified_defaults,
+            metrics_only=args.metrics_only,
+            workers=args.workers
+        )
+    except (ValueError, FileNotFoundError) as e:
+        logger.error("Error: %s", e)
+        return 1
+
+    logger.info("Wrote %d clinic results to %s", clinics, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,25 @@
 # -------------------- PAGE CONFIG --------------------
 
+import os
+from functools import lru_cache
+
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-from io import BytesIO
-import plotly.graph_objects as go
-import plotly.express as px
-import time
-
-# Set Streamlit page config
-st.set_page_config(page_title="Eugene ROI Calculator", layout="wide")
-
-# Custom CSS for styling
-custom_css = """
+
+# Reference tables and calculations live in the headless engine so batch jobs share them.
+# Heavier modules (pandas, plotly, the numpy-backed analysis modules, xlsxwriter) are
+# imported inside the functions that use them so the first page render is fast.
+import eugene_roi_engine as engine
+import eugene_roi_assumptions
+import eugene_roi_cache as result_cache
+import eugene_roi_incremental as incremental
+import eugene_roi_timing as timing
+from eugene_roi_engine import TEST_TYPES
+
+# Custom CSS for styling (./static is served at app/static, see .streamlit/config.toml)
+CUSTOM_CSS = """
 <style>
 [data-testid="stAppViewContainer"] {
-    background-image: url('https://raw.githubusercontent.com/JoseSedeno/Eugene/main/background.jpg');
+    background-image: url('app/static/background.jpg');
     background-size: cover;
     background-repeat: no-repeat;
     background-attachment: fixed;
@@ -65,105 +69,73 @@ button.stButton:hover {
 </style>
 """
 
-# Apply the custom CSS
-st.markdown(custom_css, unsafe_allow_html=True)
-
-# Initialize session state for input mode selection and user type
-if "input_mode_selection" not in st.session_state:
-    st.session_state["input_mode_selection"] = "Simplified"
-if "user_type" not in st.session_state:
-    st.session_state["user_type"] = "Doctor/Clinician"
-if "results" not in st.session_state:
-    st.session_state["results"] = {}
-
-
-# -------------------- LOGO PLACEHOLDER --------------------
-
-logo_base64 = "iVBORw0KGgoAAAANSUhEUgAAAKoAAAAzCAYAAAAHH5MJAAAAAXNSR0IArs4c6QAAAARnQU1BAACxjwv8YQUAAAAJcEhZcwAADsMAAA7DAcdvqGQAABfGSURBVHhe7Zx3eFTF/v9fc3az6Z3QhEBCR7r03lF6F9tF6YhAROWKgPUqNixYEOGKigLCVbGjeEWqEiD0mkACpJdN203Z7J75/rHJJmdTCEV+Nz/39Tzz5Dlz5syZnXnPfD5TToSUUuLCxf84inOECxf/i7iE6qJG4BKqixqBS6guagQuobqoEbiE6qJG4BKqixqBS6guagQuobqoEbiE6qJG4BKqixqBS6guagTirziUoqqS1NQsThyP45ftRzgUeYXkpBxsNhu3NQiic5fbGDy0A506NyUkxN/5cfLzC8nJySM7K59Mo4mLFxM5djSWqEPxZGXm887qh+jWo5nzY9hsKrm5Zky5hRiNJtJSszl2NIZjRxM5dTKJEaNa8+wL9yGEcH5Ug5SSpCQjp05cZudvxzkYGU9iQhaFBUUEBHrRtFkIvXo3oXuPVqiqxGwuICvbRHaWiawsE5nGHHJy8rjnvgF0697KOXssFiuxF5PZt/c0v/92ltOnUsjKNOPlZSC8STC9+jRlyLBONGtWD28fD+fHNeTm5BEfn8GhyBi2bP6TvXuiWbzkLp5cOtHxO3Oy8zh9+jI7fj7Mnl1xXL6UgaIIwpqEMGRoc0aM6kbTZvWvWi8lqKpKYoKRw4ei+fWXExw9kkByUjZubnpuaxhI166hDB7WnnbtGxMc7Of8+HVx04WqqpK1a37is0/3cepEIlarpPQNJRWhYjDoaNOuPvMXDmXchN7odPbB/eyZWP75+OdkZOSTnmYmIz2XwkIb9mIKAgK92fjFPPr0a12SKRSL6+03vuPHH6LINOaRkpxLdnY+qmp/TkrJjNk9eHPV7EobREpJnrmA1e/9xJdbIzl/LhWLxYYQoAiQgJSi+PdI3N112GwqNpv9HSV5ACBU1q2fxd339NHkn5iQzosvfMV/d5wiKTEbKUvKUvJXAhJ/fw8GDm7Nilfvpf5ttRxlllKiqpITx2P55qtIDvx5gfPnU0hNyUVKEEKwZNlw/vnUBEAQeeAsLz7/NYcPxmEyWYrLby+jEKAo0DgsiOXPjWXCxD6V1k0JWVkmPnhvO19uieTChTSKikoaV1t+b28Dbds1YPGS0Qwa0gFFqTrfq3HThCqlJNNoImL+OrZ9dRRVFRgMOkIbBdC9e3P8A32IPp/AkahLZKTnFQtI4uGu46XXpjB95mAURXDgj1OMGv4GhQX2BnEmMKhyoc6ZvoYtX0RitaplOocjxVWFmpuTT8T8dWz94jCqam/IBg39mb9wMKPHdic318yXW/fz0bp9pKWaHe/w9/fE28eN/Pwi8vOKsFhsSGlj3cczHUKVUnIk6gIP3v8usRezAPDxcef2NvXp2Ckci8VK1OEYos+nYjYXOTpDvfqefL99Kc1bNEAIu8jGj36B336NQVWVcr9TCFiybASPLR7Lps93sezJrWRnF5ZLp0Xi66vn258W07lL80rrJzMzl/lz1/DtthNIqeDuriO0kT89erXC18eTM2eucDQqDqOxwNFpAgMNbNg8jz59296QWHXPPvvss86R10NenoVFC9bz9ZdHUFUwGARLnx7FG6seZPI9vRgytB1339OLgYNaExOdyKVLGYDAapMcioyhS7cwQhvVxsfXi7btQmneojbHjl3CUmjTvMfT08CESV1p1DhEEy+EoEHDQDp0CsVSWEhcXEa5xunUuSF33tW5woawWm08segjNn0Wiara7wfX8mTr1xGMGtMdf39vQkIC6Nu/LR3vaMTvv50gN8cCgK+fBzNn9+OJJ0cxcFAbOnZqSPeeTejTtxW16wQAcPTIBWY8uJqYaCMArdvU4b0PpvPk0rEMH9mJu0Z05L4H+tC8RW2ORMWRlZUPCEy5RZw+dYmhd3bAp9gNyMnO49DBOPLMRY7ylyAEdOgQyt7dp3h1xffk5loICvKiUVgI9eoFotcLzGZn4QqsVonBAIMGt3dYt7JcvpTCQ/evYsfP55BSEBDozjMvTODtd6Yxdnw3Bg9tx8TJ3enTrznnz8aTEJ+FlJCfb+On76Po0aspDUO1bXYt3JQR1WZTeflfm3n5pZ+RUqDTCZ55fiwRj40u14uklGRnm+nU5gnS0gqKzZCkYUMfDh57HR8fT6S0uwu/bD/ExLHvaOZ8lY2olDG7ZlMBY0e+zIE/L5ea4quMqFs2/86MB9c7RCqE5Mlld/LUsinl0kspefvNr1m+5BuH6dbrJRs2zWPEqC44Z5+amkXv7ktJTsxDSgip7cmmrQvo1r1lhXmvW/Mrj0VsdFgURYHX3pzMrDl3OUbVo0cuMvOh1USfzyh2PUrx8TWg2mx06x7GP58aQ8/ebTT3t2zezaPzPyc3197RKO7obdrWY8fOp/Hx1frFFouVxyM+4uOP9qOqoCiSF18Zx7z5Yyps3+jzSYwe/irxV+yWQwjBoCHN2bBxIb5+Xpr01aV817kO9u45zRuv73A0WodODbn3gb7lfgTFhfb39+afS0cjhFoSS0KCiW+3HXCkURTBHZ2bo9eXz6MyhBAIIXAz6AkLDyn2l65Ofn4h3397pIy/CB4eegYM7KBJV4IQgn88OJjAwNIGtVoFj8z9iLjYZEc5hBDYbCqr391OanJ+sTmESXd3rdTECiGYPKUHYeGBjjgpBW+v3E5eXqEjTYeO4ew98BKtb69f5ml7/h07hrLlq4V8/f0SevVpg6LY67MkTJ7Sl6eWj0GnK32/lJK42FSKiqya/KSU7N93mi2bIx3uUI9e4cyeO7LS9m0cVptBg1o5fp+UkqhDl4mOTnJOXm1uWKgFBRbWfrCDwkK7KIQQDLuzHXWKTV5l9OzVmsBAb8e1qgp+2X4cq7XU1Ot0Cnr9tRdRCIFer3OOrhSj0UR0dKrGHPoHeBMY6Fs2mYbAQF+6dG2qEZsxI5/vvzusSWc2FbBl85+OUU+nszI/YniF5rUEXz8vxk/o7OhoUkquXMni99+OOyyEEAKDwY2AgNI6LKFPvxb07d8WvV5XYWdQFEGnO5rgH6Ad3XJzCx2doQSr1cZjCz7GZLK7GTqd4PHFY3Bzq7x+DQY9/Qa2AkoGIsjKyuf3ncc06a6FymurmsTFpnEw8pLjWihW+g1oUWEFlSCEwM/Pk1oh2kpOSDCSlWXSxN0K8vMs5GRrG8jNTV9pQ5fQomWwpjGkFFy+lFbmWrJ5824uX8qE4tGuS9dwGjSoXWW+Qgi69WzqZBEU9u+LpnR2XTlC2ENVePsY8PDQO8UKLBbtiLpn10mio9Md723YMIgmTetWWX6AFi3ro+hKyy8l7Nl1UZPmWrhhoZ44fpHkJLsvAiBQadkqtHjZpvKgd1Pw9nbT5JWZUUCeudRvulVICbJUb1BsKYqKrGV83PJ4ehmcozRICWs/+LVMNUu6dg8vVxfOQVUloY3qOuUmOHvmSpXluRb0eomiaEXpjJSSn348ipSlo2fd+r74+nmWK7Nz8PPz1vQzKSH6fEppxDVyw0L9/bfTqGUaWVHcGdD7aTq1e7TKMHTAc5w6mVw2KwoKrRQVaWf5twIvLwN+ftoJRHaWmfT0bE2cM6kpuZprIaBBg2DHdWJiGjHnUx3XUgo+3xDJHe0XlasP5zB+1MpyzXOrrY3JlE/0+URN5zh2JJ6BfZaXK69zGHnny6iqtvzpadr6uhZuWKhHohI05qioSCX2YjYXY7KqDJcv5RQvpktHUFVbhWunfzVBQd6ENQnSxBUVqfz8k9bf1CKIOnxFU4WKTqVXnxaO6+hz8eWWyDLS88rVRUUhIT5LUzf2oM3rryY3J4+0VK248vKsxMVWp32zAG35y7pJ18oNL081rDuPTKPZcd04LIhHHx+Ich1dwMvbgzvv6o6/vw8AxoxcmoctoKCgtIhVLU+VYLFYWThvLZ99eqCMUKpentr21T4evP9DrNbSe0HBBnb/8QKNGml9Siklx4/H0qfbM6hqiVmUjJ/UkY83LHTMhj/fsJu5M9c7Op8QMGNWL9q2r3ddoqtd25/hI3s7yqKqkhFDV7Bn93lHGiHgqeUjNFuoFXHyxAUmjn2D+CtmRPGSF6icPPsajcPrAHAhJpmxI18j9mKG47kOnW7jwWk90FU+l6oUvV7HA1Pvco6uFjcsVD+PhzSjYJOm/kSdeLPCpYvqoJ1F3zqhWixWXnt5K6+u+BlbsfchBPTq3ZR3Vk+jabN6jgaNi01h7sx17Nsb41hyat/xNjb/J4Lbymx3rln9C49HbHSUQQjJ6rVTuff+AdclVJzq568UqpSS8+cSGXnnqyQllrpAI0e34+MN83D3qNo/r4yqylQV1zHuaXF+8aW4dCwWK6LMWuK1hP9XGAx6Fi+ZxGNPDMPb2z4blhL27Y2hV9clrP3gZw4djGbrF/vo3+tp9u2NAQR6Pdzeth6rP5yuESmAm955Vg2xF5OLZ+Xlf3t1wq2i5F3Or8zONpFfYClXruqG6+WGhVorRLvWKFUdUYfOaeJqCm5ueh5/cjxt2tZFpxMYDHah5eXBooWb6N/rOab9Yy0ZGYXodIL2Herwxqp7+XXnctq2Cy/XEH5+hmLfrASF3buiy1z/b2Mw6PHy0q7MxF/JxJhxayd13AyhtmxpN4klqFLhh++P3LRllFuFlJKcbDNzZrzH4UNXeP7F0aTnrCX60kpeeX0U4yaGMWZ8OBGP9eTn3x4jLXsdu/9YwUPTh+DjW/G2YGjjoDK7b/Z3RP4Zw+XLKTWifry8DQSU2X0DuBRn5OjRC7e8/Dcs1L4DwjWjhpSwY/tJrlwuXfiuDlarjV2/H63mrP/6TUhlxEQnMXHs63z95VGGDmvNnHn2LcK6dYN5eP4EPvnsaTZsfJYXXppFz15tcXPToShVm7OWLRvhH+CpiVNVHc8t30pBQfkDJZUhpeRg5DkSE9JvqUACA31p2LB0uQ1ASoW3Vv6MKTdfE381EuLTOHMqzjm62tywUIcM6Yy3t9axPnculddf2YaqympVrKpKZk9/l8WLPichPt35tgZrkZWCwqtvClTnvSXk5xXwzLJN/LE/Dinh4fnDHGafYn9NURQURbkmX8vH14sxYztRduVbSvjhu2PsLLMdWhUlk5pZ09ax+LFPnW//pRgMevr2a+k0EEmORl3huWc2V3NQsbfvM8u3cPf4Vc63qs0NC7VxeAgdOoZq4lQV1v97PxGPrCMpyb59WBlpaVnMn7uGL7ce5fY2oYSElJ4IVxQFLy93TXqTqYDz5+KrbGRVlWRnFzhHV4iUkosXU9m/r8ScCb77Jorz5xJITcmsdigoKN95FEXwSMRw/Py0fp7ZbGXR/E/4cuv+codAyiKl5L87jjJz2gdciElh3IQuzkn+ckaM6kKduk7zEAmfrt/P809vpLCwcssgpeTsmSs89MA7bN18kPGTr7/8N7w8JaXks09/Z97sTzQ7VBQfYGgY6suM2f2YPWckBvfSBsvLK+CtldvYvPEAVy5nI4Tkmx8W0X9ge0caU24+Qwc+z4njyRphNmjoS+SRl/H19XKMbrL4aODxYxeYM3MNF6KzyM/XVuKYce3ZsClCs3QmpWT3rlOMvut1x7KUTicIruWrGVWvhsEg8fbWMWbcHSyIGIeXt923s1isPLrg33y6/g/N4r8QAnd3hW49Qnn73RmEhdcrvQmkpWWz8OG17N4Vg9lsoUPHuuz4/QXcy9RhZctTS5aNYMmyqpenjh2NZdK4t0hMyEZUsDxVgpSSzRt3MmvaJ5rTZQB6vaBZi1osfPROJk/ppzlok5Vl4vnln/Pjj6dJSTbRqHEg/9m2iBYtG2jyqC43LFSK/cuIRz5iwyf7y52NBPt5Sk8PBU8vPYoisdnAbC6isBBAoCiS6TN78tqbMzQ/1mKxsmjhv/l0/Z8aMyMEBAV58MSTowgLrw3ApUvpfPbJTs6dTaV9x1A83A3s2a11+j08dPzr5YmEh9dBp4d+/e2HhCMPRDN8yMsUFl7/zkkJiiJpfXsI69bP4/a2jQE4dfIy90x6i7jYzHI7VSDR6SU+3m4YDHYhWCwqJrMV1aYAglq1PNn0nwV061562EdKidGYS88uy0iIz3HkJgTce383Vr0/A4NBX6FYpZT88N1hZk1bR05OgUaoq96/jwenDXUsoQHk51uYM2O141B8WeyukIqXl4KHhx5FAatVYjIXUWSxf7ajKLBk6UieWDLumk61leWmCJXi7bZHF3xSfG6x+lkqimD8xE68u3oGPr7aiUeJ6bt38nvk5VVkIqVjB8x+VlIwbkJ7Vrz2AP96dqvTgr8dISRubgoGg+TClQ/w9vYgPj6diWNWcuqkduS+XoSA9h3r8/nmCBo1tnekE8dimTR+JQnxpnJlqgpFgVdX3s30WUNwc7OP8NnZZjZ9tpPNm/7g8MH4ciOdr6+B4SNbc98/+tGnT1vcii2DlJK4uGQ+Xf8bX/3nMBdi7F9ZlAoVgmt5MW5CB6Y+NJAOHZs47iUlGrnv7tc5dDDpmsovhOSRhf1Yuvyecu17Ldy0T1Hc3d0YNLgtxox0EhOzK/xMwpngWl6MGNmKVe/PrPDktxCCxmF1MRozOHUygaIi5xFPFH+sJgiu5cV9D3Rh5dvT8fX1YvuPURw/luCU3p5ncLA3oY1CmDqtP25uenx9PWnUKIiowxfJyrQfcL5RMo15dO4aRqvWDQGoXSeAgYNuJyYmkaTEzAotT1kURdCocRAfrJvKlHv7OUai1NRMmobO4eefzpGYkEtFKyAWi43Tp1L4YuMfKEo+vfu2RQiB0ZhLyyYL2L/3Mkaj/VMXZ/LzijgSFc/HH+3BP8DgOHPr6+fF3VP6kJGRxcULyRQ6fSJUEbVqeRKxaChLn56Cp9Nc41q5aSNqCUVFVk4cu8R/fz3OR+t+ITHB/qFXCUJAQKDggX8MZMToznTu0tQxUlSGxVLEd99E8ubr33HieEqZ/CTu7ipTp/Vn4uSe3NHZnpfFYiXikbVs/OwgYKNxmC8DB3ekRYtQaoX4EhYeRKPGdQkK8nWYN0thEa+s2Mp7q3aSX2BEKbP+WRVSGlBVT6S0TzLK3OHJZcNZunyyxlybTPns/O8Jvv3mANu+PIjFotMIRlEkne64jXvvH0C/Aa1p0rSexqc2GnMY3H9xsVtQNULAzLmDmPvweIQQZGWZ6N/7MShzbK8yhBAsXjKRKff217gPBQVFRB44x687jrNxwy7SUi3l2rduXQ+mThvE4KFt6dipaZWHrKvLTRdqCVJKrFaV1JRMMjNzKSiw4O5uICDAm9p1Aiv1nypDSonNppKcZCQ9Pbv4zKMXtzUIwcPDDaXMKRhVVbl8KQWTqYC69YIICPBx+L7O75RScvFCMgseXsfePRcZNLg5GzY9iodn9faybTaV7Gwz6z7czqsv/USRw5BI5kcM4KVXppZ7J8UTofz8QpKTjOTkmFFViZe3B8HBfgQH+1W6RiuLJ43VaTb789JRN7L4U+vqIITQ+KnOSCmxWKykJBvJyjJjsRRhMLgRFORLnbpB6PX2pbybxV8m1JpCQnw6k8a/wYljieh0Citem8ych4ddcyXn5xfSp/tSzp4pWQeWLFk2nKfKjKgurp+r24//j5FSsuqt7zhxLLF4dirw9bk+h9/T013zDZKbm46WrUJdIr1J/M2FCtHnkx0+otWqEhubUm3zWIKUkqSkTC7G2LeNhRCENwmmY6cw56QurpO/tVABAgPth7QpFu62rw5iNpX8v4GrY/fFbax5fztGo303TAiVxUtG0TisdOHcxY3xtxaqEDD1oX54eJTOys+dTWXMyBX89MNhcnJKv1yoiMzMXH779ShzZ67hnbd2YLNJgoI8WP7sGCbd3ee6D4+7KM/ffjJls6mseX87y5Z8gcViF5YQAm9vN+rU9aJdhwY0b16XkBB/3N3dMJsLSUw0En0+kTOnjWSkmzCZ7J9a1woxsPrDWQwc3OGatl9dXJ2/vVAp3qr94btIPly9kzOnrzj+yZfdd5WVToiEgMAgT5o1q8Owu9owY/Yw/P29K03v4vpxCbUMOdlmLl9O49SpK0QdvED0+XRSUuz/vrKwoAh3dz0+vh40aBBAy1Z16NS5Cc2a16NBw+Aq/6uKixvHJVQXNYK/9WTKRc3BJVQXNQKXUF3UCFxCdVEj+D+NVzJeYhKQoAAAAABJRU5ErkJggg=="
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+LOGO_FILE = "logo.png"
 
-def display_logo(logo_base64):
-    if logo_base64.strip():
-        img_html = f'<img src="data:image/png;base64,{logo_base64}" width="200">'
-        st.markdown(img_html, unsafe_allow_html=True)
-    else:
-        st.warning("⚠️ Logo not found. Please check your Base64 string.")
+def setup_page():
+    """Applies page config, styling, default session state and the logo."""
+    st.set_page_config(page_title="Eugene ROI Calculator", layout="wide")
 
-display_logo(logo_base64)
+    # Apply the custom CSS
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
-# -------------------- CONSTANTS --------------------
-
-# ✅ Test Categories & Variants
-TEST_TYPES = {
-    "Core": {"base": "Core", "curly": "Core Complex Cases"},
-    "Couples": {"base": "Couples", "curly": "Couples Complex Cases"},
-    "Comprehensive": {"base": "Comprehensive", "curly": "Comprehensive Complex Cases"}
-}
-
-# ✅ Predefined Salary Assumptions for Simplified Mode (Annual Salary Divided by Hours Worked)
-SIMPLIFIED_SALARY = {
-    "GP": 180,                 # $180 per hour
-    "OB/GYN": 220,             # $220 per hour
-    "Fertility Specialist": 250 # $250 per hour
-}
+    # Initialize session state for input mode selection and user type
+    if "input_mode_selection" not in st.session_state:
+        st.session_state["input_mode_selection"] = "Simplified"
+    if "user_type" not in st.session_state:
+        st.session_state["user_type"] = "Doctor/Clinician"
+    if "results" not in st.session_state:
+        st.session_state["results"] = {}
 
-# ✅ Specialty-Based Medicare Billing Rates (MBS)
-SPECIALTY_MBS = {
-    "GP": {
-        "Core": {"rate": 42.50}, "Core Complex Cases": {"rate": 85.00},
-        "Couples": {"rate": 78.20}, "Couples Complex Cases": {"rate": 156.40},
-        "Comprehensive": {"rate": 210.50}, "Comprehensive Complex Cases": {"rate": 421.00}
-    },
-    "OB/GYN": {
-        "Core": {"rate": 85.20}, "Core Complex Cases": {"rate": 170.40},
-        "Couples": {"rate": 120.75}, "Couples Complex Cases": {"rate": 241.50},
-        "Comprehensive": {"rate": 250.00}, "Comprehensive Complex Cases": {"rate": 500.00}
-    },
-    "Fertility Specialist": {
-        "Core": {"rate": 95.00}, "Core Complex Cases": {"rate": 190.00},
-        "Couples": {"rate": 150.00}, "Couples Complex Cases": {"rate": 300.00},
-        "Comprehensive": {"rate": 300.00}, "Comprehensive Complex Cases": {"rate": 600.00}
-    }
-}
+    display_logo(LOGO_FILE)
 
-# ✅ Updated Time Assumptions Per Test (Nurse time removed as tests are done from home)
-SIMPLIFIED_TIME = {
-    "Core": {"admin": 20, "nurse": 0, "doctor": 15, "research": 0},
-    "Couples": {"admin": 25, "nurse": 0, "doctor": 30, "research": 30},
-    "Comprehensive": {"admin": 30, "nurse": 0, "doctor": 45, "research": 60}
-}
 
-# ✅ Default Staff Costs for Simplified Mode
-DEFAULT_STAFF_COSTS = {
-    "admin_hourly": 45,   # $45/hour
-    "nurse_hourly": 60,   # $60/hour
-    "genetic_hourly": 90  # $90/hour
-}
+# -------------------- LOGO PLACEHOLDER --------------------
 
-# ✅ Weekly Work Schedule (Used in Simplified Mode)
-DEFAULT_WORK_SCHEDULE = {
-    "doctors_per_clinic": 1,        # Start with at least 1 doctor
-    "patients_per_hour": 4,         # Each doctor sees 4 patients per hour
-    "working_hours_per_day": 8,     # 8-hour workday
-    "days_per_week": 5              # 5 working days per week
-}
+@lru_cache(maxsize=None)
+def logo_html(logo_file):
+    """Builds the logo tag once; the image itself is a static file the browser caches."""
+    if not os.path.isfile(os.path.join(STATIC_DIR, logo_file)):
+        return ""
+    return f'<img src="app/static/{logo_file}" width="200">'
 
-# ✅ Logistics Costs (Only for Fertility Clinics)
-LOGISTICS_COSTS = {
-    "shipping": 500,          # Monthly shipping cost ($)
-    "storage": 200,           # Monthly storage cost ($)
-    "admin_logistics": 750,   # Admin logistics cost ($/month)
-    "misc_logistics": 300     # Miscellaneous logistics ($/month)
-}
+def display_logo(logo_file):
+    img_html = logo_html(logo_file)
+    if img_html:
+        st.markdown(img_html, unsafe_allow_html=True)
+    else:
+        st.warning("⚠️ Logo not found. Please check the static folder.")
+
+# -------------------- ASSUMPTIONS --------------------
+
+@st.cache_resource
+def get_assumption_store():
+    """Process-wide assumptions file, re-read on the next rerun after it changes on disk."""
+    return eugene_roi_assumptions.AssumptionStore()
+
+def select_assumptions():
+    """Sidebar choice of assumptions version (defaults to the one in effect today)."""
+    store = get_assumption_store()
+    versions = store.versions()
+    assumptions = store.current()
+
+    labels = [version["version"] for version in versions]
+    if len(labels) > 1:
+        label = st.sidebar.selectbox(
+            "📅 Assumptions Version", labels, index=labels.index(assumptions["version"]),
+            help="MBS rates, salaries, costs and complex-case probabilities to calculate with."
+        )
+        assumptions = versions[labels.index(label)]
+    st.sidebar.caption(f"Assumptions {assumptions['version']} (effective {assumptions['effective_date']})")
+    if store.error:
+        st.sidebar.warning(f"⚠️ The assumptions file could not be reloaded, so the last good version is in use: {store.error}")
 
-# ✅ Genetic Counseling Private Market Hourly Cost
-GENETIC_COUNSELING_PRIVATE_COST = 500  # $500/hour, confirmed from market research
+    st.session_state["assumptions"] = assumptions
+    return assumptions
 
-# ✅ Probability of Complex Cases (based on references provided)
-COMPLEX_CASE_PROBABILITIES = {
-    "Core Complex Cases": 0.04,          # From Lynch et al., 2018 & Edwards et al., 2021
-    "Couples Complex Cases": 0.06,       # Estimated higher due to complexity (assumption)
-    "Comprehensive Complex Cases": 0.08  # Estimated higher due to complexity (assumption)
-}
+def current_assumptions():
+    """Assumptions version selected for this rerun."""
+    return st.session_state.get("assumptions") or engine.ASSUMPTIONS
 
 
 # -------------------- INPUT SECTIONS --------------------
@@ -191,7 +163,7 @@ def get_practice_profile():
         cols = st.columns(2)
         specialty = cols[0].selectbox(
             "Medical Specialty",
-            list(SPECIALTY_MBS.keys()),
+            list(current_assumptions()["specialty_mbs"].keys()),
             key="specialty",
             help="Select the specialty of your practice. This determines MBS rates and doctor hourly cost assumptions."
         )
@@ -240,28 +212,20 @@ def get_staff_costs():
         else:
             num_doctors = cols[0].number_input("Number of Doctors", 1, 50, 3, help="Total number of doctors in the clinic.") if st.session_state["user_type"] == "Owner/Manager" else 1
 
-            staff = {
-                "num_admin": 1,
-                "num_nurse": 1,
-                "num_doctor": num_doctors,
-                "num_genetic_counselor": 0,
-                "admin_hourly": DEFAULT_STAFF_COSTS["admin_hourly"],
-                "nurse_hourly": DEFAULT_STAFF_COSTS["nurse_hourly"],
-                "genetic_hourly": DEFAULT_STAFF_COSTS["genetic_hourly"],
-                "doctor_hourly": SIMPLIFIED_SALARY.get(specialty, 180)
-            }
+            staff = engine.default_staff(specialty, num_doctors, current_assumptions())
 
         return staff
 
 def get_logistical_costs():
     if st.session_state["user_type"] == "Owner/Manager" and st.session_state.get("specialty") == "Fertility Specialist":
+        defaults = current_assumptions()["logistics_costs"]
         with st.expander("📦 Logistical Costs", expanded=True):
             cols = st.columns(2)
             return {
-                "shipping": cols[0].number_input("Monthly Shipping Costs ($)", 0, 10000, 500, help="Shipping and transportation costs for tests and samples."),
-                "storage": cols[1].number_input("Monthly Storage Costs ($)", 0, 5000, 200, help="Costs of storing samples or kits."),
-                "admin_logistics": cols[0].number_input("Admin Logistics ($/month)", 0, 5000, 750, help="Administrative overhead costs related to logistics."),
-                "misc_logistics": cols[1].number_input("Miscellaneous Logistics ($/month)", 0, 3000, 300, help="Any other logistics expenses.")
+                "shipping": cols[0].number_input("Monthly Shipping Costs ($)", 0, 10000, int(defaults["shipping"]), help="Shipping and transportation costs for tests and samples."),
+                "storage": cols[1].number_input("Monthly Storage Costs ($)", 0, 5000, int(defaults["storage"]), help="Costs of storing samples or kits."),
+                "admin_logistics": cols[0].number_input("Admin Logistics ($/month)", 0, 5000, int(defaults["admin_logistics"]), help="Administrative overhead costs related to logistics."),
+                "misc_logistics": cols[1].number_input("Miscellaneous Logistics ($/month)", 0, 3000, int(defaults["misc_logistics"]), help="Any other logistics expenses.")
             }
     return {}
 
@@ -299,21 +263,7 @@ def get_test_configuration(test_category):
                 help=f"Estimated number of {base.lower()} tests conducted each week."
             )
 
-            complex_weekly_volume = base_weekly_volume * COMPLEX_CASE_PROBABILITIES.get(curly, 0.05)
-
-            return {
-                base: {
-                    "weekly_volume": base_weekly_volume,
-                    "admin_time": SIMPLIFIED_TIME[test_category]["admin"],
-                    "nurse_time": SIMPLIFIED_TIME[test_category]["nurse"],
-                    "doctor_time": SIMPLIFIED_TIME[test_category]["doctor"]
-                },
-                curly: {
-                    "weekly_volume": complex_weekly_volume,
-                    "research_time": SIMPLIFIED_TIME[test_category]["research"],
-                    "genetic_time": 60
-                }
-            }
+            return engine.simplified_test_config(test_category, base_weekly_volume, current_assumptions())
     else:
         with st.expander(f"🧬 {test_category} Testing"):
             return {
@@ -334,350 +284,923 @@ def get_test_configuration(test_category):
 
 # -------------------- CALCULATION FUNCTIONS --------------------
 
-def calculate_annual_staff_costs(staff, test_config, weeks_year):
-    """Calculates annual staff costs based on actual test workload rather than full-time hours."""
-    try:
-        total_cost = 0.0
+@st.cache_resource
+def get_disk_cache(namespace):
+    """Shared on-disk cache tier for `namespace` (None unless EUGENE_ROI_DISK_CACHE names a file)."""
+    return result_cache.open_disk_cache(result_cache.DISK_CACHE_PATH, namespace)
+
+@st.cache_resource
+def get_result_cache():
+    """Process-wide LRU of computed results, shared by every session (backed by the disk cache when enabled)."""
+    return result_cache.ResultCache(maxsize=result_cache.DEFAULT_CACHE_SIZE, backend=get_disk_cache("results"))
+
+def get_calculator():
+    """Per-session incremental calculator, so a rerun only recomputes the test variants whose inputs changed."""
+    if "calculator" not in st.session_state:
+        st.session_state["calculator"] = incremental.IncrementalCalculator()
+    return st.session_state["calculator"]
+
+@timing.timed("run_calculations")
+def calculate_results(practice, staff, billing, test_configs, logistics, simplified_mode, assumptions, cache, calculator):
+    """Runs the headless ROI engine through the session's incremental calculator (or serves a cached result)."""
+    key = result_cache.inputs_key(
+        practice, staff, billing, test_configs, logistics, simplified_mode, assumptions["fingerprint"]
+    )
+    return cache.get_or_compute(
+        key,
+        lambda: calculator.run(
+            practice, staff, billing, test_configs, logistics,
+            simplified_mode=simplified_mode, assumptions=assumptions
+        )
+    )
 
-        for test_type, test_variants in test_config.items():
-            for variant, params in test_variants.items():
-                if "weekly_volume" not in params:
-                    continue
+@timing.timed("uncertainty.simulate")
+def simulate_uncertainty(practice, staff, billing, test_configs, logistics, simplified_mode, n_samples, seed, assumptions):
+    """Monte Carlo bands for the current inputs (the same seed always gives the same draws)."""
+    import eugene_roi_batch as batch
+    import eugene_roi_simulation as simulation
 
-                annual_volume = params["weekly_volume"] * weeks_year
+    return simulation.simulate(
+        practice, staff, billing, test_configs, logistics, simplified_mode,
+        n_samples=n_samples, seed=seed, tables=batch.tables_for(assumptions)
+    )
 
-                admin_hours = (params.get("admin_time", 0) / 60) * annual_volume
-                nurse_hours = (params.get("nurse_time", 0) / 60) * annual_volume
-                doctor_hours = ((params.get("doctor_time", 0) + params.get("research_time", 0)) / 60) * annual_volume
-                genetic_hours = (params.get("genetic_time", 0) / 60) * annual_volume
+@timing.timed("projection.calculate")
+def project_years(practice, staff, billing, test_configs, logistics, simplified_mode, projection_settings, assumptions):
+    """Multi-year projection of the current inputs (all years in one vectorized pass)."""
+    import eugene_roi_batch as batch
+    import eugene_roi_projection as projection
 
-                total_cost += (
-                    admin_hours * staff["admin_hourly"] +
-                    nurse_hours * staff["nurse_hourly"] +
-                    doctor_hours * staff["doctor_hourly"] +
-                    genetic_hours * staff["genetic_hourly"]
-                )
+    return projection.project(
+        practice, staff, billing, test_configs, logistics, simplified_mode,
+        projection_settings, batch.tables_for(assumptions)
+    )
 
-        return total_cost
+@timing.timed("uncertainty.bands")
+def show_uncertainty_bands(bands):
+    """Displays P5/P50/P95 bands for the headline metrics."""
+    labels = {
+        "staff_costs": "Staff Costs",
+        "total_revenue": "Total Revenue",
+        "total_annual_savings": "Annual Efficiency Savings",
+        "potential_patient_savings": "Potential Patient Savings",
+        "net_annual_benefit": "Net Annual Benefit"
+    }
+    df_bands = bands.loc[list(labels)].rename(index=labels)
+    st.dataframe(df_bands.style.format("${:,.0f}"))
 
-    except Exception as e:
-        st.error(f"Error in workload-based staff cost calculation: {str(e)}")
-        return 0
 
-def calculate_logistical_costs(logistics):
-    """Calculates annual logistical costs for clinic owners (if applicable)."""
-    try:
-        return sum(logistics.values()) * 12 if logistics else 0  # Monthly to yearly conversion
-    except Exception as e:
-        st.error(f"Error in logistics calculation: {str(e)}")
-        return 0
-
-def calculate_efficiency_savings(test_config, staff, weeks_year):
-    """Calculates efficiency savings and potential patient savings for complex cases."""
-    savings = {}
-    total_potential_patient_savings = 0.0
-
-    simplified_mode = st.session_state.get("input_mode_selection", "Simplified") == "Simplified"
-
-    for test_type, test_variants in test_config.items():
-        for variant, params in test_variants.items():
-            if "weekly_volume" not in params:
-                continue
-
-            annual_volume = params["weekly_volume"] * weeks_year
-
-            time_components = {
-                "admin": params.get("admin_time", 0) / 60,
-                "nurse": params.get("nurse_time", 0) / 60,
-                "doctor": (params.get("doctor_time", 0) + params.get("research_time", 0)) / 60,
-                "genetic": params.get("genetic_time", 0) / 60
-            }
+# -------------------- BREAKDOWN TABLES --------------------
 
-            role_savings = {
-                role: (time_components[role] * annual_volume * staff.get(f"{role}_hourly", 0))
-                for role in ["admin", "nurse", "doctor", "genetic"]
-            }
+REVENUE_BREAKDOWN_COLUMNS = {
+    "test_type": "Test Type",
+    "bulk_revenue": "Bulk-Billed Revenue",
+    "private_revenue": "Private Revenue",
+    "additional_revenue": "Additional Revenue",
+    "total_revenue": "Total Revenue"
+}
 
-            if "Complex Cases" in variant:
-                probability = COMPLEX_CASE_PROBABILITIES.get(variant, 0.05)
-                if simplified_mode:
-                    potential_patient_savings = (
-                        time_components["genetic"] * annual_volume *
-                        GENETIC_COUNSELING_PRIVATE_COST * probability
-                    )
-                else:
-                    # In advanced mode, annual_volume = complex cases, no probability multiplier
-                    potential_patient_savings = (
-                        time_components["genetic"] * annual_volume *
-                        GENETIC_COUNSELING_PRIVATE_COST
-                    )
-            else:
-                potential_patient_savings = 0.0
+def variant_frame(results, columns, keep=None):
+    """Slices `columns` ({variant table column: label}) out of the results' variant table as a DataFrame."""
+    import pandas as pd
+
+    table = results["variants"]
+    frame = pd.DataFrame({label: table[column] for column, label in columns.items()}, columns=list(columns.values()))
+    return frame if keep is None else frame[list(keep)].reset_index(drop=True)
+
+@timing.timed("tables.revenue")
+def revenue_breakdown(results):
+    """Builds the per-variant revenue table (bulk-billed, private and additional revenue under the billing model)."""
+    return variant_frame(results, REVENUE_BREAKDOWN_COLUMNS)
+
+@timing.timed("tables.patient_savings")
+def patient_savings_breakdown(results):
+    """Builds the complex-case patient savings table (empty when no counseling costs are avoided)."""
+    table = results["variants"]
+    frame = variant_frame(results, {
+        "test_type": "Test Type",
+        "annual_volume": "Annual Complex Volume",
+        "complex_probability": "Probability of Complex Finding",
+        "patient_savings": "Potential Savings ($)"
+    }, keep=[is_complex and savings > 0 for is_complex, savings in zip(table["is_complex"], table["patient_savings"])])
+    frame["Probability of Complex Finding"] = [
+        "Manual Entry" if probability is None else f"{probability * 100:.0f}%"
+        for probability in frame["Probability of Complex Finding"]
+    ]
+    return frame
+
+@timing.timed("tables.savings")
+def savings_breakdown(results):
+    """Builds the per-variant time and cost savings table."""
+    return variant_frame(results, {
+        "test_type": "Test Type",
+        "annual_volume": "Annual Volume",
+        "total_savings": "Total Savings ($)",
+        "admin_hours": "Admin Time Saved (hrs)",
+        "nurse_hours": "Nurse Time Saved (hrs)",
+        "doctor_hours": "Doctor Time Saved (hrs)",
+        "genetic_hours": "Genetic Counselor Time Saved (hrs)"
+    })
 
-            savings[f"{test_type} - {variant}"] = {
-                "annual_volume": annual_volume,
-                "total_savings": sum(role_savings.values()),
-                "genetic_counselor_cost_avoided": potential_patient_savings,
-                "time_breakdown": time_components
-            }
 
-            total_potential_patient_savings += potential_patient_savings
+# -------------------- EXPORT REPORT --------------------
 
-    return savings, total_potential_patient_savings
+@st.cache_resource
+def get_report_cache():
+    """Process-wide cache of generated Excel reports, keyed by result hash (backed by the disk cache when enabled)."""
+    import eugene_roi_export as export
 
+    return export.ReportCache(backend=get_disk_cache("reports"))
 
-def calculate_revenue(test_configs, specialty, billing_model, practice):
-    """Calculates total revenue based on billing model and MBS rates."""
-    try:
-        total_revenue = 0.0
-        additional_revenue = 0.0
-        total_doctor_hours_saved = 0.0
-
-        for test_type, test_variants in test_configs.items():
-            for variant, params in test_variants.items():
-                if "weekly_volume" not in params:
-                    continue
-
-                annual_volume = params["weekly_volume"] * practice["weeks_year"]
-                rate = SPECIALTY_MBS[specialty][variant]["rate"]
-                doctor_hours = (params.get("doctor_time", 0) / 60) * annual_volume
-
-                if billing_model["model"] == "Bulk Bill":
-                    total_revenue += annual_volume * rate
-
-                elif billing_model["model"] == "Private":
-                    total_revenue += doctor_hours * billing_model["private_hourly"]
-
-                else:  # Mixed model
-                    bulk_volume = annual_volume * (billing_model["bulk_rate"] / 100)
-                    private_volume = annual_volume - bulk_volume
-                    total_revenue += (
-                        bulk_volume * rate +
-                        private_volume * billing_model["private_hourly"] * (params.get("doctor_time", 0) / 60)
-                    )
-
-                total_doctor_hours_saved += doctor_hours
-
-        if billing_model["model"] != "Bulk Bill":
-            additional_patients = total_doctor_hours_saved * practice["consults_per_hour"]
-            additional_revenue = additional_patients * billing_model.get("private_hourly", 0)
-
-        return total_revenue + additional_revenue, additional_revenue, total_doctor_hours_saved
-
-    except Exception as e:
-        st.error(f"Error in revenue calculation: {str(e)}")
-        return 0, 0, 0
-
-def run_calculations(practice, staff, billing, test_configs, logistics):
-    """Runs all calculations and aggregates results."""
-    results = {
-        "total_annual_savings": 0.0,
-        "total_revenue": 0.0,
-        "additional_revenue": 0.0,
-        "total_doctor_hours_saved": 0.0,
-        "staff_costs": 0.0,
-        "logistical_costs": 0.0,
-        "net_annual_benefit": 0.0,
-        "breakdown": {},
-        "potential_patient_savings": 0.0,
-        "total_staff_hours_saved": 0.0
-    }
+def report_key(show_logistics):
+    """Identifies the report for the current results and export options."""
+    return result_cache.canonical_key(
+        st.session_state.get("results_key"), show_logistics, st.session_state.get("results_projection")
+    )
 
-    try:
-        results["staff_costs"] = calculate_annual_staff_costs(staff, test_configs, practice["weeks_year"])
-        results["logistical_costs"] = calculate_logistical_costs(logistics)
+@timing.timed("export.prefetch")
+def prefetch_report(results, show_logistics):
+    """Starts building the Excel report in the background so the download is instant."""
+    import eugene_roi_export as export
 
-        savings_data, total_patient_savings = calculate_efficiency_savings(
-            test_configs, staff, practice["weeks_year"]
-        )
+    snapshot = dict(results)
+    get_report_cache().prefetch(
+        report_key(show_logistics),
+        lambda: export.report_bytes(snapshot, show_logistics)
+    )
 
-        results["total_annual_savings"] = sum(v["total_savings"] for v in savings_data.values())
-        results["potential_patient_savings"] = total_patient_savings
-        results["breakdown"] = savings_data
+@timing.timed("export.excel")
+def export_to_excel():
+    import eugene_roi_export as export
 
-        revenue_data = calculate_revenue(
-            test_configs, practice["specialty"], billing, practice
-        )
+    if "results" not in st.session_state or not st.session_state["results"]:
+        st.warning("⚠️ No results to export. Please run the calculation first.")
+        return
 
-        results["total_revenue"] = revenue_data[0]
-        results["additional_revenue"] = revenue_data[1]
-        results["total_doctor_hours_saved"] = revenue_data[2]
+    results = st.session_state["results"]
+    show_logistics = (
+        st.session_state["user_type"] == "Owner/Manager" and
+        st.session_state.get("specialty") == "Fertility Specialist"
+    )
 
-        results["total_staff_hours_saved"] = sum(
-            (data["time_breakdown"]["admin"] +
-             data["time_breakdown"]["nurse"] +
-             data["time_breakdown"]["doctor"] +
-             data["time_breakdown"]["genetic"]) * data["annual_volume"]
-            for data in savings_data.values()
+    with st.spinner("Generating Excel report..."):
+        report_bytes = get_report_cache().get(
+            report_key(show_logistics),
+            lambda: export.report_bytes(results, show_logistics)
         )
 
-        results["net_annual_benefit"] = (
-            results["total_annual_savings"] +
-            results["total_revenue"] -
-            results["staff_costs"] -
-            results["logistical_costs"]
-        )
+    st.download_button(
+        label="📥 Export Report to Excel",
+        data=report_bytes,
+        file_name="Eugene_ROI_Workload_Report.xlsx",
+        mime=export.XLSX_MIME
+    )
 
-    except Exception as e:
-        st.error(f"Error in calculations: {str(e)}")
 
-    if "Revenue Breakdown" not in results:
-        results["Revenue Breakdown"] = pd.DataFrame()
 
-    return results
+# -------------------- CHARTS --------------------
 
+# ✅ Ship figures without Plotly's default template and per-bar hover descriptions (smaller payload per rerun)
+COMPACT_FIGURES = True
 
-# -------------------- EXPORT REPORT --------------------
-def export_to_excel():
-    if "results" not in st.session_state or not st.session_state["results"]:
-        st.warning("⚠️ No results to export. Please run the calculation first.")
-        return
+@st.cache_resource
+def get_figure_cache():
+    """Process-wide cache of built headline figures, keyed by the values they plot."""
+    import eugene_roi_figures as figures
 
-    results = st.session_state["results"]
+    return figures.FigureCache()
 
-    # Check if revenue breakdown is present and not empty
-    if "Revenue Breakdown" not in results or results["Revenue Breakdown"].empty:
-        st.warning("⚠️ Revenue Breakdown is empty — please run the calculation again before exporting.")
-        return
+@timing.timed("figure.impact")
+def show_impact_chart(results, show_logistics=False):
+    """Bar chart of annual savings and revenue (and logistics costs for fertility clinic owners)."""
+    import eugene_roi_figures as figures
 
-    show_logistics = (
-        st.session_state["user_type"] == "Owner/Manager" and
-        st.session_state.get("specialty") == "Fertility Specialist"
+    fig = get_figure_cache().get(
+        "impact",
+        lambda: figures.impact_figure(results, show_logistics, COMPACT_FIGURES),
+        results["total_annual_savings"], results["total_revenue"], results["logistical_costs"],
+        show_logistics, COMPACT_FIGURES
     )
+    st.plotly_chart(fig, use_container_width=True)
 
-    output = BytesIO()
-    with st.spinner("Generating Excel report..."):
-        with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
-            # Export revenue breakdown
-            results["Revenue Breakdown"].to_excel(writer, sheet_name="Revenue Breakdown", index=False)
-
-            # Export time and cost savings breakdown
-            if "breakdown" in results:
-                savings_data = []
-                for test_type, data in results["breakdown"].items():
-                    total_hours_saved = sum([
-                        data["time_breakdown"][role] * data["annual_volume"]
-                        for role in ["admin", "nurse", "doctor", "genetic"]
-                    ])
-                    savings_data.append({
-                        'Test Type': test_type,
-                        'Annual Volume': data["annual_volume"],
-                        'Total Savings ($)': data["total_savings"],
-                        'Admin Time Saved (hrs)': data["time_breakdown"]["admin"] * data["annual_volume"],
-                        'Nurse Time Saved (hrs)': data["time_breakdown"]["nurse"] * data["annual_volume"],
-                        'Doctor Time Saved (hrs)': data["time_breakdown"]["doctor"] * data["annual_volume"],
-                        'Genetic Counselor Time Saved (hrs)': data["time_breakdown"]["genetic"] * data["annual_volume"],
-                        'Total Staff Time Saved (hrs)': total_hours_saved
-                    })
-                df_savings = pd.DataFrame(savings_data)
-                df_savings.to_excel(writer, sheet_name="Time & Cost Savings", index=False)
-
-            # Export summary
-            total_time_saved = sum(
-                (data["time_breakdown"]["admin"] +
-                 data["time_breakdown"]["nurse"] +
-                 data["time_breakdown"]["doctor"] +
-                 data["time_breakdown"]["genetic"]) * data["annual_volume"]
-                for data in results["breakdown"].values()
-            )
+@timing.timed("figure.before_after")
+def show_before_after_animation(results):
+    import eugene_roi_figures as figures
+
+    fig = get_figure_cache().get(
+        "before_after",
+        lambda: figures.before_after_figure(results, COMPACT_FIGURES),
+        results.get("total_revenue", 0), COMPACT_FIGURES
+    )
+    st.plotly_chart(fig, use_container_width=True)
 
-            summary_data = {
-                "Total Revenue": [results["total_revenue"]],
-                "Annual Savings": [results["total_annual_savings"]],
-                "Potential Patient Savings": [results["potential_patient_savings"]],
-                "Annual Doctor Time Saved (hrs)": [results["total_doctor_hours_saved"]],
-                "Total Staff Time Saved (hrs)": [total_time_saved],
-                "Workload-Based Staff Costs": [results["staff_costs"]]
-            }
 
-            if show_logistics:
-                summary_data["Logistical Costs"] = [results["logistical_costs"]]
+# ✅ Inputs offered as heatmap axes in Sensitivity Analysis
+HEATMAP_PARAMETERS = [
+    "doctor_hourly", "private_hourly", "bulk_rate", "weeks_year", "consults_per_hour",
+    "core_weekly_volume", "couples_weekly_volume", "comprehensive_weekly_volume"
+]
+
+# ✅ Default heatmap axes (both move net annual benefit under every billing model)
+DEFAULT_HEATMAP_AXES = ("core_weekly_volume", "doctor_hourly")
+
+def heatmap_axis_problem(row, parameter):
+    """Why `parameter` would give a flat heatmap axis for this clinic, or None when it can be swept."""
+    import eugene_roi_sensitivity as sensitivity
+
+    label = sensitivity.PARAMETER_LABELS[parameter]
+    if parameter not in sensitivity.sweepable_parameters(row):
+        if parameter in ("private_hourly", "bulk_rate", "consults_per_hour"):
+            return f"{label} does not affect the results under the {row['billing_model']} billing model."
+        return f"{label} is 0 for this clinic, so it does not affect the results."
+    grid = sensitivity.default_grid(row, parameter)
+    if grid[0] == grid[-1]:
+        return f"{label} is 0 for this clinic, so its heatmap range has no width."
+    return None
+
+@timing.timed("sensitivity.calculate")
+def sensitivity_views(practice, staff, billing, test_configs, logistics, simplified_mode, heatmap_x, heatmap_y, assumptions):
+    """Tornado data and, for two different axes that both move the results, the heatmap grid of net annual benefit."""
+    import eugene_roi_batch as batch
+    import eugene_roi_sensitivity as sensitivity
+
+    row = batch.profile_to_row(practice, staff, billing, test_configs, logistics, simplified_mode)
+    tables = batch.tables_for(assumptions)
+    heatmap = None
+    if heatmap_x == heatmap_y:
+        message = "Choose two different inputs for the heatmap axes."
+    else:
+        message = heatmap_axis_problem(row, heatmap_x) or heatmap_axis_problem(row, heatmap_y)
+    if message is None:
+        heatmap = sensitivity.sweep_2d(
+            row,
+            heatmap_x, sensitivity.default_grid(row, heatmap_x),
+            heatmap_y, sensitivity.default_grid(row, heatmap_y),
+            tables=tables
+        )
+    return {"tornado": sensitivity.tornado(row, tables=tables), "heatmap": heatmap, "heatmap_message": message}
+
+@timing.timed("figure.tornado")
+def show_tornado_chart(tornado_data):
+    """Horizontal tornado chart of net annual benefit at the low/high end of each input."""
+    import plotly.graph_objects as go
+
+    top = tornado_data.head(10).iloc[::-1]
+    base_result = top["base_result"].iloc[0] if len(top) else 0
+
+    fig = go.Figure()
+    for end, color in [("low", "#FF8C00"), ("high", "#6E62C5")]:
+        fig.add_trace(go.Bar(
+            y=top["label"],
+            x=top[f"{end}_result"] - base_result,
+            base=base_result,
+            orientation="h",
+            name=f"{end.title()} input",
+            marker_color=color,
+            customdata=top[f"{end}_input"],
+            hovertemplate="%{y} = %{customdata:,.2f}<br>Net benefit: %{x:$,.0f}<extra></extra>"
+        ))
 
-            df_summary = pd.DataFrame(summary_data)
-            df_summary.to_excel(writer, sheet_name="Summary", index=False)
+    fig.update_layout(
+        title="Sensitivity of Net Annual Benefit (±20% per input)",
+        barmode="overlay",
+        xaxis=dict(title="Net Annual Benefit", tickformat="$,.0f"),
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)"
+    )
+    st.plotly_chart(fig, use_container_width=True)
 
-            # Export patient savings data
-            patient_savings_data = []
-            for test_type, data in results["breakdown"].items():
-                if "Complex Cases" in test_type and data["genetic_counselor_cost_avoided"] > 0:
-                    variant_name = test_type.split(' - ')[-1]
-                    probability = COMPLEX_CASE_PROBABILITIES.get(variant_name, 0.05)
-                    patient_savings_data.append({
-                        'Test Type': test_type,
-                        'Annual Complex Volume': data["annual_volume"],
-                        'Probability of Complex Finding': f"{probability * 100:.0f}%",
-                        'Potential Patient Savings ($)': data["genetic_counselor_cost_avoided"]
-                    })
+@timing.timed("figure.heatmap")
+def show_sensitivity_heatmap(grid):
+    """Heatmap of net annual benefit over a two-input grid."""
+    import plotly.graph_objects as go
+    import eugene_roi_sensitivity as sensitivity
+
+    x_label = sensitivity.PARAMETER_LABELS[grid.columns.name]
+    y_label = sensitivity.PARAMETER_LABELS[grid.index.name]
+
+    fig = go.Figure(go.Heatmap(
+        z=grid.to_numpy(),
+        x=grid.columns,
+        y=grid.index,
+        colorscale="Purples",
+        colorbar=dict(title="Net Benefit"),
+        hovertemplate=f"{x_label}: %{{x:,.1f}}<br>{y_label}: %{{y:,.1f}}<br>Net benefit: %{{z:$,.0f}}<extra></extra>"
+    ))
+    fig.update_layout(
+        title="Net Annual Benefit Heatmap",
+        xaxis_title=x_label,
+        yaxis_title=y_label,
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)"
+    )
+    st.plotly_chart(fig, use_container_width=True)
 
-            if patient_savings_data:
-                df_patient_savings = pd.DataFrame(patient_savings_data)
-                df_patient_savings.to_excel(writer, sheet_name="Patient Savings", index=False)
 
-        output.seek(0)
+# -------------------- MULTI-YEAR PROJECTION --------------------
+
+def get_projection_settings():
+    """Sidebar inputs for the multi-year projection."""
+    with st.sidebar.expander("📆 Projection Settings", expanded=True):
+        years = st.slider("Projection Years", 1, 10, 5)
+        ramp = [
+            st.slider("Year 1 Volume (% of steady state)", 0, 100, 50, help="Adoption ramp-up: share of the configured weekly volumes reached in year 1."),
+            st.slider("Year 2 Volume (% of steady state)", 0, 100, 80)
+        ]
+        volume_growth = st.number_input("Volume Growth After Ramp-Up (%/yr)", -20.0, 50.0, 0.0, 0.5)
+        mbs_indexation = st.number_input("MBS Indexation (%/yr)", 0.0, 10.0, 2.5, 0.1)
+        private_fee_growth = st.number_input("Private Fee Growth (%/yr)", 0.0, 10.0, 0.0, 0.1)
+        salary_inflation = st.number_input("Salary & Cost Inflation (%/yr)", 0.0, 10.0, 3.0, 0.1, help="Applied to staff hourly rates and logistics costs.")
+        discount_rate = st.number_input("Discount Rate (%/yr)", 0.0, 20.0, 7.0, 0.5)
+        upfront_cost = st.number_input("Upfront Cost ($)", 0, 5_000_000, 0, 1000, help="One-off cost in year 0, e.g. implementation and training.")
+
+    return {
+        "years": years,
+        "ramp": [share / 100 for share in ramp],
+        "volume_growth": volume_growth / 100,
+        "mbs_indexation": mbs_indexation / 100,
+        "private_fee_growth": private_fee_growth / 100,
+        "salary_inflation": salary_inflation / 100,
+        "cost_inflation": salary_inflation / 100,
+        "discount_rate": discount_rate / 100,
+        "upfront_cost": upfront_cost
+    }
 
-    st.download_button(
-        label="📥 Export Report to Excel",
-        data=output,
-        file_name="Eugene_ROI_Workload_Report.xlsx",
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+@timing.timed("figure.projection")
+def show_projection(yearly, projection_settings):
+    """NPV/IRR/payback metrics, yearly net benefit chart and the projection table."""
+    import plotly.graph_objects as go
+    import eugene_roi_projection as projection
+
+    summary = projection.summarize(yearly, projection_settings)
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Net Present Value", f"${summary['npv']:,.0f}", help=f"Discounted at {projection_settings['discount_rate'] * 100:.1f}% per year, less the upfront cost.")
+    col2.metric("Internal Rate of Return", "n/a" if summary["irr"] is None else f"{summary['irr'] * 100:,.1f}%", help="Needs an upfront cost to be defined.")
+    col3.metric("Payback Period", "Never" if summary["payback_years"] is None else f"{summary['payback_years']:.1f} yrs", help="Years until cumulative cash flow covers the upfront cost.")
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=yearly["year"], y=yearly["net_annual_benefit"], name="Net Annual Benefit", marker_color="#6E62C5",
+        hovertemplate="Year %{x}<br>Net benefit: %{y:$,.0f}<extra></extra>"
+    ))
+    fig.add_trace(go.Scatter(
+        x=yearly["year"], y=yearly["cumulative_discounted_cash_flow"], name="Cumulative Discounted Cash Flow",
+        mode="lines+markers", line=dict(color="#FF8C00", width=3),
+        hovertemplate="Year %{x}<br>Cumulative (discounted): %{y:$,.0f}<extra></extra>"
+    ))
+    fig.update_layout(
+        title=f"{summary['years']}-Year Projection",
+        xaxis=dict(title="Year", dtick=1),
+        yaxis=dict(title="Amount", tickformat="$,.0f"),
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)"
     )
+    st.plotly_chart(fig, use_container_width=True)
 
+    with st.expander("📆 Year-by-Year Projection"):
+        labels = projection.COLUMN_LABELS
+        table = projection.labelled(yearly).set_index("Year")
+        hours = [labels["total_doctor_hours_saved"], labels["total_staff_hours_saved"]]
+        st.dataframe(
+            table.style.format("${:,.0f}")
+            .format("{:,.0f}", subset=hours)
+            .format("{:.0f}%", subset=[labels["volume_factor"]])
+        )
 
 
-def show_before_after_animation(results):
-    before_revenue = results.get('total_revenue', 0) * 0.1  # Example assumption for baseline revenue
-    after_revenue = results.get('total_revenue', 0)
+# -------------------- TEST MIX OPTIMIZER --------------------
 
-    data = pd.DataFrame({
-        'Scenario': ['Before Eugene', 'After Eugene'],
-        'Revenue': [before_revenue, after_revenue],
-        'Description': ['Estimated revenue before using Eugene.', 'Revenue after using Eugene.']
-    })
+CAPACITY_LABELS = {
+    "admin": "Admin Hours/Week",
+    "nurse": "Nurse Hours/Week",
+    "doctor": "Doctor Hours/Week",
+    "patients": "Patients/Week"
+}
 
-    fig = px.bar(
-        data,
-        x='Scenario',
-        y='Revenue',
-        text='Revenue',
-        color='Scenario',
-        hover_data=['Description'],
-        color_discrete_map={
-            'Before Eugene': '#1C1363',
-            'After Eugene': '#6E62C5'
-        }
+@timing.timed("optimizer.search")
+def optimize_test_mix(practice, staff, billing, test_configs, logistics, simplified_mode, capacity_share, assumptions):
+    """Searches the capacity-feasible test mixes for the highest net annual benefit."""
+    import eugene_roi_batch as batch
+    import eugene_roi_optimizer as optimizer
+
+    return optimizer.optimize(
+        practice, staff, billing, test_configs, logistics, simplified_mode,
+        capacity_share=capacity_share, tables=batch.tables_for(assumptions)
     )
 
-    fig.update_traces(
-        texttemplate='%{text:$.0f}',
-        textposition='outside',
-        hovertemplate='%{customdata[0]}: %{y:$,.0f}'
+@timing.timed("optimizer.table")
+def show_optimal_mix(result):
+    """Current vs optimal weekly tests per category, net benefit and capacity use."""
+    import pandas as pd
+
+    rows = [
+        {"": f"{category} Tests/Week", "Current": result["current"][category], "Optimal": result["optimal"][category]}
+        for category in result["categories"]
+    ]
+    rows += [
+        {"": f"{label} (of {result['limits'][name]:,.0f})", "Current": result["current_usage"][name], "Optimal": result["optimal_usage"][name]}
+        for name, label in CAPACITY_LABELS.items()
+    ]
+
+    col_metric, col_table = st.columns([1, 2])
+    col_metric.metric(
+        "Optimal Net Annual Benefit", f"${result['optimal_value']:,.0f}",
+        delta=f"${result['optimal_value'] - result['current_value']:,.0f} vs current",
+        help="Best whole-number weekly volumes per test category within staff and patient capacity."
     )
+    col_metric.caption(f"{result['evaluated']:,} test mixes searched in {result['seconds'] * 1000:,.0f} ms.")
+    col_table.dataframe(pd.DataFrame(rows).set_index("").style.format("{:,.1f}"))
+    if any(result["current_usage"][name] > limit + 1e-9 for name, limit in result["limits"].items()):
+        st.warning("⚠️ The current test mix needs more staff or patient capacity than the clinic has.")
 
-    fig.update_layout(
-        title='Before vs. After Eugene: Revenue Impact',
-        plot_bgcolor='rgba(0,0,0,0)',   # Fully transparent background
-        paper_bgcolor='rgba(0,0,0,0)',  # Fully transparent paper
-        xaxis_showgrid=False,
-        yaxis_showgrid=False,
-        showlegend=False
+
+# -------------------- ASSUMPTION VERSIONS --------------------
+
+VERSION_METRICS = {
+    "total_revenue": "Total Revenue",
+    "total_annual_savings": "Annual Efficiency Savings",
+    "potential_patient_savings": "Potential Patient Savings",
+    "staff_costs": "Staff Costs",
+    "net_annual_benefit": "Net Annual Benefit"
+}
+
+@timing.timed("tables.versions")
+def show_version_comparison(practice, staff, billing, test_configs, logistics, simplified_mode):
+    """Headline metrics for the same inputs under every assumptions version (year-over-year view)."""
+    import pandas as pd
+
+    versions = get_assumption_store().versions()
+    if len(versions) < 2:
+        return
+
+    compared = engine.compare_versions(practice, staff, billing, test_configs, logistics, versions, simplified_mode)
+    df_versions = pd.DataFrame({
+        f"{version['version']} ({version['effective_date']})": [compared[version["version"]][metric] for metric in VERSION_METRICS]
+        for version in versions
+    }, index=list(VERSION_METRICS.values()))
+
+    with st.expander("📅 Assumptions Versions Comparison"):
+        st.caption("The same inputs evaluated with each version of the MBS rates, salaries, costs and probabilities.")
+        st.dataframe(df_versions.style.format("${:,.0f}"))
+
+
+# -------------------- SCENARIO COMPARISON --------------------
+
+def get_scenario_store():
+    """Per-session store of saved results for side-by-side comparison (oldest evicted beyond the cap)."""
+    import eugene_roi_scenarios as scenarios
+
+    if "scenarios" not in st.session_state:
+        st.session_state["scenarios"] = scenarios.ScenarioStore()
+    return st.session_state["scenarios"]
+
+def save_scenario(results):
+    """Name field and button that save the current results to the session's scenario store."""
+    store = get_scenario_store()
+    default_name = f"Scenario {len(store) + 1}"
+    name = st.text_input("Scenario Name", placeholder=default_name, key="scenario_name")
+    if st.button("💾 Save Scenario", help="Keep these results to compare them with other scenarios."):
+        evicted = store.save(name.strip() or default_name, results, st.session_state.get("results_details"))
+        st.success(f"✅ Saved '{name.strip() or default_name}'.")
+        if evicted:
+            st.info(f"Removed the oldest saved scenario ({', '.join(evicted)}) to keep at most {store.max_scenarios}.")
+
+@timing.timed("tables.scenarios")
+def show_scenario_comparison():
+    """Saved scenarios side by side, plus the change in one metric against a chosen baseline."""
+    import eugene_roi_figures as figures
+    import eugene_roi_scenarios as scenarios
+
+    store = get_scenario_store()
+    if not len(store):
+        return
+
+    with st.expander(f"🗂️ Scenario Comparison ({len(store)} saved)", expanded=True):
+        hours = {"total_doctor_hours_saved", "total_staff_hours_saved"}
+        formats = {
+            scenarios.COLUMN_LABELS[metric]: "{:,.1f}" if metric in hours else "${:,.0f}"
+            for metric in scenarios.METRIC_COLUMNS
+        }
+        st.dataframe(store.table().rename(columns=scenarios.COLUMN_LABELS).style.format(formats))
+
+        if len(store) > 1:
+            col_baseline, col_metric = st.columns(2)
+            baseline = col_baseline.selectbox("Baseline Scenario", store.names(), key="scenario_baseline")
+            metric = col_metric.selectbox(
+                "Compare", scenarios.METRIC_COLUMNS, format_func=scenarios.COLUMN_LABELS.get,
+                index=scenarios.METRIC_COLUMNS.index("net_annual_benefit"), key="scenario_metric"
+            )
+            names = store.names()
+            deltas = store.deltas(baseline, [metric])[metric].tolist()
+            label = scenarios.COLUMN_LABELS[metric]
+            fig = get_figure_cache().get(
+                "scenario_delta",
+                lambda: figures.scenario_delta_figure(names, deltas, label, baseline, COMPACT_FIGURES),
+                names, deltas, label, baseline, COMPACT_FIGURES
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+        removed = st.multiselect("Remove Scenarios", store.names(), key="scenarios_to_remove")
+        if removed and st.button("🗑️ Remove Selected"):
+            for name in removed:
+                store.remove(name)
+            st.rerun()
+
+
+# -------------------- CLINIC NETWORK --------------------
+
+# Headline metrics offered for the network rollup chart
+NETWORK_CHART_METRICS = ["net_annual_benefit", "total_revenue", "total_annual_savings", "staff_costs", "potential_patient_savings"]
+
+def get_network_sites():
+    """The session's site table: the last uploaded file, or a starter network to edit."""
+    import eugene_roi_network as network
+
+    upload = st.file_uploader(
+        "Upload Sites", type=[suffix.lstrip(".") for suffix in network.SITE_FORMATS], key="network_upload",
+        help="One row per site: site, region, specialty, billing_model and weekly base volumes "
+             "(core_weekly_volume, ...). Other columns of the batch layout override the defaults."
+    )
+    if upload is not None and st.session_state.get("network_upload_id") != upload.file_id:
+        try:
+            st.session_state["network_sites"] = network.read_sites(upload, upload.name)
+            st.session_state["network_upload_id"] = upload.file_id
+        except Exception as e:
+            st.error(f"Could not read '{upload.name}': {e}")
+
+    if "network_sites" not in st.session_state:
+        st.session_state["network_sites"] = network.example_sites()
+    return st.session_state["network_sites"]
+
+@timing.timed("network.evaluate")
+def evaluate_network(sites, assumptions):
+    import eugene_roi_network as network
+
+    return network.evaluate_sites(sites, assumptions)
+
+@timing.timed("network.rollup")
+def show_network(assumptions):
+    """Site editor, network totals, rollup by specialty / region / billing model and drill-down to one site."""
+    import eugene_roi_figures as figures
+    import eugene_roi_network as network
+    import eugene_roi_scenarios as scenarios
+
+    sites = get_network_sites()
+    edited = st.data_editor(
+        sites, num_rows="dynamic", hide_index=True,
+        key=f"network_editor_{st.session_state.get('network_upload_id', 'example')}",
+        column_config={
+            "specialty": st.column_config.SelectboxColumn("specialty", options=list(assumptions["specialty_mbs"])),
+            "billing_model": st.column_config.SelectboxColumn("billing_model", options=["Bulk Bill", "Mixed", "Private"])
+        }
     )
 
+    try:
+        site_results = evaluate_network(edited, assumptions)
+    except network.SITE_ERRORS as e:
+        st.error(f"Could not evaluate the network: {e}")
+        return
+    if site_results.empty:
+        st.info("Add at least one site with a specialty to see the network rollup.")
+        return
+
+    totals = network.network_totals(site_results)
+    cols = st.columns(3)
+    cols[0].metric("Sites", f"{totals['sites']:,.0f}")
+    cols[1].metric("Network Revenue", f"${totals['total_revenue']:,.0f}")
+    cols[2].metric("Network Net Annual Benefit", f"${totals['net_annual_benefit']:,.0f}")
+
+    col_group, col_metric = st.columns(2)
+    by = col_group.radio(
+        "Group Sites By", list(network.GROUP_COLUMNS), format_func=network.GROUP_COLUMNS.get,
+        horizontal=True, key="network_group_by"
+    )
+    metric = col_metric.selectbox(
+        "Chart Metric", NETWORK_CHART_METRICS, format_func=scenarios.COLUMN_LABELS.get, key="network_metric"
+    )
+
+    summary = network.rollup(site_results, by)
+    group_label = network.GROUP_COLUMNS[by]
+    groups, values = summary.index.tolist(), summary[metric].tolist()
+    metric_label = scenarios.COLUMN_LABELS[metric]
+    fig = get_figure_cache().get(
+        "network_rollup",
+        lambda: figures.rollup_figure(groups, values, metric_label, group_label, COMPACT_FIGURES),
+        groups, values, metric_label, group_label, COMPACT_FIGURES
+    )
     st.plotly_chart(fig, use_container_width=True)
 
+    hours = {"total_doctor_hours_saved", "total_staff_hours_saved"}
+    labels = {"sites": "Sites", **scenarios.COLUMN_LABELS}
+    formats = {labels[column]: "{:,.1f}" if column in hours else "${:,.0f}" for column in summary.columns[1:]}
+    st.dataframe(summary.rename(columns=labels).rename_axis(group_label).style.format(formats))
+
+    group = st.selectbox(f"Drill Down: {group_label}", groups, key="network_drill_group")
+    group_sites = network.drill_down(site_results, by, group)
+    st.dataframe(
+        group_sites[network.SITE_COLUMNS + list(summary.columns[1:])].rename(columns=labels).style.format(formats),
+        hide_index=True
+    )
+
+    index = st.selectbox(
+        "Site Detail", group_sites.index.tolist(), format_func=lambda i: site_results.at[i, "site"],
+        key="network_drill_site"
+    )
+    site = engine.run_calculations(*network.site_profile(site_results.loc[index]), assumptions=assumptions)
+    with st.expander(f"📊 {site_results.at[index, 'site']}: Revenue and Savings by Test", expanded=True):
+        st.dataframe(
+            revenue_breakdown(site).style.format({label: "${:,.0f}" for label in list(REVENUE_BREAKDOWN_COLUMNS.values())[1:]}),
+            hide_index=True
+        )
+        st.dataframe(savings_breakdown(site).style.format({"Total Savings ($)": "${:,.0f}"}), hide_index=True)
+
+
+# -------------------- BACKGROUND CALCULATION --------------------
+
+# ✅ Seconds between refreshes of the output column while a background calculation runs
+JOB_POLL_SECONDS = 0.5
+
+SECTION_LABELS = {
+    "results": "ROI results",
+    "uncertainty": "uncertainty bands",
+    "projection": "multi-year projection",
+    "optimizer": "optimal test mix",
+    "sensitivity": "sensitivity analysis"
+}
+
+@st.cache_resource
+def get_job_runner():
+    """Process-wide worker pool for background calculations, shared by every session."""
+    import eugene_roi_jobs as jobs
+
+    return jobs.JobRunner()
+
+def job_key(args, options, assumptions):
+    """Identifies a calculation: the engine inputs, the assumptions version and the enabled views' settings."""
+    return result_cache.canonical_key(result_cache.inputs_key(*args, assumptions["fingerprint"]), options)
+
+def calculation_job(args, options, view, assumptions, details):
+    """Job computing the ROI results, then each enabled heavy view, for one set of inputs.
+
+    Sections run off the script thread, so the caches and the session's calculator are captured here.
+    Heavy views go through the shared result cache, keyed by the results key and their settings.
+    """
+    import eugene_roi_jobs as jobs
+
+    cache = get_result_cache()
+    calculator = get_calculator()
+    results_key = result_cache.inputs_key(*args, assumptions["fingerprint"])
+
+    def cached(name, compute, *settings):
+        return lambda done: cache.get_or_compute(result_cache.canonical_key(name, results_key, *settings), compute)
+
+    sections = [("results", lambda done: calculate_results(*args, assumptions, cache, calculator))]
+    if options["uncertainty"]:
+        n_samples, seed = options["uncertainty"]
+        sections.append(("uncertainty", cached(
+            "uncertainty", lambda: simulate_uncertainty(*args, n_samples, seed, assumptions), n_samples, seed
+        )))
+    if options["projection"]:
+        sections.append(("projection", cached(
+            "projection", lambda: project_years(*args, options["projection"], assumptions), options["projection"]
+        )))
+    if options["capacity_share"] is not None:
+        sections.append(("optimizer", cached(
+            "optimizer", lambda: optimize_test_mix(*args, options["capacity_share"], assumptions), options["capacity_share"]
+        )))
+    if options["heatmap"]:
+        sections.append(("sensitivity", cached(
+            "sensitivity", lambda: sensitivity_views(*args, *options["heatmap"], assumptions), options["heatmap"]
+        )))
+
+    context = {
+        "args": args, "options": options, "view": view, "assumptions": assumptions,
+        "details": details, "results_key": results_key, "applied": set()
+    }
+    return jobs.Job(job_key(args, options, assumptions), sections, context)
+
+def current_job(calculate, background, args, options, view, assumptions, details):
+    """Starts a job on Calculate and drops the session's job once its inputs change (cancelling it if still running)."""
+    job = st.session_state.get("job")
+    if calculate:
+        if job is not None:
+            job.cancel()
+        job = calculation_job(args, options, view, assumptions, details)
+        st.session_state["job"] = job
+        if background:
+            get_job_runner().submit(job)
+        else:
+            with st.spinner("Calculating ROI..."):
+                job.run()
+        return job
+
+    if job is not None and job.key != job_key(args, options, assumptions):
+        if not job.done():
+            job.cancel()
+            st.info("Inputs changed, so the running calculation was cancelled. Click **Calculate ROI** to start again.")
+        st.session_state["job"] = None
+        return None
+    return job
+
+def apply_calculation(job):
+    """Publishes a job's finished sections to the session once: results (for scenarios and export), projection, report prefetch."""
+    import eugene_roi_projection as projection
+
+    context = job.context
+    applied = context["applied"]
+    if "results" not in applied:
+        if not job.ready("results"):
+            return
+        applied.add("results")
+        results = job.results.get("results") or engine.empty_results()
+        context["results"] = results
+        st.session_state["results"] = results
+        st.session_state["results_key"] = context["results_key"]
+        st.session_state["results_assumptions"] = context["assumptions"]
+        st.session_state["results_details"] = context["details"]
+        st.session_state["results_projection"] = None
+
+    results = context["results"]
+    if "projection" not in applied and "projection" in job.results:
+        applied.add("projection")
+        results["Projection"] = projection.labelled(job.results["projection"])
+        st.session_state["results_projection"] = context["options"]["projection"]
+
+    if "prefetch" not in applied and job.done():
+        applied.add("prefetch")
+        if context["view"]["prefetch"]:
+            prefetch_report(results, context["view"]["show_logistics"])
+
+def section_ready(job, name):
+    """True when section `name` can be shown; otherwise shows why not (running, failed or cancelled)."""
+    if name in job.results:
+        return True
+    if name in job.errors:
+        st.error(f"Error in {SECTION_LABELS[name]}: {job.errors[name]}")
+    elif job.done():
+        st.info(f"The {SECTION_LABELS[name]} was not calculated (calculation cancelled).")
+    else:
+        st.info(f"⏳ Calculating {SECTION_LABELS[name]}...")
+    return False
+
+def show_calculation(job):
+    """Renders a calculation job's sections in order as they finish."""
+    apply_calculation(job)
+    context = job.context
+    if "results" not in context:
+        return
+    results = context["results"]
+    args, options, view = context["args"], context["options"], context["view"]
+    practice, staff, billing, test_configs, logistics, simplified_mode = args
+
+    if "results" in job.errors:
+        st.error(f"Error in calculations: {job.errors['results']}")
+    elif job.cancelled:
+        st.warning("✋ Calculation cancelled. Sections that had not finished are not shown.")
+    elif job.done():
+        st.success("✅ ROI calculation completed successfully!")
+
+    st.header("📈 Financial Summary")
+    col1, col2, col3, col4 = st.columns(4)
+
+    col1.metric("Staff Costs", f"${results['staff_costs']:,.0f}", help="Total annual staff costs based on actual workload.")
+    col2.metric("Total Revenue", f"${results['total_revenue']:,.0f}", help="Total revenue from tests, based on billing model and doctor time.")
+    col3.metric("Annual Efficiency Savings", f"${results['total_annual_savings']:,.0f}", help="Annual time and efficiency savings from using Eugene.")
+    col4.metric("Net Annual Benefit", f"${results['net_annual_benefit']:,.0f}", help="Revenue plus savings minus staff and logistics costs.")
+
+    if options["uncertainty"]:
+        st.subheader("🎲 Uncertainty Bands")
+        st.caption("Ranges from simulating complex-case probabilities and per-test time assumptions.")
+        if section_ready(job, "uncertainty"):
+            show_uncertainty_bands(job.results["uncertainty"])
+
+    st.subheader("💡 Patient Benefits")
+    col_patient1, col_patient2 = st.columns([1, 3])
+    col_patient1.metric("Potential Patient Savings", f"${results['potential_patient_savings']:,.0f}", help="Money patients save by using Eugene, which includes genetic counseling for complex cases (valued at $500/hour).")
+    col_patient2.write("**Using Eugene avoids an estimated 6-month public health wait time and includes genetic counseling at no extra cost.**")
+
+    with st.expander("🔎 Patient Savings Breakdown (Complex Cases)"):
+        st.caption("Estimated complex case volumes and the value of included counseling savings.")
+        df_patient_savings = patient_savings_breakdown(results)
+        if not df_patient_savings.empty:
+            st.dataframe(df_patient_savings.style.format({'Potential Savings ($)': '${:,.0f}'}))
+
+    st.subheader("Eugene’s Impact: Savings and Revenue Opportunities")
+
+    show_impact_chart(results, view["show_logistics"])
+
+    show_before_after_animation(results)
+
+    if options["projection"]:
+        st.subheader("📆 Multi-Year Projection")
+        if section_ready(job, "projection"):
+            show_projection(job.results["projection"], options["projection"])
+
+    if options["capacity_share"] is not None:
+        st.subheader("🎯 Optimal Test Mix")
+        if section_ready(job, "optimizer"):
+            show_optimal_mix(job.results["optimizer"])
+
+    if options["heatmap"]:
+        st.subheader("📉 Sensitivity Analysis")
+        if section_ready(job, "sensitivity"):
+            views = job.results["sensitivity"]
+            show_tornado_chart(views["tornado"])
+            if views["heatmap"] is None:
+                st.info(views["heatmap_message"])
+            else:
+                show_sensitivity_heatmap(views["heatmap"])
+
+    show_version_comparison(*args)
+
+    with st.expander("📊 Revenue Breakdown"):
+        st.caption("Revenue by test type based on Medicare and private billing.")
+        df_revenue = revenue_breakdown(results)
+        st.dataframe(df_revenue.style.format({label: '${:,.0f}' for label in list(REVENUE_BREAKDOWN_COLUMNS.values())[1:]}))
+
+    with st.expander("⏳ Time & Cost Savings Breakdown"):
+        df_savings = savings_breakdown(results)
+        st.dataframe(df_savings.style.format({'Total Savings ($)': '${:,.0f}'}))
+
+def show_calculation_progress(job):
+    """Polled while a background job runs: progress, a cancel button and the sections finished so far."""
+    if job.done():
+        # Full rerun: stops polling and publishes the finished job (report prefetch, export)
+        st.rerun()
+
+    finished = len(job.results) + len(job.errors)
+    running = SECTION_LABELS.get(job.current, "queued calculation")
+    st.progress(job.progress(), text=f"Calculating {running}... ({finished} of {len(job.sections)} sections done)")
+    if st.button("✋ Cancel Calculation"):
+        job.cancel()
+        st.rerun()
+    show_calculation(job)
+
 
 # -------------------- MAIN APP LAYOUT --------------------
 
-def main():
+def render_app():
+    setup_page()
     st.title("Eugene ROI Calculator")
 
-    debug_mode = st.sidebar.checkbox("🔎 Enable Debug Mode")
+    debug_mode = st.sidebar.checkbox("🔎 Enable Debug Mode", key="debug_mode")
+    assumptions = select_assumptions()
+    uncertainty_mode = st.sidebar.checkbox(
+        "🎲 Uncertainty Mode",
+        help="Simulate the complex-case probabilities and time assumptions and show P5/P50/P95 ranges."
+    )
+    if uncertainty_mode:
+        n_samples = st.sidebar.select_slider("Simulation Samples", [10_000, 50_000, 100_000], value=100_000)
+        seed = st.sidebar.number_input("Random Seed", 0, 1_000_000, 0, help="Same seed and inputs always give the same bands.")
+
+    prefetch_reports = st.sidebar.checkbox(
+        "⚡ Pre-generate Excel Report", value=True,
+        help="Build the Excel report in the background right after calculating so the export is instant."
+    )
+
+    sensitivity_mode = st.sidebar.checkbox(
+        "📉 Sensitivity Analysis",
+        help="Show how net annual benefit responds to each input (tornado chart) and to two inputs at once (heatmap)."
+    )
+    if sensitivity_mode:
+        import eugene_roi_sensitivity as sensitivity
+
+        heatmap_x = st.sidebar.selectbox(
+            "Heatmap X Axis", HEATMAP_PARAMETERS, index=HEATMAP_PARAMETERS.index(DEFAULT_HEATMAP_AXES[0]),
+            format_func=sensitivity.PARAMETER_LABELS.get
+        )
+        heatmap_y = st.sidebar.selectbox(
+            "Heatmap Y Axis", HEATMAP_PARAMETERS, index=HEATMAP_PARAMETERS.index(DEFAULT_HEATMAP_AXES[1]),
+            format_func=sensitivity.PARAMETER_LABELS.get
+        )
+
+    projection_mode = st.sidebar.checkbox(
+        "📆 Multi-Year Projection",
+        help="Project the ROI over several years with volume ramp-up, MBS indexation and salary inflation, with NPV, IRR and payback."
+    )
+    projection_settings = get_projection_settings() if projection_mode else None
+
+    optimize_mode = st.sidebar.checkbox(
+        "🎯 Optimize Test Mix",
+        help="Find the weekly Core/Couples/Comprehensive volumes that maximize net annual benefit within staff and patient capacity."
+    )
+    if optimize_mode:
+        capacity_share = st.sidebar.slider(
+            "Staff Time Available for Testing (%)", 5, 100, 50,
+            help="Share of admin, nurse and doctor hours (from clinical days and headcount) that testing may use."
+        ) / 100
+
+    background_mode = st.sidebar.checkbox(
+        "⏳ Background Calculation", value=True, key="background_mode",
+        help="Calculate on a worker thread and show each section as it finishes; changing inputs cancels a running calculation."
+    )
 
     if "results" not in st.session_state:
         st.session_state["results"] = {}
 
     col_input, col_output = st.columns([2, 3])
 
-    with col_input:
+    with col_input, timing.stage("widgets"):
         st.header("⚙️ Configure Inputs")
 
         user_type = st.radio("Select your role:", ["Doctor/Clinician", "Owner/Manager"], horizontal=True, key="user_type")
@@ -689,15 +1212,7 @@ def main():
             staff = get_staff_costs()
         else:
             specialty = st.session_state.get("specialty", "GP")
-            staff = {
-                "num_admin": 1,
-                "num_nurse": 1,
-                "num_doctor": 1,
-                "admin_hourly": DEFAULT_STAFF_COSTS["admin_hourly"],
-                "nurse_hourly": DEFAULT_STAFF_COSTS["nurse_hourly"],
-                "genetic_hourly": DEFAULT_STAFF_COSTS["genetic_hourly"],
-                "doctor_hourly": SIMPLIFIED_SALARY.get(specialty, 180)
-            }
+            staff = engine.default_staff(specialty, assumptions=assumptions)
 
         logistics = get_logistical_costs() if user_type == "Owner/Manager" and st.session_state.get("specialty") == "Fertility Specialist" else {}
 
@@ -721,138 +1236,56 @@ def main():
             st.write(f"Checking MBS keys for specialty: {specialty}")
             for test_type, test_variants in test_configs.items():
                 for variant in test_variants.keys():
-                    if variant not in SPECIALTY_MBS[specialty]:
+                    if variant not in assumptions["specialty_mbs"][specialty]:
                         st.warning(f"⚠️ Variant '{variant}' is missing in MBS rates for {specialty}.")
 
+            st.write("Result Cache:", get_result_cache().stats())
+            st.write("Incremental Calculator:", get_calculator().stats())
+            st.write("Assumptions:", get_assumption_store().stats())
+            st.write("Report Cache:", get_report_cache().stats())
+            st.write("Figure Cache:", get_figure_cache().stats())
+            st.write("Scenario Store:", get_scenario_store().stats())
+            st.write("Job Runner:", get_job_runner().stats())
+
         calculate = st.button("📊 Calculate ROI")
 
     with col_output:
-        if calculate:
-            with st.spinner("Calculating ROI..."):
-                results = run_calculations(practice, staff, billing, test_configs, logistics)
-                st.session_state["results"] = results
-            st.success("✅ ROI calculation completed successfully!")
-
-            revenue_data = []
-            for test_type, test_variants in test_configs.items():
-                for variant, params in test_variants.items():
-                    try:
-                        if variant not in SPECIALTY_MBS[practice["specialty"]]:
-                            st.warning(f"⚠️ Skipping '{variant}' as it’s not defined in MBS rates for {practice['specialty']}")
-                            continue
-
-                        rate = SPECIALTY_MBS[practice["specialty"]][variant]["rate"]
-                        revenue = params["weekly_volume"] * practice["weeks_year"] * rate
-                        revenue_data.append({"Test Type": f"{test_type} - {variant}", "Revenue": revenue})
-                    except Exception as e:
-                        st.error(f"Error calculating revenue for '{variant}': {e}")
-
-            df_revenue = pd.DataFrame(revenue_data)
-            st.session_state["results"]["Revenue Breakdown"] = df_revenue
-
-            st.header("📈 Financial Summary")
-            col1, col2, col3, col4 = st.columns(4)
-
-            col1.metric("Staff Costs", f"${results['staff_costs']:,.0f}", help="Total annual staff costs based on actual workload.")
-            col2.metric("Total Revenue", f"${results['total_revenue']:,.0f}", help="Total revenue from tests, based on billing model and doctor time.")
-            col3.metric("Annual Efficiency Savings", f"${results['total_annual_savings']:,.0f}", help="Annual time and efficiency savings from using Eugene.")
-            col4.metric("Net Annual Benefit", f"${results['net_annual_benefit']:,.0f}", help="Revenue plus savings minus staff and logistics costs.")
-
-            st.subheader("💡 Patient Benefits")
-            col_patient1, col_patient2 = st.columns([1, 3])
-            col_patient1.metric("Potential Patient Savings", f"${results['potential_patient_savings']:,.0f}", help="Money patients save by using Eugene, which includes genetic counseling for complex cases (valued at $500/hour).")
-            col_patient2.write("**Using Eugene avoids an estimated 6-month public health wait time and includes genetic counseling at no extra cost.**")
-
-            with st.expander("🔎 Patient Savings Breakdown (Complex Cases)"):
-                st.caption("Estimated complex case volumes and the value of included counseling savings.")
-                patient_savings_data = []
-                for test_type, data in results["breakdown"].items():
-                    if "Complex Cases" in test_type and data["genetic_counselor_cost_avoided"] > 0:
-                        variant_name = test_type.split(' - ')[-1]
-                        probability = COMPLEX_CASE_PROBABILITIES.get(variant_name, 0.05)
-                        patient_savings_data.append({
-                            'Test Type': test_type,
-                            'Annual Complex Volume': data["annual_volume"],
-                            'Probability of Complex Finding': f"{probability * 100:.0f}%" if input_mode == "Simplified" else "Manual Entry",
-                            'Potential Savings ($)': data["genetic_counselor_cost_avoided"]
-                        })
-                if patient_savings_data:
-                    df_patient_savings = pd.DataFrame(patient_savings_data)
-                    st.dataframe(df_patient_savings.style.format({'Potential Savings ($)': '${:,.0f}'}))
-
-            st.subheader("Eugene’s Impact: Savings and Revenue Opportunities")
-
-            categories = ["Annual Efficiency Savings", "Potential Additional Revenue"]
-            amounts = [
-                results["total_annual_savings"],
-                results["total_revenue"]
-            ]
-
-            explanations = [
-                "Time and efficiency savings generated by using Eugene.",
-                "Additional revenue opportunities unlocked for your clinic."
-            ]
-
-            if user_type == "Owner/Manager" and st.session_state.get("specialty") == "Fertility Specialist":
-                categories.append("Logistics Costs")
-                amounts.append(results["logistical_costs"])
-                explanations.append("Annual clinic logistics expenses.")
-
-            overview_data = {"Category": categories, "Amount": amounts, "Explanation": explanations}
-
-            fig = px.bar(
-                overview_data,
-                x='Category',
-                y='Amount',
-                color='Category',
-                text='Amount',
-                hover_data={'Explanation': True, 'Amount': False, 'Category': False},
-                color_discrete_map={
-                    'Annual Efficiency Savings': '#00C853',
-                    'Potential Additional Revenue': '#1C1363',
-                    'Logistics Costs': '#FF8C00'
-                }
-            )
-
-            fig.update_traces(
-                texttemplate='%{text:$.0f}',
-                textposition='outside',
-                hovertemplate='%{customdata[0]}'
-            )
-
-            fig.update_layout(
-                title='Eugene’s Impact: Savings and Revenue Opportunities',
-                xaxis=dict(title='Category'),
-                yaxis=dict(title='Amount', tickformat=',.0f'),
-                showlegend=False,
-                xaxis_showgrid=False,
-                yaxis_showgrid=False,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)'
-            )
+        args = (practice, staff, billing, test_configs, logistics, input_mode == "Simplified")
+        options = {
+            "uncertainty": [n_samples, seed] if uncertainty_mode else None,
+            "projection": projection_settings,
+            "capacity_share": capacity_share if optimize_mode else None,
+            "heatmap": [heatmap_x, heatmap_y] if sensitivity_mode else None
+        }
+        view = {
+            "show_logistics": user_type == "Owner/Manager" and practice["specialty"] == "Fertility Specialist",
+            "prefetch": prefetch_reports
+        }
+        details = {
+            "specialty": practice["specialty"],
+            "billing_model": billing["model"],
+            "input_mode": input_mode,
+            "assumptions_version": assumptions["version"]
+        }
+        job = current_job(calculate, background_mode, args, options, view, assumptions, details)
+        if job is not None:
+            if job.done():
+                show_calculation(job)
+            else:
+                st.fragment(show_calculation_progress, run_every=JOB_POLL_SECONDS)(job)
 
-            st.plotly_chart(fig, use_container_width=True)
+        if st.session_state["results"]:
+            st.subheader("🗂️ Scenarios")
+            save_scenario(st.session_state["results"])
+        show_scenario_comparison()
 
-            show_before_after_animation(results)
-
-            with st.expander("📊 Revenue Breakdown"):
-                st.caption("Revenue by test type based on Medicare and private billing.")
-                st.dataframe(df_revenue.style.format({'Revenue': '${:,.0f}'}))
-
-            with st.expander("⏳ Time & Cost Savings Breakdown"):
-                savings_data = []
-                for test_type, data in results["breakdown"].items():
-                    savings_data.append({
-                        'Test Type': test_type,
-                        'Annual Volume': data["annual_volume"],
-                        'Total Savings ($)': data["total_savings"],
-                        'Admin Time Saved (hrs)': data["time_breakdown"]["admin"] * data["annual_volume"],
-                        'Nurse Time Saved (hrs)': data["time_breakdown"]["nurse"] * data["annual_volume"],
-                        'Doctor Time Saved (hrs)': data["time_breakdown"]["doctor"] * data["annual_volume"],
-                        'Genetic Counselor Time Saved (hrs)': data["time_breakdown"]["genetic"] * data["annual_volume"]
-                    })
-                df_savings = pd.DataFrame(savings_data)
-                st.dataframe(df_savings.style.format({'Total Savings ($)': '${:,.0f}'}))
+    if user_type == "Owner/Manager":
+        st.subheader("🏢 Clinic Network")
+        if st.toggle(
+            "Network Rollup", key="network_mode",
+            help="Evaluate many sites at once and compare them by specialty, region or billing model."
+        ):
+            show_network(assumptions)
 
     st.subheader("⬇️ Download Report")
     if st.button("📥 Export Full Financial Report"):
@@ -860,5 +1293,97 @@ def main():
         st.success("✅ Excel report generated and ready for download!")
 
 
+# -------------------- RERUN TIMINGS --------------------
+
+def show_rerun_timings(timer, profiler=None):
+    """Debug panel: stage timings for this rerun, server-wide rerun latency and the cProfile capture."""
+    import pandas as pd
+
+    with st.sidebar.expander("⏱️ Rerun Timings", expanded=True):
+        st.caption(f"This rerun took {timer.total() * 1000:,.1f} ms.")
+        st.dataframe(
+            pd.DataFrame(timer.rows()).style.format({"Time (ms)": "{:,.1f}", "Share (%)": "{:.0f}%"}),
+            hide_index=True
+        )
+
+        latency = timing.RERUN_LATENCY.summary()
+        st.caption(
+            f"Last {latency['reruns']} reruns on this server: p50 {latency['p50_ms']:,.0f} ms, "
+            f"p95 {latency['p95_ms']:,.0f} ms, max {latency['max_ms']:,.0f} ms."
+        )
+
+        job = st.session_state.get("job")
+        if job is not None and job.timer is not None:
+            st.caption(f"Last background calculation took {job.timer.total() * 1000:,.1f} ms.")
+            st.dataframe(
+                pd.DataFrame(job.timer.rows()).style.format({"Time (ms)": "{:,.1f}", "Share (%)": "{:.0f}%"}),
+                hide_index=True
+            )
+
+        st.checkbox(
+            "🧪 Profile Reruns (cProfile)", key="profile_reruns",
+            help="Capture each rerun with cProfile and offer the .prof file (open with snakeviz or pstats)."
+        )
+        if profiler is not None:
+            st.download_button(
+                "📥 Download Profile (.prof)", timing.profile_bytes(profiler),
+                file_name="eugene_roi_rerun.prof", mime="application/octet-stream", on_click="ignore"
+            )
+            st.code(timing.profile_summary(profiler, limit=15), language=None)
+
+def show_cache_stats():
+    """Debug panel: memory and disk cache hit rates and occupancy for results and Excel reports."""
+    import pandas as pd
+
+    caches = {"Results": get_result_cache().stats(), "Excel Reports": get_report_cache().stats()}
+    rows = []
+    for name, stats in caches.items():
+        rows.append({
+            "Cache": f"{name} (memory)", "Hits": stats["hits"], "Misses": stats["misses"],
+            "Hit Rate (%)": stats["hit_rate"] * 100, "Entries": stats["size"], "Size (kB)": None
+        })
+        disk = stats.get("disk")
+        if disk:
+            rows.append({
+                "Cache": f"{name} (disk)", "Hits": disk["hits"], "Misses": disk["misses"],
+                "Hit Rate (%)": disk["hit_rate"] * 100, "Entries": disk["entries"],
+                "Size (kB)": (disk["bytes"] or 0) / 1024
+            })
+
+    with st.sidebar.expander("💽 Result Caches"):
+        st.dataframe(
+            pd.DataFrame(rows).style.format({"Hit Rate (%)": "{:.0f}%", "Size (kB)": "{:,.1f}"}, na_rep="–"),
+            hide_index=True
+        )
+        disk = caches["Results"].get("disk")
+        if not disk:
+            st.caption("Disk cache off (set EUGENE_ROI_DISK_CACHE to a file path to share results across sessions).")
+            return
+        st.caption(
+            f"Disk cache {disk['path']}: {(disk['file_bytes'] or 0) / 1024 ** 2:,.1f} of "
+            f"{disk['max_bytes'] / 1024 ** 2:,.0f} MB, entries kept {disk['ttl'] / 3600:,.0f} h, "
+            f"{disk['evictions']} evicted, {disk['expired']} expired, {disk['errors']} errors."
+        )
+        if st.button("🗑️ Clear Disk Cache"):
+            for namespace in ("results", "reports"):
+                get_disk_cache(namespace).clear()
+            st.rerun()
+
+def main():
+    """Renders the app once, timing each stage (and profiling it when enabled in debug mode)."""
+    timer = timing.start_run()
+    profiler = timing.start_profile() if st.session_state.get("profile_reruns") else None
+    try:
+        render_app()
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        timing.finish_run(user_type=st.session_state.get("user_type"), profiled=profiler is not None)
+
+    if st.session_state.get("debug_mode"):
+        show_rerun_timings(timer, profiler)
+        show_cache_stats()
+
+
 if __name__ == "__main__":
     main()
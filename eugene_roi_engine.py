@@ -0,0 +1,435 @@
+"""
+Headless ROI engine for the Eugene ROI Calculator.
+
+Everything in here is plain Python over plain dicts so it can be imported by
+batch jobs without Streamlit, Plotly or Matplotlib. The dashboard collects
+inputs from widgets and calls into this module; errors are raised rather than
+reported, so callers decide how to surface them.
+
+Input shapes (the same dicts the dashboard builds):
+
+- practice:     {"specialty", "operation_days", "weeks_year", "consults_per_hour"}
+- staff:        {"num_admin", "num_nurse", "num_doctor", "num_genetic_counselor",
+                 "admin_hourly", "nurse_hourly", "doctor_hourly", "genetic_hourly"}
+- billing:      {"model": "Bulk Bill" | "Mixed" | "Private",
+                 "private_hourly" (Mixed/Private), "bulk_rate" (Mixed, percent)}
+- test_configs: {category: {variant: {"weekly_volume", "admin_time", "nurse_time",
+                 "doctor_time", "research_time", "genetic_time"}}} with times in minutes
+- logistics:    {"shipping", "storage", "admin_logistics", "misc_logistics"} monthly, or {}
+
+Reference assumptions come from the versioned `data/assumptions.json` (see
+`eugene_roi_assumptions`). The module constants hold the version in effect at
+import; the calculation functions also take an `assumptions` version, and
+`compare_versions` evaluates one clinic against several versions at once.
+
+`run_calculations` walks the test variants once, building one row per variant
+(savings, staff cost and revenue together), and aggregates the rows. Besides
+the headline metrics, its results carry that per-variant table as
+`results["variants"]`: a dict of equal-length lists keyed by VARIANT_COLUMNS,
+which the dashboard tables and the Excel sheets slice instead of re-walking
+the inputs. Its revenue columns follow the billing model (bulk-billed,
+privately billed and additional revenue per variant), so the Revenue
+Breakdown matches the headline revenue.
+
+`run_calculations` records its sub-steps as timing stages; they cost nothing
+unless a dashboard rerun is being timed (see `eugene_roi_timing`).
+"""
+
+import eugene_roi_assumptions
+from eugene_roi_timing import stage
+
+# -------------------- CONSTANTS --------------------
+
+# ✅ Test Categories & Variants
+TEST_TYPES = {
+    "Core": {"base": "Core", "curly": "Core Complex Cases"},
+    "Couples": {"base": "Couples", "curly": "Couples Complex Cases"},
+    "Comprehensive": {"base": "Comprehensive", "curly": "Comprehensive Complex Cases"}
+}
+
+# ✅ Reference assumptions (MBS rates, salaries, times, staff and logistics costs, complex-case
+#    probabilities) live in data/assumptions.json; these are the version in effect at import
+ASSUMPTIONS = eugene_roi_assumptions.effective_version(eugene_roi_assumptions.load_versions())
+
+SIMPLIFIED_SALARY = ASSUMPTIONS["simplified_salary"]
+SPECIALTY_MBS = ASSUMPTIONS["specialty_mbs"]
+SIMPLIFIED_TIME = ASSUMPTIONS["simplified_time"]
+SIMPLIFIED_GENETIC_TIME = ASSUMPTIONS["simplified_genetic_time"]
+DEFAULT_STAFF_COSTS = ASSUMPTIONS["default_staff_costs"]
+LOGISTICS_COSTS = ASSUMPTIONS["logistics_costs"]
+GENETIC_COUNSELING_PRIVATE_COST = ASSUMPTIONS["genetic_counseling_private_cost"]
+COMPLEX_CASE_PROBABILITIES = ASSUMPTIONS["complex_case_probabilities"]
+DEFAULT_COMPLEX_CASE_PROBABILITY = ASSUMPTIONS["default_complex_case_probability"]
+
+# ✅ Weekly Work Schedule (Used in Simplified Mode)
+DEFAULT_WORK_SCHEDULE = {
+    "doctors_per_clinic": 1,        # Start with at least 1 doctor
+    "patients_per_hour": 4,         # Each doctor sees 4 patients per hour
+    "working_hours_per_day": 8,     # 8-hour workday
+    "days_per_week": 5              # 5 working days per week
+}
+
+ROLES = ["admin", "nurse", "doctor", "genetic"]
+
+# Columns of the per-variant results table (results["variants"]), one entry per configured test variant
+VARIANT_COLUMNS = [
+    "test_type",            # "Core - Core Complex Cases"
+    "category",
+    "variant",
+    "is_complex",
+    "weekly_volume",
+    "annual_volume",
+    "admin_hours",          # annual hours saved per role (doctor includes research time)
+    "nurse_hours",
+    "doctor_hours",
+    "genetic_hours",
+    "staff_hours",
+    "staff_cost",           # annual staff cost of the workload
+    "total_savings",
+    "complex_probability",  # probability behind the patient savings (None unless a Simplified complex variant)
+    "patient_savings",
+    "mbs_rate",
+    "bulk_revenue",         # bulk-billed share (annual volume x MBS rate)
+    "private_revenue",      # privately billed share (doctor consult hours x private hourly rate)
+    "revenue",              # billed revenue under the billing model (bulk + private)
+    "consult_hours",        # doctor consult hours, which drive additional revenue
+    "additional_revenue",   # revenue from the extra consults those saved hours allow (Mixed/Private only)
+    "total_revenue"         # billed + additional
+]
+
+# Columns of the per-variant revenue table returned by calculate_revenue
+REVENUE_COLUMNS = [
+    "test_type", "mbs_rate", "bulk_revenue", "private_revenue", "revenue",
+    "consult_hours", "additional_revenue", "total_revenue"
+]
+
+
+# -------------------- INPUT HELPERS --------------------
+
+def simplified_test_config(test_category, base_weekly_volume, assumptions=None):
+    """Builds the Simplified-mode config for one test category from its weekly volume."""
+    assumptions = assumptions or ASSUMPTIONS
+    base = TEST_TYPES[test_category]["base"]
+    curly = TEST_TYPES[test_category]["curly"]
+    probability = assumptions["complex_case_probabilities"].get(curly, assumptions["default_complex_case_probability"])
+    simplified_time = assumptions["simplified_time"][test_category]
+
+    return {
+        base: {
+            "weekly_volume": base_weekly_volume,
+            "admin_time": simplified_time["admin"],
+            "nurse_time": simplified_time["nurse"],
+            "doctor_time": simplified_time["doctor"]
+        },
+        curly: {
+            "weekly_volume": base_weekly_volume * probability,
+            "research_time": simplified_time["research"],
+            "genetic_time": assumptions["simplified_genetic_time"]
+        }
+    }
+
+def default_staff(specialty, num_doctors=1, assumptions=None):
+    """Returns the Simplified-mode staff config for a specialty."""
+    assumptions = assumptions or ASSUMPTIONS
+    staff_costs = assumptions["default_staff_costs"]
+    return {
+        "num_admin": 1,
+        "num_nurse": 1,
+        "num_doctor": num_doctors,
+        "num_genetic_counselor": 0,
+        "admin_hourly": staff_costs["admin_hourly"],
+        "nurse_hourly": staff_costs["nurse_hourly"],
+        "genetic_hourly": staff_costs["genetic_hourly"],
+        "doctor_hourly": assumptions["simplified_salary"].get(specialty, 180)
+    }
+
+
+# -------------------- PER-VARIANT CALCULATIONS --------------------
+
+def variant_staff_cost(params, staff, weeks_year):
+    """Annual staff cost of one test variant's workload."""
+    annual_volume = params["weekly_volume"] * weeks_year
+
+    admin_hours = (params.get("admin_time", 0) / 60) * annual_volume
+    nurse_hours = (params.get("nurse_time", 0) / 60) * annual_volume
+    doctor_hours = ((params.get("doctor_time", 0) + params.get("research_time", 0)) / 60) * annual_volume
+    genetic_hours = (params.get("genetic_time", 0) / 60) * annual_volume
+
+    return (
+        admin_hours * staff["admin_hourly"] +
+        nurse_hours * staff["nurse_hourly"] +
+        doctor_hours * staff["doctor_hourly"] +
+        genetic_hours * staff["genetic_hourly"]
+    )
+
+def variant_efficiency_savings(variant, params, staff, weeks_year, simplified_mode=True, assumptions=None):
+    """Savings breakdown entry (volume, role hours per test, savings, patient savings) for one test variant."""
+    assumptions = assumptions or ASSUMPTIONS
+    annual_volume = params["weekly_volume"] * weeks_year
+
+    time_components = {
+        "admin": params.get("admin_time", 0) / 60,
+        "nurse": params.get("nurse_time", 0) / 60,
+        "doctor": (params.get("doctor_time", 0) + params.get("research_time", 0)) / 60,
+        "genetic": params.get("genetic_time", 0) / 60
+    }
+
+    role_savings = {
+        role: (time_components[role] * annual_volume * staff.get(f"{role}_hourly", 0))
+        for role in ROLES
+    }
+
+    if "Complex Cases" in variant:
+        probability = assumptions["complex_case_probabilities"].get(
+            variant, assumptions["default_complex_case_probability"]
+        )
+        counseling_cost = assumptions["genetic_counseling_private_cost"]
+        if simplified_mode:
+            potential_patient_savings = (
+                time_components["genetic"] * annual_volume *
+                counseling_cost * probability
+            )
+        else:
+            # In advanced mode, annual_volume = complex cases, no probability multiplier
+            potential_patient_savings = (
+                time_components["genetic"] * annual_volume *
+                counseling_cost
+            )
+    else:
+        potential_patient_savings = 0.0
+
+    return {
+        "annual_volume": annual_volume,
+        "total_savings": sum(role_savings.values()),
+        "genetic_counselor_cost_avoided": potential_patient_savings,
+        "time_breakdown": time_components
+    }
+
+def variant_revenue_split(variant, params, specialty, billing_model, weeks_year, assumptions=None):
+    """Returns (bulk-billed revenue, privately billed revenue, doctor hours saved) for one test variant."""
+    annual_volume = params["weekly_volume"] * weeks_year
+    rate = (assumptions or ASSUMPTIONS)["specialty_mbs"][specialty][variant]["rate"]
+    doctor_hours = (params.get("doctor_time", 0) / 60) * annual_volume
+
+    if billing_model["model"] == "Bulk Bill":
+        bulk_revenue, private_revenue = annual_volume * rate, 0.0
+
+    elif billing_model["model"] == "Private":
+        bulk_revenue, private_revenue = 0.0, doctor_hours * billing_model["private_hourly"]
+
+    else:  # Mixed model
+        bulk_volume = annual_volume * (billing_model["bulk_rate"] / 100)
+        private_volume = annual_volume - bulk_volume
+        bulk_revenue = bulk_volume * rate
+        private_revenue = private_volume * billing_model["private_hourly"] * (params.get("doctor_time", 0) / 60)
+
+    return bulk_revenue, private_revenue, doctor_hours
+
+def variant_revenue(variant, params, specialty, billing_model, weeks_year, assumptions=None):
+    """Returns (billed revenue, doctor hours saved) for one test variant."""
+    bulk_revenue, private_revenue, doctor_hours = variant_revenue_split(
+        variant, params, specialty, billing_model, weeks_year, assumptions
+    )
+    return bulk_revenue + private_revenue, doctor_hours
+
+def additional_revenue_rate(billing_model, practice):
+    """Additional revenue per doctor hour saved: the extra private consults that hour allows (0 when bulk billing)."""
+    if billing_model["model"] == "Bulk Bill":
+        return 0.0
+    return practice["consults_per_hour"] * billing_model.get("private_hourly", 0)
+
+def savings_columns(category, variant, params, staff, weeks_year, simplified_mode=True, assumptions=None):
+    """Variant table columns that depend on the workload, staff rates and input mode."""
+    assumptions = assumptions or ASSUMPTIONS
+    entry = variant_efficiency_savings(variant, params, staff, weeks_year, simplified_mode, assumptions)
+    annual_volume = entry["annual_volume"]
+    per_test = entry["time_breakdown"]
+
+    is_complex = "Complex Cases" in variant
+    probability = None
+    if is_complex and simplified_mode:
+        probability = assumptions["complex_case_probabilities"].get(
+            variant, assumptions["default_complex_case_probability"]
+        )
+
+    columns = {
+        "test_type": f"{category} - {variant}",
+        "category": category,
+        "variant": variant,
+        "is_complex": is_complex,
+        "weekly_volume": params["weekly_volume"],
+        "annual_volume": annual_volume
+    }
+    for role in ROLES:
+        columns[f"{role}_hours"] = per_test[role] * annual_volume
+    columns["staff_hours"] = (per_test["admin"] + per_test["nurse"] + per_test["doctor"] + per_test["genetic"]) * annual_volume
+    columns["staff_cost"] = variant_staff_cost(params, staff, weeks_year)
+    columns["total_savings"] = entry["total_savings"]
+    columns["complex_probability"] = probability
+    columns["patient_savings"] = entry["genetic_counselor_cost_avoided"]
+    return columns
+
+def revenue_columns(variant, params, specialty, billing_model, weeks_year, assumptions=None):
+    """Variant table columns that depend on the MBS rate and billing model (additional revenue is added per practice)."""
+    bulk_revenue, private_revenue, consult_hours = variant_revenue_split(
+        variant, params, specialty, billing_model, weeks_year, assumptions
+    )
+    return {
+        "mbs_rate": (assumptions or ASSUMPTIONS)["specialty_mbs"][specialty][variant]["rate"],
+        "bulk_revenue": bulk_revenue,
+        "private_revenue": private_revenue,
+        "revenue": bulk_revenue + private_revenue,
+        "consult_hours": consult_hours
+    }
+
+def with_additional_revenue(rows, billing_model, practice):
+    """Copies of per-variant revenue rows with their additional and total revenue filled in."""
+    rate = additional_revenue_rate(billing_model, practice)
+    filled = []
+    for row in rows:
+        additional_revenue = row["consult_hours"] * rate
+        filled.append({**row, "additional_revenue": additional_revenue, "total_revenue": row["revenue"] + additional_revenue})
+    return filled
+
+def variant_table(rows, columns=VARIANT_COLUMNS):
+    """Turns per-variant rows (dicts with every column key) into a columnar table."""
+    return {column: [row[column] for row in rows] for column in columns}
+
+
+# -------------------- CALCULATION FUNCTIONS --------------------
+
+def calculate_annual_staff_costs(staff, test_config, weeks_year):
+    """Calculates annual staff costs based on actual test workload rather than full-time hours."""
+    total_cost = 0.0
+
+    for test_type, test_variants in test_config.items():
+        for variant, params in test_variants.items():
+            if "weekly_volume" not in params:
+                continue
+            total_cost += variant_staff_cost(params, staff, weeks_year)
+
+    return total_cost
+
+def calculate_logistical_costs(logistics):
+    """Calculates annual logistical costs for clinic owners (if applicable)."""
+    return sum(logistics.values()) * 12 if logistics else 0  # Monthly to yearly conversion
+
+def calculate_efficiency_savings(test_config, staff, weeks_year, simplified_mode=True, assumptions=None):
+    """Calculates efficiency savings and potential patient savings for complex cases."""
+    savings = {}
+    total_potential_patient_savings = 0.0
+
+    for test_type, test_variants in test_config.items():
+        for variant, params in test_variants.items():
+            if "weekly_volume" not in params:
+                continue
+
+            entry = variant_efficiency_savings(variant, params, staff, weeks_year, simplified_mode, assumptions)
+            savings[f"{test_type} - {variant}"] = entry
+            total_potential_patient_savings += entry["genetic_counselor_cost_avoided"]
+
+    return savings, total_potential_patient_savings
+
+
+def calculate_revenue(test_configs, specialty, billing_model, practice, assumptions=None):
+    """Calculates total revenue based on billing model and MBS rates.
+
+    Returns (total revenue, additional revenue, doctor hours saved, revenue table), where the table
+    holds the bulk / private / additional revenue of each test variant (columns: REVENUE_COLUMNS).
+    """
+    rows = with_additional_revenue([
+        {
+            "test_type": f"{test_type} - {variant}",
+            **revenue_columns(variant, params, specialty, billing_model, practice["weeks_year"], assumptions)
+        }
+        for test_type, test_variants in test_configs.items()
+        for variant, params in test_variants.items()
+        if "weekly_volume" in params
+    ], billing_model, practice)
+    table = variant_table(rows, REVENUE_COLUMNS)
+    return (*revenue_totals(zip(table["revenue"], table["consult_hours"]), billing_model, practice), table)
+
+def revenue_totals(parts, billing_model, practice):
+    """Combines per-variant (revenue, doctor hours) parts into (total revenue, additional revenue, doctor hours)."""
+    total_revenue = 0.0
+    additional_revenue = 0.0
+    total_doctor_hours_saved = 0.0
+
+    for revenue, doctor_hours in parts:
+        total_revenue += revenue
+        total_doctor_hours_saved += doctor_hours
+
+    if billing_model["model"] != "Bulk Bill":
+        additional_patients = total_doctor_hours_saved * practice["consults_per_hour"]
+        additional_revenue = additional_patients * billing_model.get("private_hourly", 0)
+
+    return total_revenue + additional_revenue, additional_revenue, total_doctor_hours_saved
+
+def empty_results():
+    """Returns a results dict with every headline metric zeroed."""
+    return {
+        "total_annual_savings": 0.0,
+        "total_revenue": 0.0,
+        "additional_revenue": 0.0,
+        "total_doctor_hours_saved": 0.0,
+        "staff_costs": 0.0,
+        "logistical_costs": 0.0,
+        "net_annual_benefit": 0.0,
+        "variants": variant_table([]),
+        "potential_patient_savings": 0.0,
+        "total_staff_hours_saved": 0.0
+    }
+
+def combine_results(rows, logistical_costs, billing_model, practice):
+    """Aggregates per-variant rows into the results dict (headline metrics plus the `variants` table)."""
+    table = variant_table(with_additional_revenue(rows, billing_model, practice))
+    results = empty_results()
+    results["variants"] = table
+    results["staff_costs"] = sum(table["staff_cost"], 0.0)
+    results["logistical_costs"] = logistical_costs
+
+    results["total_annual_savings"] = sum(table["total_savings"])
+    results["potential_patient_savings"] = sum(table["patient_savings"], 0.0)
+
+    (
+        results["total_revenue"],
+        results["additional_revenue"],
+        results["total_doctor_hours_saved"]
+    ) = revenue_totals(zip(table["revenue"], table["consult_hours"]), billing_model, practice)
+
+    results["total_staff_hours_saved"] = sum(table["staff_hours"])
+
+    results["net_annual_benefit"] = (
+        results["total_annual_savings"] +
+        results["total_revenue"] -
+        results["staff_costs"] -
+        results["logistical_costs"]
+    )
+
+    return results
+
+def run_calculations(practice, staff, billing, test_configs, logistics, simplified_mode=True, assumptions=None):
+    """Runs all calculations in one pass over the test variants and aggregates results."""
+    weeks_year = practice["weeks_year"]
+    rows = []
+    with stage("variants"):
+        for test_type, test_variants in test_configs.items():
+            for variant, params in test_variants.items():
+                if "weekly_volume" not in params:
+                    continue
+                row = savings_columns(test_type, variant, params, staff, weeks_year, simplified_mode, assumptions)
+                row.update(revenue_columns(variant, params, practice["specialty"], billing, weeks_year, assumptions))
+                rows.append(row)
+
+    with stage("aggregate"):
+        return combine_results(rows, calculate_logistical_costs(logistics), billing, practice)
+
+def compare_versions(practice, staff, billing, test_configs, logistics, versions, simplified_mode=True):
+    """Evaluates one clinic against several assumption versions; returns {version label: results}."""
+    # Inputs are held fixed, so differences come only from each version's rates, costs and probabilities
+    return {
+        version["version"]: run_calculations(
+            practice, staff, billing, test_configs, logistics, simplified_mode, assumptions=version
+        )
+        for version in versions
+    }
@@ -0,0 +1,279 @@
+"""
+Streaming Excel export for ROI results.
+
+Workbooks are written with xlsxwriter's constant-memory mode: each sheet is
+fed from a row generator and flushed to disk row by row, so no sheet is ever
+built as an in-memory DataFrame. `build_report` writes into a spooled temp
+file that stays in RAM for small reports and spills to disk past
+`SPILL_THRESHOLD` bytes.
+
+Sheets match the dashboard export: "Revenue Breakdown", "Time & Cost Savings",
+"Summary", "Patient Savings" (when any complex case has savings) and
+"Projection" (when the results carry a multi-year projection). The per-variant
+sheets are column slices of the results' variant table
+(`results["variants"]`).
+
+`ReportCache` keeps finished report bytes against a result hash and can build
+them ahead of time on a background thread.
+"""
+
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import xlsxwriter
+
+from eugene_roi_cache import ResultCache
+
+# -------------------- CONSTANTS --------------------
+
+# ✅ Reports larger than this are spilled from memory to a temp file (bytes)
+SPILL_THRESHOLD = 8 * 1024 * 1024
+
+# ✅ Excel's hard row limit, minus the header row
+EXCEL_MAX_ROWS = 1_048_575
+
+# ✅ Finished reports kept per process, and background build threads
+DEFAULT_REPORT_CACHE_SIZE = 32
+DEFAULT_REPORT_WORKERS = 2
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Per-variant sheets: {variant table column: sheet header}
+REVENUE_SHEET_COLUMNS = {
+    "test_type": "Test Type",
+    "bulk_revenue": "Bulk-Billed Revenue",
+    "private_revenue": "Private Revenue",
+    "additional_revenue": "Additional Revenue",
+    "total_revenue": "Total Revenue"
+}
+
+SAVINGS_SHEET_COLUMNS = {
+    "test_type": "Test Type",
+    "annual_volume": "Annual Volume",
+    "total_savings": "Total Savings ($)",
+    "admin_hours": "Admin Time Saved (hrs)",
+    "nurse_hours": "Nurse Time Saved (hrs)",
+    "doctor_hours": "Doctor Time Saved (hrs)",
+    "genetic_hours": "Genetic Counselor Time Saved (hrs)",
+    "staff_hours": "Total Staff Time Saved (hrs)"
+}
+
+PATIENT_SHEET_COLUMNS = {
+    "test_type": "Test Type",
+    "annual_volume": "Annual Complex Volume",
+    "complex_probability": "Probability of Complex Finding",
+    "patient_savings": "Potential Patient Savings ($)"
+}
+
+
+# -------------------- ROW GENERATORS --------------------
+
+def table_rows(table, columns, keep=None):
+    """Yields {header: value} rows from a columnar table for `columns` ({column: header}), where `keep` is true."""
+    values = zip(*(table[column] for column in columns))
+    headers = list(columns.values())
+    if keep is None:
+        for row in values:
+            yield dict(zip(headers, row))
+    else:
+        for row, kept in zip(values, keep):
+            if kept:
+                yield dict(zip(headers, row))
+
+def revenue_rows(results):
+    """Yields the Revenue Breakdown rows (billing-model revenue per test variant)."""
+    yield from table_rows(results["variants"], REVENUE_SHEET_COLUMNS)
+
+def savings_rows(results):
+    """Yields one Time & Cost Savings row per test variant."""
+    yield from table_rows(results["variants"], SAVINGS_SHEET_COLUMNS)
+
+def summary_rows(results, show_logistics=False):
+    """Yields the single Summary row."""
+    summary = {
+        "Total Revenue": results["total_revenue"],
+        "Annual Savings": results["total_annual_savings"],
+        "Potential Patient Savings": results["potential_patient_savings"],
+        "Annual Doctor Time Saved (hrs)": results["total_doctor_hours_saved"],
+        "Total Staff Time Saved (hrs)": results["total_staff_hours_saved"],
+        "Workload-Based Staff Costs": results["staff_costs"]
+    }
+    if show_logistics:
+        summary["Logistical Costs"] = results["logistical_costs"]
+    yield summary
+
+def patient_savings_rows(results):
+    """Yields one Patient Savings row per complex variant with avoided counseling costs."""
+    table = results["variants"]
+    keep = [is_complex and savings > 0 for is_complex, savings in zip(table["is_complex"], table["patient_savings"])]
+    header = PATIENT_SHEET_COLUMNS["complex_probability"]
+    for row in table_rows(table, PATIENT_SHEET_COLUMNS, keep):
+        probability = row[header]
+        row[header] = "Manual Entry" if probability is None else f"{probability * 100:.0f}%"
+        yield row
+
+def projection_rows(results):
+    """Yields the multi-year Projection rows, if a projection was run."""
+    projection = results.get("Projection")
+    if projection is None:
+        return
+    yield from projection.to_dict("records")
+
+
+# -------------------- WRITERS --------------------
+
+def open_workbook(target, tmpdir=None):
+    """Opens a constant-memory workbook on a path or binary file object."""
+    options = {"constant_memory": True, "nan_inf_to_errors": True}
+    if tmpdir:
+        options["tmpdir"] = tmpdir
+    return xlsxwriter.Workbook(target, options)
+
+def write_sheet(workbook, name, rows, skip_empty=False, max_rows=EXCEL_MAX_ROWS):
+    """Streams dict rows into a new sheet (header from the first row); returns rows written."""
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        if not skip_empty:
+            workbook.add_worksheet(name)
+        return 0
+
+    worksheet = workbook.add_worksheet(name)
+    columns = list(first)
+    worksheet.write_row(0, 0, columns)
+    worksheet.write_row(1, 0, [first.get(column) for column in columns])
+
+    written = 1
+    for row in rows:
+        if written >= max_rows:
+            break
+        written += 1
+        worksheet.write_row(written, 0, [row.get(column) for column in columns])
+    return written
+
+def write_report(results, target, show_logistics=False, tmpdir=None):
+    """Writes the full ROI report to a path or binary file object."""
+    workbook = open_workbook(target, tmpdir)
+    write_sheet(workbook, "Revenue Breakdown", revenue_rows(results))
+    write_sheet(workbook, "Time & Cost Savings", savings_rows(results))
+    write_sheet(workbook, "Summary", summary_rows(results, show_logistics))
+    write_sheet(workbook, "Patient Savings", patient_savings_rows(results), skip_empty=True)
+    write_sheet(workbook, "Projection", projection_rows(results), skip_empty=True)
+    workbook.close()
+
+def build_report(results, show_logistics=False, spill_threshold=SPILL_THRESHOLD):
+    """Builds the report into a spooled temp file (rewound, ready to read or hand to a download)."""
+    output = tempfile.SpooledTemporaryFile(max_size=spill_threshold)
+    write_report(results, output, show_logistics)
+    output.seek(0)
+    return output
+
+def report_bytes(results, show_logistics=False):
+    """Builds the report and returns it as bytes (for downloads and caching)."""
+    with build_report(results, show_logistics) as output:
+        return output.read()
+
+
+# -------------------- REPORT CACHE --------------------
+
+class ReportCache:
+    """Bounded cache of finished report bytes with optional background pre-generation."""
+
+    def __init__(self, maxsize=DEFAULT_REPORT_CACHE_SIZE, workers=DEFAULT_REPORT_WORKERS, backend=None):
+        # Report bytes are immutable, so no defensive copies are needed
+        self._reports = ResultCache(maxsize=maxsize, copy_values=False, backend=backend)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="eugene-report")
+        self.prefetched = 0
+
+    def _build(self, key, build):
+        try:
+            data = build()
+            self._reports.put(key, data)
+            return data
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def prefetch(self, key, build):
+        """Starts building the report for `key` in the background unless it is cached or already running."""
+        with self._lock:
+            if key in self._reports or key in self._pending:
+                return
+            self._pending[key] = self._executor.submit(self._build, key, build)
+            self.prefetched += 1
+
+    def get(self, key, build):
+        """Returns report bytes for `key`: cached, awaited from a running prefetch, or built now."""
+        with self._lock:
+            pending = self._pending.get(key)
+        if pending is not None:
+            return pending.result()
+
+        data = self._reports.get(key)
+        if data is None:
+            data = self._build(key, build)
+        return data
+
+    def stats(self):
+        stats = self._reports.stats()
+        stats["prefetched"] = self.prefetched
+        stats["pending"] = len(self._pending)
+        return stats
+
+
+# -------------------- PORTFOLIO REPORTS --------------------
+
+class PortfolioReportWriter:
+    """Streams per-clinic result chunks into a "Clinic Results" sheet and adds a portfolio "Summary" on close."""
+
+    def __init__(self, target, metric_columns, hours_columns=(), tmpdir=None):
+        self.workbook = open_workbook(target, tmpdir)
+        self.money = self.workbook.add_format({"num_format": "$#,##0"})
+        self.hours = self.workbook.add_format({"num_format": "#,##0"})
+        self.results_sheet = self.workbook.add_worksheet("Clinic Results")
+        self.summary_sheet = self.workbook.add_worksheet("Summary")
+        self.metric_columns = list(metric_columns)
+        self.hours_columns = set(hours_columns)
+        self.columns = None
+        self.rows = 0
+        self.clinics = 0
+        self.truncated = False
+        self.totals = {column: 0.0 for column in self.metric_columns}
+
+    def write(self, chunk):
+        """Appends one DataFrame chunk of clinic results."""
+        if self.columns is None:
+            self.columns = list(chunk.columns)
+            self.results_sheet.write_row(0, 0, self.columns)
+
+        self.clinics += len(chunk)
+        for column in self.metric_columns:
+            self.totals[column] += float(chunk[column].sum())
+
+        room = EXCEL_MAX_ROWS - self.rows
+        if len(chunk) > room:
+            self.truncated = True
+            chunk = chunk.iloc[:room]
+
+        for values in chunk[self.columns].itertuples(index=False, name=None):
+            self.rows += 1
+            self.results_sheet.write_row(self.rows, 0, [None if value != value else value for value in values])
+
+    def close(self):
+        self.summary_sheet.write_row(0, 0, ["Metric", "Portfolio Total", "Average per Clinic"])
+        self.summary_sheet.write_row(1, 0, ["Clinics Evaluated", self.clinics])
+        for i, column in enumerate(self.metric_columns, start=2):
+            total = self.totals[column]
+            number_format = self.hours if column in self.hours_columns else self.money
+            self.summary_sheet.write(i, 0, column)
+            self.summary_sheet.write_number(i, 1, total, number_format)
+            self.summary_sheet.write_number(i, 2, total / self.clinics if self.clinics else 0.0, number_format)
+        if self.truncated:
+            self.summary_sheet.write(
+                len(self.metric_columns) + 3, 0,
+                "Clinic Results truncated at Excel's row limit; see the Parquet/CSV output for every row."
+            )
+        self.workbook.close()
@@ -0,0 +1,176 @@
+"""
+Plotly figures for the dashboard's headline charts.
+
+Figures are built directly with `plotly.graph_objects`: one bar trace per
+chart with per-bar colours, instead of Plotly Express's DataFrame round trip,
+one trace per colour and customdata columns for hover fields.
+
+With `compact=True` (the dashboard default) a figure also swaps Plotly's
+default template (several kB of styling that Streamlit's chart theme
+restyles in the browser anyway) for a stub, and drops the per-bar hover
+descriptions, so each rerun ships a few hundred bytes of figure JSON instead
+of ~10 kB. `payload_bytes` measures what Streamlit sends.
+
+`FigureCache` keeps built figures against a hash of the values they plot, so
+a rerun with unchanged results reuses the same figure object.
+"""
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from eugene_roi_cache import ResultCache, canonical_key
+
+# -------------------- CONSTANTS --------------------
+
+# ✅ Figures kept per process (a figure is a few kB)
+DEFAULT_FIGURE_CACHE_SIZE = 128
+
+IMPACT_COLORS = {
+    "Annual Efficiency Savings": "#00C853",
+    "Potential Additional Revenue": "#1C1363",
+    "Logistics Costs": "#FF8C00"
+}
+
+IMPACT_EXPLANATIONS = {
+    "Annual Efficiency Savings": "Time and efficiency savings generated by using Eugene.",
+    "Potential Additional Revenue": "Additional revenue opportunities unlocked for your clinic.",
+    "Logistics Costs": "Annual clinic logistics expenses."
+}
+
+BEFORE_AFTER_COLORS = {"Before Eugene": "#1C1363", "After Eugene": "#6E62C5"}
+
+BEFORE_AFTER_DESCRIPTIONS = {
+    "Before Eugene": "Estimated revenue before using Eugene.",
+    "After Eugene": "Revenue after using Eugene."
+}
+
+DELTA_COLORS = {"gain": "#00C853", "loss": "#D50000"}
+
+# ✅ Baseline revenue shown as "Before Eugene" (share of the calculated revenue; example assumption)
+BEFORE_REVENUE_SHARE = 0.1
+
+# Stub template for compact figures: keeps the template's data/layout slots that Streamlit's theme fills in
+COMPACT_TEMPLATE = go.layout.Template(layout={"hovermode": "closest"}, data={"bar": [go.Bar()]})
+
+TRANSPARENT_LAYOUT = {
+    "plot_bgcolor": "rgba(0,0,0,0)",
+    "paper_bgcolor": "rgba(0,0,0,0)",
+    "xaxis_showgrid": False,
+    "yaxis_showgrid": False,
+    "showlegend": False
+}
+
+
+# -------------------- FIGURES --------------------
+
+def _bar_figure(labels, values, colors, descriptions, title, compact, **layout):
+    """Single-trace bar chart with outside $ labels; hover shows the description unless compact."""
+    bar = go.Bar(
+        x=labels,
+        y=values,
+        marker_color=colors,
+        text=values,
+        texttemplate="%{text:$.0f}",
+        textposition="outside",
+        hovertemplate="%{x}: %{y:$,.0f}<extra></extra>"
+    )
+    if not compact:
+        bar.hovertext = descriptions
+        bar.hovertemplate = "%{hovertext}: %{y:$,.0f}<extra></extra>"
+
+    fig = go.Figure(bar)
+    fig.update_layout(title=title, **TRANSPARENT_LAYOUT, **layout)
+    if compact:
+        fig.layout.template = COMPACT_TEMPLATE
+    return fig
+
+def impact_figure(results, show_logistics=False, compact=True):
+    """Bar chart of annual savings and revenue (and logistics costs for fertility clinic owners)."""
+    values = {
+        "Annual Efficiency Savings": results["total_annual_savings"],
+        "Potential Additional Revenue": results["total_revenue"]
+    }
+    if show_logistics:
+        values["Logistics Costs"] = results["logistical_costs"]
+
+    labels = list(values)
+    return _bar_figure(
+        labels, list(values.values()),
+        [IMPACT_COLORS[label] for label in labels],
+        [IMPACT_EXPLANATIONS[label] for label in labels],
+        "Eugene’s Impact: Savings and Revenue Opportunities", compact,
+        xaxis_title="Category", yaxis=dict(title="Amount", tickformat=",.0f")
+    )
+
+def before_after_figure(results, compact=True):
+    """Before vs. after revenue comparison."""
+    after_revenue = results.get("total_revenue", 0)
+    labels = list(BEFORE_AFTER_COLORS)
+    return _bar_figure(
+        labels, [after_revenue * BEFORE_REVENUE_SHARE, after_revenue],
+        list(BEFORE_AFTER_COLORS.values()),
+        [BEFORE_AFTER_DESCRIPTIONS[label] for label in labels],
+        "Before vs. After Eugene: Revenue Impact", compact,
+        xaxis_title="Scenario", yaxis_title="Revenue"
+    )
+
+def scenario_delta_figure(names, deltas, metric_label, baseline, compact=True):
+    """Change in one metric for each saved scenario relative to the baseline scenario."""
+    fig = go.Figure(go.Bar(
+        x=list(names),
+        y=list(deltas),
+        marker_color=[DELTA_COLORS["gain" if delta >= 0 else "loss"] for delta in deltas],
+        text=list(deltas),
+        texttemplate="%{text:+$,.0f}",
+        textposition="outside",
+        hovertemplate="%{x}: %{y:+$,.0f}<extra></extra>"
+    ))
+    fig.update_layout(
+        title=f"{metric_label}: Change vs. {baseline}",
+        xaxis_title="Scenario", yaxis=dict(title="Change", tickformat=",.0f", zeroline=True),
+        **TRANSPARENT_LAYOUT
+    )
+    if compact:
+        fig.layout.template = COMPACT_TEMPLATE
+    return fig
+
+def rollup_figure(groups, values, metric_label, group_label, compact=True):
+    """One metric summed per network group (specialty, region or billing model)."""
+    fig = go.Figure(go.Bar(
+        x=list(groups),
+        y=list(values),
+        marker_color=[DELTA_COLORS["gain" if value >= 0 else "loss"] for value in values],
+        text=list(values),
+        texttemplate="%{text:$,.0f}",
+        textposition="outside",
+        hovertemplate="%{x}: %{y:$,.0f}<extra></extra>"
+    ))
+    fig.update_layout(
+        title=f"{metric_label} by {group_label}",
+        xaxis_title=group_label, yaxis=dict(title=metric_label, tickformat=",.0f"),
+        **TRANSPARENT_LAYOUT
+    )
+    if compact:
+        fig.layout.template = COMPACT_TEMPLATE
+    return fig
+
+def payload_bytes(fig):
+    """Size of the figure JSON Streamlit sends to the browser."""
+    return len(pio.to_json(fig, validate=False).encode("utf-8"))
+
+
+# -------------------- FIGURE CACHE --------------------
+
+class FigureCache:
+    """Bounded cache of built figures keyed by the chart name and the values it plots."""
+
+    def __init__(self, maxsize=DEFAULT_FIGURE_CACHE_SIZE):
+        # Figures are only read after they are built (Streamlit serializes a copy), so no defensive copies
+        self._figures = ResultCache(maxsize=maxsize, copy_values=False)
+
+    def get(self, name, build, *values):
+        """Returns the cached figure for (`name`, `values`), building it with `build()` on a miss."""
+        return self._figures.get_or_compute(canonical_key(name, *values), build)
+
+    def stats(self):
+        return self._figures.stats()
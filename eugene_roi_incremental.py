@@ -0,0 +1,135 @@
+"""
+Incremental recomputation of `run_calculations` for interactive sessions.
+
+Each row of the results' per-variant table is built from two memoized nodes:
+
+- savings: annual volume, role hours saved, staff cost, efficiency and
+  patient savings. Depends on the variant's own inputs, weeks per year, the
+  four hourly rates and the input mode.
+- revenue: MBS/private revenue and consult hours. Depends on the variant's
+  volume and doctor time, weeks per year, its MBS rate and the billing model.
+
+Each node remembers the inputs it was computed from and is recomputed only
+when those change (a different assumptions version clears them all), so editing the Comprehensive volume leaves Core and
+Couples untouched and switching billing model only re-runs the revenue nodes.
+Cross-variant totals (additional revenue, logistics, net benefit) are cheap
+and re-aggregated on every call with the engine's own `combine_results`, so
+results are identical to `eugene_roi_engine.run_calculations`.
+
+A calculator is per session but may be shared by a session's background
+jobs, so `run` holds a lock while it reads and updates the nodes.
+"""
+
+import threading
+
+import eugene_roi_engine as engine
+from eugene_roi_timing import stage
+
+# -------------------- DEPENDENCY KEYS --------------------
+
+RATE_FIELDS = ["admin_hourly", "nurse_hourly", "doctor_hourly", "genetic_hourly"]
+BILLING_FIELDS = ["model", "private_hourly", "bulk_rate"]
+
+def _params_key(params):
+    return tuple(sorted(params.items()))
+
+def savings_key(variant, params, staff, weeks_year, simplified_mode):
+    """Everything a variant's savings node reads."""
+    rates = tuple(staff.get(field) for field in RATE_FIELDS)
+    return (variant, _params_key(params), weeks_year, rates, simplified_mode)
+
+def revenue_key(variant, params, specialty, billing, weeks_year, assumptions=None):
+    """Everything a variant's revenue node reads (not consults/hour, which only affects the totals)."""
+    rate = (assumptions or engine.ASSUMPTIONS)["specialty_mbs"][specialty][variant]["rate"]
+    billing_values = tuple(billing.get(field) for field in BILLING_FIELDS)
+    return (variant, params["weekly_volume"], params.get("doctor_time", 0), weeks_year, rate, billing_values)
+
+
+# -------------------- CALCULATOR --------------------
+
+class IncrementalCalculator:
+    """Memoizes per-variant nodes between calls and recomputes only those whose inputs changed."""
+
+    def __init__(self):
+        self._nodes = {}
+        self._fingerprint = None
+        self.computed = 0
+        self.reused = 0
+        self.last_run = {"computed": 0, "reused": 0}
+        self._lock = threading.Lock()
+
+    def _node(self, slot, key, compute):
+        cached = self._nodes.get(slot)
+        if cached is not None and cached[0] == key:
+            self.last_run["reused"] += 1
+            return cached[1]
+        value = compute()
+        self._nodes[slot] = (key, value)
+        self.last_run["computed"] += 1
+        return value
+
+    def run(self, practice, staff, billing, test_configs, logistics, simplified_mode=True, assumptions=None):
+        """Same inputs and results as `engine.run_calculations`, reusing unchanged variant nodes."""
+        with self._lock:
+            return self._run(practice, staff, billing, test_configs, logistics, simplified_mode, assumptions)
+
+    def _run(self, practice, staff, billing, test_configs, logistics, simplified_mode, assumptions):
+        assumptions = assumptions or engine.ASSUMPTIONS
+        if assumptions["fingerprint"] != self._fingerprint:
+            # Probabilities and costs are not part of the node keys, so a new version invalidates everything
+            self._nodes.clear()
+            self._fingerprint = assumptions["fingerprint"]
+        self.last_run = {"computed": 0, "reused": 0}
+        weeks_year = practice["weeks_year"]
+        specialty = practice["specialty"]
+
+        rows = []
+        visited = set()
+
+        with stage("variants"):
+            for test_type, test_variants in test_configs.items():
+                for variant, params in test_variants.items():
+                    if "weekly_volume" not in params:
+                        continue
+
+                    savings_slot = ("savings", test_type, variant)
+                    savings = self._node(
+                        savings_slot,
+                        savings_key(variant, params, staff, weeks_year, simplified_mode),
+                        lambda: engine.savings_columns(
+                            test_type, variant, params, staff, weeks_year, simplified_mode, assumptions
+                        )
+                    )
+
+                    revenue_slot = ("revenue", test_type, variant)
+                    revenue = self._node(
+                        revenue_slot,
+                        revenue_key(variant, params, specialty, billing, weeks_year, assumptions),
+                        lambda: engine.revenue_columns(variant, params, specialty, billing, weeks_year, assumptions)
+                    )
+                    visited.update((savings_slot, revenue_slot))
+                    rows.append({**savings, **revenue})
+
+        # Forget variants that are no longer configured
+        for slot in set(self._nodes) - visited:
+            del self._nodes[slot]
+
+        self.computed += self.last_run["computed"]
+        self.reused += self.last_run["reused"]
+
+        with stage("aggregate"):
+            return engine.combine_results(rows, engine.calculate_logistical_costs(logistics), billing, practice)
+
+    def clear(self):
+        self._nodes.clear()
+
+    def stats(self):
+        total = self.computed + self.reused
+        return {
+            "nodes": len(self._nodes),
+            "assumptions": self._fingerprint,
+            "computed": self.computed,
+            "reused": self.reused,
+            "reuse_rate": self.reused / total if total else 0.0,
+            "last_run": dict(self.last_run)
+        }
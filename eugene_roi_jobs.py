@@ -0,0 +1,161 @@
+"""
+Background calculation jobs for the dashboard.
+
+A `Job` is an ordered list of named sections (the headline results, then
+uncertainty bands, projection, optimizer, sensitivity, ...), each a function
+of the sections computed before it. `JobRunner.submit` runs a job on a
+process-wide worker pool while the Streamlit script returns immediately; the
+dashboard then polls `job.results` and renders each section as soon as it is
+in, with `progress()` for a progress bar.
+
+`cancel()` stops a job before its next section starts (a section that is
+already running finishes, but its result is discarded). The dashboard cancels
+a session's running job when its inputs change or a new calculation starts.
+A failing section records its error and the job moves on, so one broken
+optional view never hides the rest. `run()` executes a job synchronously in
+the calling thread (used when background calculation is switched off).
+
+Section functions run outside the Streamlit script, so they must not call
+`st.*` or read `st.session_state`: capture what they need when the job is
+built. A background job times its `eugene_roi_timing` stages on its own
+`job.timer`, since the rerun that submitted it has usually finished.
+"""
+
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import eugene_roi_timing as timing
+
+# -------------------- CONSTANTS --------------------
+
+# ✅ Calculation jobs running at once across all sessions (others queue)
+DEFAULT_JOB_WORKERS = 4
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+
+
+# -------------------- JOB --------------------
+
+class Job:
+    """Named sections computed in order; each result is readable as soon as its section finishes."""
+
+    def __init__(self, key, sections, context=None):
+        self.key = key
+        self.sections = list(sections)
+        # Caller data carried with the job (inputs, display options, ...)
+        self.context = dict(context or {})
+        self.results = {}
+        self.errors = {}
+        self.seconds = {}
+        # Stage timings of a background run (synchronous runs time into the caller's rerun)
+        self.timer = None
+        self.status = PENDING
+        self.current = None
+        self.submitted = time.perf_counter()
+        self._cancelled = threading.Event()
+        self._finished = threading.Event()
+
+    @property
+    def names(self):
+        return [name for name, _ in self.sections]
+
+    def cancel(self):
+        """Stops the job before its next section (no-op once it has finished)."""
+        if not self._finished.is_set():
+            self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def done(self):
+        """True once every section has run or the job was cancelled."""
+        return self._finished.is_set()
+
+    def ready(self, name):
+        """True when section `name` finished (successfully or with an error)."""
+        return name in self.results or name in self.errors
+
+    def wait(self, timeout=None):
+        return self._finished.wait(timeout)
+
+    def progress(self):
+        """Share of sections finished (0.0 - 1.0)."""
+        if not self.sections:
+            return 1.0
+        return (len(self.results) + len(self.errors)) / len(self.sections)
+
+    def run(self):
+        """Computes every section in order in the calling thread, stopping early if cancelled."""
+        self.status = RUNNING
+        try:
+            for name, compute in self.sections:
+                if self.cancelled:
+                    break
+                self.current = name
+                started = time.perf_counter()
+                try:
+                    value = compute(self.results)
+                except Exception as e:
+                    self.errors[name] = str(e)
+                else:
+                    if not self.cancelled:
+                        self.results[name] = value
+                self.seconds[name] = time.perf_counter() - started
+        finally:
+            self.current = None
+            self.status = CANCELLED if self.cancelled else DONE
+            self._finished.set()
+        return self
+
+
+# -------------------- RUNNER --------------------
+
+class JobRunner:
+    """Worker pool shared by every session; counts submitted, finished and cancelled jobs."""
+
+    def __init__(self, workers=DEFAULT_JOB_WORKERS):
+        self.workers = workers
+        self.submitted = 0
+        self.finished = 0
+        self.cancelled = 0
+        self._active = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="eugene-job")
+
+    def _run(self, job):
+        job.timer = timing.start_run()
+        with self._lock:
+            self._active.add(job)
+        try:
+            job.run()
+        finally:
+            job.timer.finished = time.perf_counter()
+            with self._lock:
+                self._active.discard(job)
+                self.finished += 1
+                self.cancelled += job.cancelled
+
+    def submit(self, job):
+        """Queues `job` on the pool and returns it."""
+        with self._lock:
+            self.submitted += 1
+        # A fresh context per job, so its timer never leaks into the next job on the same pool thread
+        self._executor.submit(contextvars.Context().run, self._run, job)
+        return job
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "submitted": self.submitted,
+                "running": len(self._active),
+                "queued": self.submitted - self.finished - len(self._active),
+                "finished": self.finished,
+                "cancelled": self.cancelled
+            }
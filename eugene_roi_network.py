@@ -0,0 +1,198 @@
+"""
+Network rollup for clinic groups: many sites evaluated and summed together.
+
+A network is a table of sites, one row per clinic, in the flat column layout
+of `eugene_roi_batch` plus a `site` name and a `region`. Only `specialty` and
+the weekly base volumes (`core_weekly_volume`, `couples_weekly_volume`,
+`comprehensive_weekly_volume`) are needed; `prepare_sites` fills everything
+else the way the Simplified dashboard does: staff rates from the specialty
+defaults, Bulk Bill, 48 weeks, 3 consults/hour, complex-case volumes from the
+complex-case probabilities and the Simplified test times. Any column that is
+present (e.g. `doctor_hourly` or `core_doctor_time`) overrides the default;
+blank cells fall back to it.
+
+`evaluate_sites` scores every site in one vectorized `evaluate_batch` pass
+(tens of milliseconds for hundreds of sites), `rollup` sums the headline
+metrics by specialty, region or billing model, and `site_profile` turns one
+evaluated site back into the engine's input dicts for a per-variant drill-down
+with `run_calculations`.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+import eugene_roi_batch as batch
+import eugene_roi_engine as engine
+
+# -------------------- CONSTANTS --------------------
+
+# Columns that identify a site in results and rollups
+SITE_COLUMNS = ["site", "region", "specialty", "billing_model"]
+
+GROUP_COLUMNS = {"specialty": "Specialty", "region": "Region", "billing_model": "Billing Model"}
+
+# ✅ Values for site columns left out or blank (Simplified dashboard defaults)
+SITE_DEFAULTS = {
+    "region": "Unassigned",
+    "billing_model": "Bulk Bill",
+    "weeks_year": 48,
+    "consults_per_hour": 3,
+    "operation_days": 5,
+    "private_hourly": 0.0,
+    "bulk_rate": 0.0,
+    "simplified_mode": True
+}
+
+# Weekly volume columns of the base (non-complex) variants, one per test category
+BASE_VOLUME_COLUMNS = [
+    f"{batch.VARIANT_SLUGS[batch.VARIANTS.index(variants['base'])]}_weekly_volume"
+    for variants in engine.TEST_TYPES.values()
+]
+
+# Columns offered in the dashboard's site editor, in display order
+EDITOR_COLUMNS = [
+    "site", "region", "specialty", "billing_model", "private_hourly", "bulk_rate",
+    "weeks_year", "consults_per_hour", "doctor_hourly", *BASE_VOLUME_COLUMNS
+]
+
+SITE_FORMATS = (".csv", ".xlsx", ".parquet")
+
+# ✅ Spellings accepted in the simplified_mode column (case-insensitive)
+BOOLEAN_VALUES = {"true": True, "false": False, "yes": True, "no": False, "1": True, "0": False}
+
+# Errors a malformed site table raises while it is read, prepared or evaluated
+SITE_ERRORS = (ValueError, TypeError, KeyError, pd.errors.ParserError, pa.ArrowException)
+
+
+# -------------------- SITE TABLES --------------------
+
+def example_sites():
+    """A small starter network for the site editor."""
+    return pd.DataFrame([
+        {"site": "City Fertility", "region": "Metro", "specialty": "Fertility Specialist",
+         "billing_model": "Private", "private_hourly": 300.0, "bulk_rate": 0.0,
+         "core_weekly_volume": 40, "couples_weekly_volume": 25, "comprehensive_weekly_volume": 10},
+        {"site": "Northside GP", "region": "Metro", "specialty": "GP",
+         "billing_model": "Bulk Bill", "private_hourly": 0.0, "bulk_rate": 0.0,
+         "core_weekly_volume": 20, "couples_weekly_volume": 5, "comprehensive_weekly_volume": 2},
+        {"site": "Valley Women's Health", "region": "Regional", "specialty": "OB/GYN",
+         "billing_model": "Mixed", "private_hourly": 200.0, "bulk_rate": 60.0,
+         "core_weekly_volume": 30, "couples_weekly_volume": 15, "comprehensive_weekly_volume": 5}
+    ], columns=EDITOR_COLUMNS)
+
+def read_sites(source, name=None):
+    """Reads a site table from a CSV, Excel or Parquet file (a path or an uploaded file object)."""
+    suffix = Path(name or str(source)).suffix.lower()
+    if suffix == ".csv":
+        return pd.read_csv(source)
+    if suffix == ".xlsx":
+        return pd.read_excel(source)
+    if suffix in (".parquet", ".pq"):
+        return pd.read_parquet(source)
+    raise ValueError(f"Unsupported site file format '{suffix}' (expected {', '.join(SITE_FORMATS)})")
+
+def _boolean(value, column):
+    """Parses one true/false cell (bool, 1/0 or a BOOLEAN_VALUES spelling); raises ValueError otherwise."""
+    if pd.api.types.is_bool(value) or (pd.api.types.is_number(value) and value in (0, 1)):
+        return bool(value)
+    parsed = BOOLEAN_VALUES.get(str(value).strip().lower())
+    if parsed is None:
+        raise ValueError(f"Invalid {column} value '{value}' (expected true/false, yes/no or 1/0)")
+    return parsed
+
+def prepare_sites(sites, assumptions=None):
+    """Fills missing and blank site columns with their defaults; returns a frame `evaluate_batch` accepts."""
+    assumptions = assumptions or engine.ASSUMPTIONS
+    frame = sites.copy()
+
+    # Rows the editor added but left without a specialty are ignored
+    if "specialty" not in frame:
+        raise ValueError("Missing required column 'specialty'")
+    frame = frame[frame["specialty"].notna() & (frame["specialty"].astype(str).str.strip() != "")]
+    frame = frame.reset_index(drop=True)
+
+    unknown = sorted(set(frame["specialty"]) - set(assumptions["specialty_mbs"]))
+    if unknown:
+        raise ValueError(f"Unknown specialty value(s): {', '.join(map(str, unknown))}")
+
+    names = pd.Series([f"Site {i + 1}" for i in range(len(frame))], index=frame.index)
+    frame["site"] = frame["site"].fillna(names) if "site" in frame else names
+
+    for column, default in SITE_DEFAULTS.items():
+        frame[column] = frame[column].fillna(default) if column in frame else default
+    frame["simplified_mode"] = frame["simplified_mode"].map(lambda value: _boolean(value, "simplified_mode")).astype(bool)
+    for column in batch.LOGISTICS_COLUMNS:
+        if column in frame:
+            frame[column] = frame[column].fillna(0.0)
+
+    # Staff rates follow each site's specialty unless given
+    default_rates = {
+        "doctor_hourly": frame["specialty"].map(lambda specialty: assumptions["simplified_salary"].get(specialty, 180)),
+        **{
+            f"{role}_hourly": assumptions["default_staff_costs"][f"{role}_hourly"]
+            for role in ("admin", "nurse", "genetic")
+        }
+    }
+    for column, default in default_rates.items():
+        frame[column] = frame[column].fillna(default) if column in frame else default
+
+    return batch.apply_simplified_defaults(frame, batch.tables_for(assumptions))
+
+
+# -------------------- EVALUATION --------------------
+
+def evaluate_sites(sites, assumptions=None):
+    """Scores every site in one batched pass; returns the prepared site inputs plus one column per headline metric."""
+    prepared = prepare_sites(sites, assumptions)
+    metrics = batch.evaluate_batch(prepared, batch.tables_for(assumptions))
+    return pd.concat([prepared.drop(columns=batch.OUTPUT_COLUMNS, errors="ignore"), metrics], axis=1)
+
+def rollup(site_results, by="specialty"):
+    """Sums the headline metrics of `site_results` per `by` group, with the number of sites in each."""
+    if by not in GROUP_COLUMNS:
+        raise ValueError(f"Cannot group sites by '{by}' (expected one of {', '.join(GROUP_COLUMNS)})")
+    grouped = site_results.groupby(by, sort=True)
+    summary = grouped[batch.OUTPUT_COLUMNS].sum()
+    summary.insert(0, "sites", grouped.size())
+    return summary
+
+def network_totals(site_results):
+    """Headline metrics summed over the whole network."""
+    totals = site_results[batch.OUTPUT_COLUMNS].sum()
+    totals["sites"] = len(site_results)
+    return totals
+
+def drill_down(site_results, by, value):
+    """Sites of one rollup group, best net annual benefit first."""
+    sites = site_results[site_results[by] == value]
+    return sites.sort_values("net_annual_benefit", ascending=False)
+
+def _number(value):
+    """A site cell as a float (blank cells count as 0, as in `evaluate_batch`)."""
+    return 0.0 if value is None or pd.isna(value) else float(value)
+
+def site_profile(site):
+    """Engine input dicts (practice, staff, billing, test_configs, logistics, simplified_mode) for one evaluated site row."""
+    practice = {
+        "specialty": site["specialty"],
+        "operation_days": int(site["operation_days"]),
+        "weeks_year": float(site["weeks_year"]),
+        "consults_per_hour": float(site["consults_per_hour"])
+    }
+    staff = {f"{role}_hourly": float(site[f"{role}_hourly"]) for role in engine.ROLES}
+    billing = {"model": site["billing_model"]}
+    if billing["model"] != "Bulk Bill":
+        billing["private_hourly"] = float(site["private_hourly"])
+    if billing["model"] == "Mixed":
+        billing["bulk_rate"] = float(site["bulk_rate"])
+
+    test_configs = {}
+    for category, variant, slug in zip(batch.VARIANT_CATEGORIES, batch.VARIANTS, batch.VARIANT_SLUGS):
+        test_configs.setdefault(category, {})[variant] = {
+            field: _number(site.get(f"{slug}_{field}")) for field in batch.TEST_FIELDS
+        }
+
+    logistics = {column: _number(site[column]) for column in batch.LOGISTICS_COLUMNS if column in site}
+    return practice, staff, billing, test_configs, logistics, bool(site["simplified_mode"])
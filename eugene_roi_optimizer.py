@@ -0,0 +1,170 @@
+"""
+Capacity-aware search for the weekly test mix that maximizes net annual benefit.
+
+The decision variables are the base weekly volumes of the three test
+categories; each category's complex volume follows its base volume (by the
+complex-case probability in Simplified mode, or the clinic's current
+complex/base ratio in Advanced mode). Every other input stays as configured.
+
+Capacity comes from the practice profile and staff counts:
+
+- admin, nurse and doctor hours: headcount x working hours/day x clinical
+  days/week x the share of staff time available for testing workflows
+  (genetic counseling is provided by Eugene, so it is not a clinic limit)
+- patients: every test starts with a consult, so weekly tests are capped at
+  doctors x working hours x days x consults/hour
+
+`optimize` evaluates a coarse grid over all three volumes as one batch through
+`eugene_roi_batch`, then refines around the best feasible point on a
+one-test grid, so a typical clinic is searched in well under a second.
+"""
+
+import time
+
+import numpy as np
+
+import eugene_roi_engine as engine
+import eugene_roi_batch as batch
+
+# -------------------- CONSTANTS --------------------
+
+# ✅ Share of staff hours that can go to testing workflows (the rest is routine clinical work)
+DEFAULT_CAPACITY_SHARE = 0.5
+
+# ✅ Grid points per category in the coarse pass (40^3 = 64,000 candidate mixes)
+DEFAULT_GRID_POINTS = 40
+
+# ✅ Upper bound on any category's weekly volume (matches the dashboard input)
+MAX_WEEKLY_VOLUME = 1000
+
+# Roles whose hours limit the test mix
+CAPACITY_ROLES = ["admin", "nurse", "doctor"]
+
+CATEGORIES = list(engine.TEST_TYPES)
+
+# Variant positions (in batch order) of each category's base and complex tests
+BASE_INDEX = [batch.VARIANTS.index(engine.TEST_TYPES[category]["base"]) for category in CATEGORIES]
+COMPLEX_INDEX = [batch.VARIANTS.index(engine.TEST_TYPES[category]["curly"]) for category in CATEGORIES]
+
+
+# -------------------- CAPACITY --------------------
+
+def capacity(practice, staff, capacity_share=DEFAULT_CAPACITY_SHARE):
+    """Weekly limits: staff hours available for testing per role, and patients (tests) per week."""
+    clinic_hours = engine.DEFAULT_WORK_SCHEDULE["working_hours_per_day"] * practice["operation_days"]
+    limits = {role: staff.get(f"num_{role}", 0) * clinic_hours * capacity_share for role in CAPACITY_ROLES}
+    limits["patients"] = staff.get("num_doctor", 1) * clinic_hours * practice["consults_per_hour"]
+    return limits
+
+def complex_ratios(row, tables=None):
+    """Complex tests per base test for each category."""
+    tables = tables or batch.TABLES
+    ratios = []
+    for base, curly in zip(BASE_INDEX, COMPLEX_INDEX):
+        base_volume = row.get(f"{batch.VARIANT_SLUGS[base]}_weekly_volume", 0)
+        if row.get("simplified_mode", True) or not base_volume:
+            ratios.append(float(tables["complex_probabilities"][curly]))
+        else:
+            ratios.append(row.get(f"{batch.VARIANT_SLUGS[curly]}_weekly_volume", 0) / base_volume)
+    return np.array(ratios)
+
+def usage_per_test(row, ratios):
+    """Weekly load of one base test (plus its share of complex tests) per category: {limit: array of 3}."""
+    minutes = {
+        field: np.array([row.get(f"{slug}_{field}", 0) or 0 for slug in batch.VARIANT_SLUGS], dtype=float)
+        for field in batch.TIME_FIELDS
+    }
+    role_minutes = {
+        "admin": minutes["admin_time"],
+        "nurse": minutes["nurse_time"],
+        "doctor": minutes["doctor_time"] + minutes["research_time"]
+    }
+    usage = {role: (values[BASE_INDEX] + ratios * values[COMPLEX_INDEX]) / 60 for role, values in role_minutes.items()}
+    usage["patients"] = 1 + ratios
+    return usage
+
+
+# -------------------- SEARCH --------------------
+
+def evaluate_mixes(row, volumes, ratios, tables=None, objective="net_annual_benefit"):
+    """Evaluates candidate base volumes (n x 3) in one batch; returns the objective per candidate."""
+    data = dict(row)
+    for i, (base, curly) in enumerate(zip(BASE_INDEX, COMPLEX_INDEX)):
+        data[f"{batch.VARIANT_SLUGS[base]}_weekly_volume"] = volumes[:, i]
+        data[f"{batch.VARIANT_SLUGS[curly]}_weekly_volume"] = volumes[:, i] * ratios[i]
+    return batch.evaluate_arrays(data, tables)[objective]
+
+def _best_feasible(row, volumes, ratios, usage, limits, tables, objective):
+    """Index and value of the best candidate that respects every limit (or (None, None))."""
+    feasible = np.ones(len(volumes), dtype=bool)
+    for name, limit in limits.items():
+        feasible &= volumes @ usage[name] <= limit + 1e-9
+    if not feasible.any():
+        return None, None
+    values = np.where(feasible, evaluate_mixes(row, volumes, ratios, tables, objective), -np.inf)
+    best = int(np.argmax(values))
+    return best, float(values[best])
+
+def _grid(axes):
+    return np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, len(axes)).astype(float)
+
+def optimize(practice, staff, billing, test_configs, logistics=None, simplified_mode=True,
+             capacity_share=DEFAULT_CAPACITY_SHARE, objective="net_annual_benefit",
+             grid_points=DEFAULT_GRID_POINTS, max_weekly_volume=MAX_WEEKLY_VOLUME, tables=None):
+    """Finds the whole-number weekly base volumes per category that maximize `objective` within capacity."""
+    started = time.perf_counter()
+    row = batch.profile_to_row(practice, staff, billing, test_configs, logistics, simplified_mode)
+    ratios = complex_ratios(row, tables)
+    usage = usage_per_test(row, ratios)
+    limits = capacity(practice, staff, capacity_share)
+
+    # Each category on its own can use at most the tightest limit
+    upper = np.full(len(CATEGORIES), float(max_weekly_volume))
+    for name, limit in limits.items():
+        with np.errstate(divide="ignore"):
+            upper = np.minimum(upper, np.where(usage[name] > 0, limit / usage[name], np.inf))
+    upper = np.floor(upper)
+
+    # Coarse pass over an even integer grid, then a one-test grid around its best point
+    steps = np.maximum(np.ceil(upper / (grid_points - 1)), 1)
+    coarse = _grid([np.arange(0, high + step, step).clip(max=high) for high, step in zip(upper, steps)])
+    best, _ = _best_feasible(row, coarse, ratios, usage, limits, tables, objective)
+    center = coarse[best]
+    fine = _grid([
+        np.arange(max(c - step, 0), min(c + step, high) + 1)
+        for c, step, high in zip(center, steps, upper)
+    ])
+    best, value = _best_feasible(row, fine, ratios, usage, limits, tables, objective)
+    optimal = fine[best]
+
+    current = np.array([row.get(f"{batch.VARIANT_SLUGS[base]}_weekly_volume", 0) for base in BASE_INDEX], dtype=float)
+    current_value = float(evaluate_mixes(row, current[None, :], ratios, tables, objective)[0])
+
+    return {
+        "objective": objective,
+        "categories": CATEGORIES,
+        "current": dict(zip(CATEGORIES, current.tolist())),
+        "optimal": dict(zip(CATEGORIES, optimal.tolist())),
+        "current_value": current_value,
+        "optimal_value": value,
+        "complex_ratios": dict(zip(CATEGORIES, ratios.tolist())),
+        "limits": limits,
+        "current_usage": {name: float(current @ usage[name]) for name in limits},
+        "optimal_usage": {name: float(optimal @ usage[name]) for name in limits},
+        "evaluated": len(coarse) + len(fine),
+        "seconds": time.perf_counter() - started
+    }
+
+def apply_mix(test_configs, result):
+    """Returns a copy of `test_configs` with the optimal base volumes (complex volumes scaled to match)."""
+    configs = {category: {variant: dict(params) for variant, params in variants.items()}
+               for category, variants in test_configs.items()}
+    for category in CATEGORIES:
+        if category not in configs:
+            continue
+        base = engine.TEST_TYPES[category]["base"]
+        curly = engine.TEST_TYPES[category]["curly"]
+        volume = result["optimal"][category]
+        configs[category].setdefault(base, {})["weekly_volume"] = volume
+        configs[category].setdefault(curly, {})["weekly_volume"] = volume * result["complex_ratios"][category]
+    return configs
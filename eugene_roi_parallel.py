@@ -0,0 +1,188 @@
+"""
+Opt-in process-pool execution for large portfolio and simulation runs.
+
+Clinic frames are split into shards and Monte Carlo runs into independent
+sub-simulations, each evaluated on a `ProcessPoolExecutor` worker. The
+reference tables (MBS rates, complex-case probabilities, ...) are sent once
+per worker through the pool initializer rather than pickled with every task.
+
+Simulation shards are seeded from `numpy.random.SeedSequence(seed).spawn(shards)`,
+so results depend on the seed and shard count but not on how many workers ran
+them or in what order they finished.
+
+Run `python eugene_roi_parallel.py --rows 2000000` for a speedup benchmark.
+"""
+
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import eugene_roi_batch as batch
+import eugene_roi_simulation as simulation
+
+# -------------------- CONSTANTS --------------------
+
+# ✅ Shards per worker (a little over-partitioning evens out stragglers)
+SHARDS_PER_WORKER = 2
+
+# ✅ Simulation shards are fixed so the same seed always gives the same bands
+DEFAULT_SIMULATION_SHARDS = 16
+
+
+# -------------------- WORKER STATE --------------------
+
+_WORKER_TABLES = None
+
+def _init_worker(tables):
+    """Receives the shared read-only reference tables once per worker process."""
+    global _WORKER_TABLES
+    _WORKER_TABLES = tables
+
+def _evaluate_shard(frame):
+    return batch.evaluate_batch(frame, _WORKER_TABLES)
+
+def _evaluate_chunk(evaluate, chunk):
+    """Runs a chunk evaluator against the tables this worker was primed with."""
+    return evaluate(chunk, tables=_WORKER_TABLES)
+
+def _simulate_shard(row, simplified_mode, n_samples, seed_sequence, probability_distributions, time_distributions):
+    samples = simulation.draw_samples(
+        n_samples, seed_sequence, probability_distributions, time_distributions, _WORKER_TABLES
+    )
+    data, tables = simulation.samples_to_arrays(row, samples, simplified_mode, _WORKER_TABLES)
+    metrics = batch.evaluate_arrays(data, tables)
+    return {name: metrics[name] for name in batch.OUTPUT_COLUMNS}
+
+def default_workers():
+    return os.cpu_count() or 1
+
+def make_executor(workers=None, tables=None):
+    """Creates a process pool whose workers are primed with the reference tables."""
+    return ProcessPoolExecutor(
+        max_workers=workers or default_workers(),
+        initializer=_init_worker,
+        initargs=(tables or batch.TABLES,)
+    )
+
+
+# -------------------- PARALLEL BATCH --------------------
+
+def evaluate_batch_parallel(frame, workers=None, shards=None, tables=None):
+    """Evaluates a clinic frame across worker processes; same output as `evaluate_batch`."""
+    workers = workers or default_workers()
+    if workers == 1 or len(frame) < 2:
+        return batch.evaluate_batch(frame, tables)
+
+    shards = min(shards or workers * SHARDS_PER_WORKER, len(frame))
+    bounds = np.linspace(0, len(frame), shards + 1, dtype=int)
+    pieces = [frame.iloc[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    with make_executor(workers, tables) as executor:
+        return pd.concat(list(executor.map(_evaluate_shard, pieces)))
+
+def iter_evaluate_parallel(chunks, evaluate, workers=None, tables=None):
+    """Applies `evaluate` to a stream of chunks in worker processes, yielding results in input order.
+
+    At most two chunks per worker are in flight, so memory stays bounded for
+    streamed inputs. `evaluate` must be picklable (a module-level function or
+    a partial of one) and accept a `tables` keyword: each worker passes the
+    reference tables it received once at start-up, so they are not pickled
+    again with every chunk.
+    """
+    workers = workers or default_workers()
+    pending = deque()
+
+    with make_executor(workers, tables) as executor:
+        for chunk in chunks:
+            pending.append(executor.submit(_evaluate_chunk, evaluate, chunk))
+            if len(pending) >= workers * SHARDS_PER_WORKER:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+# -------------------- PARALLEL SIMULATION --------------------
+
+def simulate_parallel(practice, staff, billing, test_configs, logistics=None, simplified_mode=True,
+                      n_samples=1_000_000, seed=0, workers=None, shards=DEFAULT_SIMULATION_SHARDS,
+                      probability_distributions=None, time_distributions=None,
+                      percentiles=simulation.DEFAULT_PERCENTILES, tables=None):
+    """Runs a Monte Carlo as independently seeded shards across worker processes."""
+    row = batch.profile_to_row(practice, staff, billing, test_configs, logistics, simplified_mode)
+    seed_sequences = np.random.SeedSequence(seed).spawn(shards)
+    sizes = np.diff(np.linspace(0, n_samples, shards + 1, dtype=int))
+
+    with make_executor(workers, tables) as executor:
+        futures = [
+            executor.submit(
+                _simulate_shard, row, simplified_mode, int(size), seed_sequence,
+                probability_distributions, time_distributions
+            )
+            for size, seed_sequence in zip(sizes, seed_sequences)
+        ]
+        parts = [future.result() for future in futures]
+
+    metrics = {name: np.concatenate([part[name] for part in parts]) for name in batch.OUTPUT_COLUMNS}
+    return simulation.summarize(metrics, percentiles)
+
+
+# -------------------- BENCHMARK --------------------
+
+def synthetic_clinics(n_rows, seed=0):
+    """Builds a random Simplified-mode clinic frame for benchmarking."""
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        "specialty": rng.choice(batch.TABLES["specialties"], n_rows),
+        "weeks_year": rng.integers(40, 53, n_rows),
+        "consults_per_hour": rng.integers(1, 7, n_rows),
+        "admin_hourly": rng.integers(25, 101, n_rows),
+        "nurse_hourly": rng.integers(25, 101, n_rows),
+        "doctor_hourly": rng.integers(80, 301, n_rows),
+        "genetic_hourly": rng.integers(60, 201, n_rows),
+        "billing_model": rng.choice(batch.BILLING_MODELS, n_rows),
+        "private_hourly": rng.integers(100, 801, n_rows),
+        "bulk_rate": rng.integers(0, 101, n_rows),
+        "core_weekly_volume": rng.integers(0, 100, n_rows),
+        "couples_weekly_volume": rng.integers(0, 100, n_rows),
+        "comprehensive_weekly_volume": rng.integers(0, 100, n_rows)
+    })
+    return batch.apply_simplified_defaults(frame)
+
+def benchmark(n_rows=2_000_000, worker_counts=None, repeats=3):
+    """Times `evaluate_batch_parallel` at each worker count; returns a frame of timings and speedups."""
+    worker_counts = worker_counts or sorted({1, 2, 4, 8, default_workers()})
+    frame = synthetic_clinics(n_rows)
+    rows = []
+
+    for workers in worker_counts:
+        best = min(
+            _timed(lambda: evaluate_batch_parallel(frame, workers=workers))
+            for _ in range(repeats)
+        )
+        rows.append({"workers": workers, "seconds": best, "clinics_per_second": n_rows / best})
+
+    report = pd.DataFrame(rows)
+    report["speedup"] = report["seconds"].iloc[0] / report["seconds"]
+    report["efficiency"] = report["speedup"] / report["workers"]
+    return report
+
+def _timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark parallel batch evaluation.")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="Synthetic clinics to evaluate.")
+    parser.add_argument("--workers", type=int, nargs="+", help="Worker counts to compare (default 1 2 4 8 and cpu count).")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per worker count (best is reported).")
+    args = parser.parse_args()
+
+    print(f"CPU count: {default_workers()}")
+    print(benchmark(args.rows, args.workers, args.repeats).to_string(index=False))
@@ -0,0 +1,207 @@
+"""
+Multi-year ROI projections with volume ramp-up, indexation and discounting.
+
+`project` turns one clinic into a years x variants problem and evaluates
+every year in a single pass through `eugene_roi_batch`: each year is one batch
+row whose weekly volumes are scaled by the ramp-up/growth curve, whose hourly
+rates carry salary inflation, and whose MBS rates (a years x variants table)
+carry the annual indexation. Year 1 at 100% adoption with no inflation is
+exactly the single-year `run_calculations` result.
+
+Cash flows are the yearly net annual benefit, less an optional upfront cost
+in year 0; `summarize` reports NPV, IRR and the (interpolated) payback year.
+
+Projection settings (all rates are annual fractions, e.g. 0.03 = 3%):
+
+- years:              projection length
+- ramp:               share of steady-state volume in years 1, 2, ... (later years use 1.0)
+- volume_growth:      volume growth per year after the ramp-up
+- mbs_indexation:     MBS rate indexation
+- private_fee_growth: private billing rate growth
+- salary_inflation:   staff hourly rate inflation
+- cost_inflation:     logistics cost inflation
+- discount_rate:      discount rate for NPV
+- upfront_cost:       one-off cost in year 0 (e.g. implementation)
+"""
+
+import numpy as np
+import pandas as pd
+
+import eugene_roi_batch as batch
+
+# -------------------- CONSTANTS --------------------
+
+# ✅ Default projection settings (5 years, half volume in year 1, 2.5% indexation, 3% inflation, 7% discount rate)
+DEFAULT_PROJECTION = {
+    "years": 5,
+    "ramp": [0.5, 0.8],
+    "volume_growth": 0.0,
+    "mbs_indexation": 0.025,
+    "private_fee_growth": 0.0,
+    "salary_inflation": 0.03,
+    "cost_inflation": 0.03,
+    "discount_rate": 0.07,
+    "upfront_cost": 0.0
+}
+
+# ✅ Projections are capped at 30 years
+MAX_YEARS = 30
+
+HOURLY_COLUMNS = ["admin_hourly", "nurse_hourly", "doctor_hourly", "genetic_hourly"]
+
+PROJECTION_COLUMNS = [
+    "year", "volume_factor",
+    *batch.OUTPUT_COLUMNS,
+    "cash_flow", "discounted_cash_flow", "cumulative_cash_flow", "cumulative_discounted_cash_flow"
+]
+
+# Column titles for the dashboard table and the Excel "Projection" sheet
+COLUMN_LABELS = {
+    "year": "Year",
+    "volume_factor": "Volume (% of Steady State)",
+    "staff_costs": "Workload-Based Staff Costs",
+    "logistical_costs": "Logistical Costs",
+    "total_annual_savings": "Annual Savings",
+    "total_revenue": "Total Revenue",
+    "additional_revenue": "Additional Revenue",
+    "total_doctor_hours_saved": "Doctor Time Saved (hrs)",
+    "potential_patient_savings": "Potential Patient Savings",
+    "total_staff_hours_saved": "Total Staff Time Saved (hrs)",
+    "net_annual_benefit": "Net Annual Benefit",
+    "cash_flow": "Cash Flow",
+    "discounted_cash_flow": "Discounted Cash Flow",
+    "cumulative_cash_flow": "Cumulative Cash Flow",
+    "cumulative_discounted_cash_flow": "Cumulative Discounted Cash Flow"
+}
+
+
+# -------------------- TIME AXIS --------------------
+
+def settings(projection=None):
+    """Fills missing projection settings with the defaults and checks their ranges."""
+    projection = {**DEFAULT_PROJECTION, **(projection or {})}
+    if not 1 <= int(projection["years"]) <= MAX_YEARS:
+        raise ValueError(f"years must be between 1 and {MAX_YEARS}")
+    if any(share < 0 for share in projection["ramp"]):
+        raise ValueError("ramp shares cannot be negative")
+    if projection["discount_rate"] <= -1:
+        raise ValueError("discount_rate must be greater than -100%")
+    projection["years"] = int(projection["years"])
+    return projection
+
+def volume_factors(projection):
+    """Per-year multiplier on steady-state weekly volumes: the ramp, then compound growth."""
+    years = projection["years"]
+    ramp = np.ones(years)
+    shares = np.asarray(projection["ramp"][:years], dtype=float)
+    ramp[:len(shares)] = shares
+    # Growth compounds from the first year after the ramp-up
+    ramped_years = np.maximum(np.arange(years) - len(projection["ramp"]), 0)
+    return ramp * (1 + projection["volume_growth"]) ** ramped_years
+
+def index_factors(rate, years):
+    """(1 + rate) ** t for t = 0 .. years - 1 (year 1 is unindexed)."""
+    return (1 + rate) ** np.arange(years)
+
+def yearly_inputs(row, projection, tables=None):
+    """Expands a flattened clinic row into one batch row per year, plus tables with a years x variants rate axis."""
+    tables = tables or batch.TABLES
+    years = projection["years"]
+    data = dict(row)
+
+    volumes = volume_factors(projection)
+    for slug in batch.VARIANT_SLUGS:
+        column = f"{slug}_weekly_volume"
+        data[column] = float(row.get(column, 0)) * volumes
+
+    salaries = index_factors(projection["salary_inflation"], years)
+    for column in HOURLY_COLUMNS:
+        data[column] = float(row[column]) * salaries
+
+    data["private_hourly"] = float(row.get("private_hourly", 0)) * index_factors(projection["private_fee_growth"], years)
+
+    costs = index_factors(projection["cost_inflation"], years)
+    for column in batch.LOGISTICS_COLUMNS:
+        data[column] = float(row.get(column, 0)) * costs
+
+    # Each year gets its own row of MBS rates; the row's specialty code then selects its year
+    specialty = tables["specialties"].index(row["specialty"])
+    year_tables = dict(tables)
+    year_tables["rates"] = tables["rates"][specialty] * index_factors(projection["mbs_indexation"], years)[:, None]
+    year_tables["specialties"] = [f"Year {year}" for year in range(1, years + 1)]
+    data["specialty"] = np.arange(years)
+
+    return data, year_tables, volumes
+
+
+# -------------------- PROJECTION --------------------
+
+def npv(cash_flows, rate):
+    """Net present value of cash flows at t = 0, 1, 2, ..."""
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    return float(np.sum(cash_flows / (1 + rate) ** np.arange(len(cash_flows))))
+
+def irr(cash_flows):
+    """Internal rate of return, or None when the cash flows never change sign."""
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    if not (cash_flows < 0).any() or not (cash_flows > 0).any():
+        return None
+    # NPV is a polynomial in x = 1 / (1 + r); keep real roots that give r > -100%
+    roots = np.roots(cash_flows[::-1])
+    rates = [1 / root.real - 1 for root in roots if abs(root.imag) < 1e-9 and root.real > 0]
+    if not rates:
+        return None
+    return float(min(rates, key=abs))
+
+def payback_period(cash_flows):
+    """Years until cumulative cash flow turns non-negative (interpolated within the year), or None."""
+    cumulative = np.cumsum(np.asarray(cash_flows, dtype=float))
+    if cumulative[0] >= 0:
+        return 0.0
+    reached = np.nonzero(cumulative >= 0)[0]
+    if not len(reached):
+        return None
+    year = reached[0]
+    return float(year - 1 + -cumulative[year - 1] / cash_flows[year])
+
+def project(practice, staff, billing, test_configs, logistics=None, simplified_mode=True,
+            projection=None, tables=None):
+    """Projects the clinic over several years; returns one row of metrics and cash flows per year."""
+    projection = settings(projection)
+    row = batch.profile_to_row(practice, staff, billing, test_configs, logistics, simplified_mode)
+    data, year_tables, volumes = yearly_inputs(row, projection, tables)
+    metrics = batch.evaluate_arrays(data, year_tables)
+
+    yearly = pd.DataFrame({name: metrics[name] for name in batch.OUTPUT_COLUMNS})
+    yearly.insert(0, "volume_factor", volumes)
+    yearly.insert(0, "year", np.arange(1, projection["years"] + 1))
+
+    discount = (1 + projection["discount_rate"]) ** yearly["year"].to_numpy()
+    yearly["cash_flow"] = yearly["net_annual_benefit"]
+    yearly["discounted_cash_flow"] = yearly["cash_flow"] / discount
+    yearly["cumulative_cash_flow"] = yearly["cash_flow"].cumsum() - projection["upfront_cost"]
+    yearly["cumulative_discounted_cash_flow"] = yearly["discounted_cash_flow"].cumsum() - projection["upfront_cost"]
+    return yearly[PROJECTION_COLUMNS]
+
+def cash_flows(yearly, projection=None):
+    """Cash flows from year 0 (the upfront cost) to the last projected year."""
+    projection = settings(projection)
+    return np.concatenate([[-projection["upfront_cost"]], yearly["cash_flow"].to_numpy()])
+
+def summarize(yearly, projection=None):
+    """NPV, IRR, payback period and totals for a projection."""
+    projection = settings(projection)
+    flows = cash_flows(yearly, projection)
+    return {
+        "years": projection["years"],
+        "npv": npv(flows, projection["discount_rate"]),
+        "irr": irr(flows),
+        "payback_years": payback_period(flows),
+        "total_net_benefit": float(yearly["cash_flow"].sum()),
+        "total_revenue": float(yearly["total_revenue"].sum())
+    }
+
+def labelled(yearly):
+    """Projection table with display column titles (volume as a percentage)."""
+    table = yearly.assign(volume_factor=yearly["volume_factor"] * 100)
+    return table.rename(columns=COLUMN_LABELS)
@@ -0,0 +1,188 @@
+"""
+Per-session store of named ROI results for side-by-side comparison.
+
+A result dict from `run_calculations` carries its per-variant table (and, in
+the dashboard, DataFrames); keeping many of those per user adds up
+on a shared server. `ScenarioStore` instead flattens each saved result into
+one row of fixed columns: a few text details (specialty, billing model, input
+mode, assumptions version) and the headline metrics plus annual volume and
+savings per test variant, each numeric column held in a compact
+`array("d")` (8 bytes per scenario).
+
+The store holds at most `max_scenarios` rows; saving beyond that evicts the
+oldest saved scenario. Saving under an existing name replaces that row and
+makes it the newest. `table` and `deltas` return DataFrames for display
+(pandas is imported only then).
+"""
+
+from array import array
+
+import eugene_roi_engine as engine
+
+# -------------------- CONSTANTS --------------------
+
+# ✅ Scenarios kept per session before the oldest is evicted
+DEFAULT_MAX_SCENARIOS = 20
+
+# ✅ Longest scenario name kept (longer names are truncated)
+MAX_NAME_LENGTH = 60
+
+# Text columns recorded with each scenario (missing details are stored as "")
+DETAIL_COLUMNS = ["specialty", "billing_model", "input_mode", "assumptions_version"]
+
+# Headline metrics, in display order
+METRIC_COLUMNS = [
+    "total_revenue",
+    "additional_revenue",
+    "total_annual_savings",
+    "staff_costs",
+    "logistical_costs",
+    "net_annual_benefit",
+    "potential_patient_savings",
+    "total_doctor_hours_saved",
+    "total_staff_hours_saved"
+]
+
+# Test types in the results' variant table ("Core - Core", "Core - Core Complex Cases", ...)
+VARIANT_KEYS = [
+    f"{category} - {variant}"
+    for category, variants in engine.TEST_TYPES.items()
+    for variant in (variants["base"], variants["curly"])
+]
+
+VARIANT_COLUMNS = [f"{key}: {field}" for key in VARIANT_KEYS for field in ("annual_volume", "total_savings")]
+
+NUMERIC_COLUMNS = METRIC_COLUMNS + VARIANT_COLUMNS
+
+COLUMN_LABELS = {
+    "specialty": "Specialty",
+    "billing_model": "Billing Model",
+    "input_mode": "Input Mode",
+    "assumptions_version": "Assumptions",
+    "total_revenue": "Total Revenue",
+    "additional_revenue": "Additional Revenue",
+    "total_annual_savings": "Annual Efficiency Savings",
+    "staff_costs": "Staff Costs",
+    "logistical_costs": "Logistical Costs",
+    "net_annual_benefit": "Net Annual Benefit",
+    "potential_patient_savings": "Potential Patient Savings",
+    "total_doctor_hours_saved": "Doctor Time Saved (hrs)",
+    "total_staff_hours_saved": "Total Staff Time Saved (hrs)"
+}
+
+
+# -------------------- FLATTENING --------------------
+
+def flatten(results):
+    """One scenario's numeric columns, in NUMERIC_COLUMNS order."""
+    values = [float(results.get(metric, 0) or 0) for metric in METRIC_COLUMNS]
+    table = results.get("variants", {})
+    variants = dict(zip(
+        table.get("test_type", []), zip(table.get("annual_volume", []), table.get("total_savings", []))
+    ))
+    for key in VARIANT_KEYS:
+        annual_volume, total_savings = variants.get(key, (0, 0))
+        values.append(float(annual_volume))
+        values.append(float(total_savings))
+    return values
+
+
+# -------------------- SCENARIO STORE --------------------
+
+class ScenarioStore:
+    """Named results kept as columns (one row per scenario), capped at `max_scenarios`."""
+
+    def __init__(self, max_scenarios=DEFAULT_MAX_SCENARIOS):
+        if max_scenarios < 1:
+            raise ValueError("max_scenarios must be at least 1")
+        self.max_scenarios = max_scenarios
+        self.evictions = 0
+        self._names = []
+        self._details = {column: [] for column in DETAIL_COLUMNS}
+        self._values = {column: array("d") for column in NUMERIC_COLUMNS}
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._names
+
+    def names(self):
+        """Scenario names, oldest first."""
+        return list(self._names)
+
+    def _delete(self, index):
+        del self._names[index]
+        for column in self._details.values():
+            del column[index]
+        for column in self._values.values():
+            column.pop(index)
+
+    def save(self, name, results, details=None):
+        """Stores `results` under `name` (replacing a scenario of that name); returns the names evicted to make room."""
+        name = str(name).strip()[:MAX_NAME_LENGTH]
+        if not name:
+            raise ValueError("scenario name cannot be empty")
+        if name in self._names:
+            self._delete(self._names.index(name))
+
+        evicted = []
+        while len(self._names) >= self.max_scenarios:
+            evicted.append(self._names[0])
+            self._delete(0)
+            self.evictions += 1
+
+        details = details or {}
+        self._names.append(name)
+        for column, values in self._details.items():
+            values.append(str(details.get(column) or ""))
+        for column, value in zip(NUMERIC_COLUMNS, flatten(results)):
+            self._values[column].append(value)
+        return evicted
+
+    def remove(self, name):
+        if name in self._names:
+            self._delete(self._names.index(name))
+
+    def clear(self):
+        for name in self.names():
+            self.remove(name)
+
+    def row(self, name):
+        """One scenario as a flat dict of its details and numeric columns."""
+        index = self._names.index(name)
+        row = {column: values[index] for column, values in self._details.items()}
+        row.update({column: values[index] for column, values in self._values.items()})
+        return row
+
+    def table(self, columns=None):
+        """Scenarios x columns DataFrame (details and headline metrics by default), indexed by name."""
+        import pandas as pd
+
+        columns = columns or DETAIL_COLUMNS + METRIC_COLUMNS
+        data = {
+            column: self._details[column] if column in self._details else list(self._values[column])
+            for column in columns
+        }
+        return pd.DataFrame(data, index=pd.Index(self._names, name="scenario"), columns=columns)
+
+    def deltas(self, baseline, columns=None):
+        """Numeric columns of every scenario minus those of `baseline`."""
+        if baseline not in self._names:
+            raise ValueError(f"unknown scenario '{baseline}'")
+        table = self.table(columns or METRIC_COLUMNS)
+        return table - table.loc[baseline]
+
+    def nbytes(self):
+        """Approximate memory held by the stored values (names and details included)."""
+        numeric = sum(values.itemsize * len(values) for values in self._values.values())
+        text = sum(len(value) for values in [self._names, *self._details.values()] for value in values)
+        return numeric + text
+
+    def stats(self):
+        return {
+            "scenarios": len(self),
+            "max_scenarios": self.max_scenarios,
+            "evictions": self.evictions,
+            "bytes": self.nbytes()
+        }
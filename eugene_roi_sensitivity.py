@@ -0,0 +1,173 @@
+"""
+One-shot sensitivity sweeps over any numeric clinic input.
+
+Every function takes a flattened clinic row (`eugene_roi_batch.profile_to_row`)
+and evaluates all grid points as a single batch, so a 100 x 100 heatmap is one
+10,000-row vectorized pass rather than 10,000 calls to `run_calculations`.
+
+Parameters are batch column names: staff rates (`doctor_hourly`, ...),
+billing (`private_hourly`, `bulk_rate`), practice (`weeks_year`,
+`consults_per_hour`) and per-test columns such as `core_weekly_volume` or
+`couples_complex_research_time`. In Simplified mode, sweeping a base weekly
+volume also moves its complex volume, as the dashboard inputs do.
+"""
+
+import numpy as np
+import pandas as pd
+
+import eugene_roi_engine as engine
+import eugene_roi_batch as batch
+
+# -------------------- CONSTANTS --------------------
+
+PARAMETER_LABELS = {
+    "doctor_hourly": "Doctor Hourly Rate ($)",
+    "admin_hourly": "Admin Hourly Rate ($)",
+    "nurse_hourly": "Nurse Hourly Rate ($)",
+    "genetic_hourly": "Genetic Counselor Hourly Rate ($)",
+    "private_hourly": "Private Rate ($/hr)",
+    "bulk_rate": "Bulk Bill Percentage (%)",
+    "weeks_year": "Operational Weeks/Year",
+    "consults_per_hour": "Patient Consults/Hour",
+    **{
+        f"{slug}_{field}": f"{variant} {label}"
+        for slug, variant in zip(batch.VARIANT_SLUGS, batch.VARIANTS)
+        for field, label in [
+            ("weekly_volume", "Tests per Week"),
+            ("admin_time", "Admin Time (min)"),
+            ("nurse_time", "Nurse Time (min)"),
+            ("doctor_time", "Doctor Time (min)"),
+            ("research_time", "Research Time (min)"),
+            ("genetic_time", "Genetic Counseling Time (min)")
+        ]
+    }
+}
+
+# ✅ Hard limits so default ranges stay meaningful (e.g. percentages)
+PARAMETER_BOUNDS = {
+    "bulk_rate": (0, 100),
+    "weeks_year": (1, 52)
+}
+
+# ✅ Default tornado spread around the current value (+/- 20%)
+DEFAULT_SPREAD = 0.2
+
+DEFAULT_METRIC = "net_annual_benefit"
+
+
+# -------------------- HELPERS --------------------
+
+def _complex_pairs(tables=None):
+    """Maps each base weekly-volume column to its complex column and probability."""
+    tables = tables or batch.TABLES
+    pairs = {}
+    for category in engine.TEST_TYPES.values():
+        base_slug = batch.VARIANT_SLUGS[batch.VARIANTS.index(category["base"])]
+        complex_index = batch.VARIANTS.index(category["curly"])
+        probability = float(tables["complex_probabilities"][complex_index])
+        pairs[f"{base_slug}_weekly_volume"] = (f"{batch.VARIANT_SLUGS[complex_index]}_weekly_volume", probability)
+    return pairs
+
+COMPLEX_VOLUME_PAIRS = _complex_pairs()
+
+def with_overrides(row, overrides, tables=None):
+    """Applies per-point parameter arrays to a clinic row, keeping derived Simplified-mode volumes in sync."""
+    pairs = COMPLEX_VOLUME_PAIRS if tables is None else _complex_pairs(tables)
+    data = dict(row)
+    for parameter, values in overrides.items():
+        if parameter not in PARAMETER_LABELS:
+            raise ValueError(f"'{parameter}' is not a sweepable parameter")
+        data[parameter] = np.asarray(values, dtype=float)
+        if row.get("simplified_mode", True) and parameter in pairs:
+            complex_column, probability = pairs[parameter]
+            if complex_column not in overrides:
+                data[complex_column] = data[parameter] * probability
+    return data
+
+def default_range(row, parameter, spread=DEFAULT_SPREAD):
+    """Returns (low, high) around the row's current value, clipped to the parameter's bounds."""
+    value = float(row.get(parameter, 0))
+    low, high = value * (1 - spread), value * (1 + spread)
+    if parameter in PARAMETER_BOUNDS:
+        lower_bound, upper_bound = PARAMETER_BOUNDS[parameter]
+        low, high = max(low, lower_bound), min(high, upper_bound)
+    return low, high
+
+def default_grid(row, parameter, points=100, spread=0.5):
+    """Returns `points` evenly spaced values spanning +/- `spread` of the current value."""
+    if parameter == "bulk_rate":
+        return np.linspace(0, 100, points)
+    low, high = default_range(row, parameter, spread)
+    return np.linspace(low, high, points)
+
+def sweepable_parameters(row):
+    """Lists the parameters that currently influence the results for this clinic."""
+    parameters = ["doctor_hourly", "admin_hourly", "nurse_hourly", "genetic_hourly", "weeks_year"]
+    if row.get("billing_model") != "Bulk Bill":
+        parameters += ["private_hourly", "consults_per_hour"]
+    if row.get("billing_model") == "Mixed":
+        parameters.append("bulk_rate")
+    for slug in batch.VARIANT_SLUGS:
+        for field in batch.TEST_FIELDS:
+            column = f"{slug}_{field}"
+            if row.get(column, 0) and not (row.get("simplified_mode", True) and field == "weekly_volume" and "complex" in slug):
+                parameters.append(column)
+    return parameters
+
+
+# -------------------- SWEEPS --------------------
+
+def sweep(row, parameter, values, tables=None):
+    """Evaluates the clinic at every value of one parameter; returns one row of metrics per value."""
+    values = np.asarray(values, dtype=float)
+    metrics = batch.evaluate_arrays(with_overrides(row, {parameter: values}, tables), tables)
+    frame = pd.DataFrame({name: metrics[name] for name in batch.OUTPUT_COLUMNS})
+    frame.insert(0, parameter, values)
+    return frame
+
+def sweep_2d(row, x_parameter, x_values, y_parameter, y_values, metric=DEFAULT_METRIC, tables=None):
+    """Evaluates a full x/y grid in one pass; returns a frame indexed by y values with x values as columns."""
+    if x_parameter == y_parameter:
+        raise ValueError("x and y parameters must differ")
+    x_values = np.asarray(x_values, dtype=float)
+    y_values = np.asarray(y_values, dtype=float)
+    grid_x, grid_y = np.meshgrid(x_values, y_values)
+
+    metrics = batch.evaluate_arrays(
+        with_overrides(row, {x_parameter: grid_x.ravel(), y_parameter: grid_y.ravel()}, tables), tables
+    )
+    grid = metrics[metric].reshape(grid_y.shape)
+    return pd.DataFrame(
+        grid,
+        index=pd.Index(y_values, name=y_parameter),
+        columns=pd.Index(x_values, name=x_parameter)
+    )
+
+def tornado(row, ranges=None, metric=DEFAULT_METRIC, tables=None):
+    """Swings each parameter between its (low, high) range, all in one batch, sorted by impact."""
+    if ranges is None:
+        ranges = {parameter: default_range(row, parameter) for parameter in sweepable_parameters(row)}
+
+    parameters = list(ranges)
+    points = len(parameters) * 2 + 1
+    overrides = {}
+    for i, parameter in enumerate(parameters):
+        values = np.full(points, float(row.get(parameter, 0)))
+        values[2 * i], values[2 * i + 1] = ranges[parameter]
+        overrides[parameter] = values
+
+    results = batch.evaluate_arrays(with_overrides(row, overrides, tables), tables)[metric]
+    base_value = results[-1]
+
+    frame = pd.DataFrame({
+        "parameter": parameters,
+        "label": [PARAMETER_LABELS[parameter] for parameter in parameters],
+        "base_input": [float(row.get(parameter, 0)) for parameter in parameters],
+        "low_input": [ranges[parameter][0] for parameter in parameters],
+        "high_input": [ranges[parameter][1] for parameter in parameters],
+        "low_result": results[0:-1:2],
+        "high_result": results[1::2]
+    })
+    frame["base_result"] = base_value
+    frame["swing"] = (frame["high_result"] - frame["low_result"]).abs()
+    return frame.sort_values("swing", ascending=False, ignore_index=True)
@@ -0,0 +1,149 @@
+"""
+Monte Carlo uncertainty bands for a single clinic.
+
+The complex-case probabilities and the per-test time assumptions are point
+estimates. `simulate` draws them from configurable distributions as one
+n_samples x parameters matrix, evaluates every draw in a single vectorized
+pass through `eugene_roi_batch`, and reports percentile bands for each
+headline metric.
+
+Distribution specs are dicts with a "dist" key:
+
+- {"dist": "fixed", "value": v}
+- {"dist": "uniform", "low": a, "high": b}
+- {"dist": "triangular", "low": a, "mode": m, "high": b}
+- {"dist": "normal", "mean": mu, "sd": sigma}   (clipped at 0)
+
+Probability specs are keyed by complex variant name and give the probability
+itself. Time specs are keyed by batch column name (e.g. "couples_doctor_time")
+and give a multiplier on the clinic's configured minutes.
+"""
+
+import numpy as np
+import pandas as pd
+
+import eugene_roi_engine as engine
+import eugene_roi_batch as batch
+
+# -------------------- CONSTANTS --------------------
+
+# ✅ Relative spread of each complex-case probability (Core is literature-backed, the rest are assumptions so wider)
+PROBABILITY_SPREADS = {"Core Complex Cases": 0.25}
+DEFAULT_PROBABILITY_SPREAD = 0.5
+
+# ✅ Time assumptions vary -20%/+25% around the configured minutes
+DEFAULT_TIME_DISTRIBUTION = {"dist": "triangular", "low": 0.8, "mode": 1.0, "high": 1.25}
+
+DEFAULT_TIME_DISTRIBUTIONS = {
+    column: DEFAULT_TIME_DISTRIBUTION
+    for category in engine.TEST_TYPES.values()
+    for column in (
+        f"{batch.VARIANT_SLUGS[batch.VARIANTS.index(category['base'])]}_admin_time",
+        f"{batch.VARIANT_SLUGS[batch.VARIANTS.index(category['base'])]}_nurse_time",
+        f"{batch.VARIANT_SLUGS[batch.VARIANTS.index(category['base'])]}_doctor_time",
+        f"{batch.VARIANT_SLUGS[batch.VARIANTS.index(category['curly'])]}_research_time"
+    )
+}
+
+DEFAULT_PERCENTILES = (5, 50, 95)
+
+
+# -------------------- SAMPLING --------------------
+
+def default_probability_distributions(tables=None):
+    """Triangular ranges around the complex-case probabilities of one assumptions version's tables."""
+    tables = batch.TABLES if tables is None else tables
+    distributions = {}
+    for variant, complex_case, probability in zip(
+        batch.VARIANTS, tables["is_complex"], tables["complex_probabilities"]
+    ):
+        if complex_case:
+            spread = PROBABILITY_SPREADS.get(variant, DEFAULT_PROBABILITY_SPREAD)
+            distributions[variant] = {
+                "dist": "triangular",
+                "low": float(probability) * (1 - spread),
+                "mode": float(probability),
+                "high": float(probability) * (1 + spread)
+            }
+    return distributions
+
+DEFAULT_PROBABILITY_DISTRIBUTIONS = default_probability_distributions()
+
+def _draw(rng, spec, n):
+    """Draws n values from one distribution spec."""
+    dist = spec["dist"]
+    if dist == "fixed":
+        return np.full(n, float(spec["value"]))
+    if dist == "uniform":
+        return rng.uniform(spec["low"], spec["high"], n)
+    if dist == "triangular":
+        if spec["low"] == spec["high"]:
+            return np.full(n, float(spec["mode"]))
+        return rng.triangular(spec["low"], spec["mode"], spec["high"], n)
+    if dist == "normal":
+        return np.clip(rng.normal(spec["mean"], spec["sd"], n), 0, None)
+    raise ValueError(f"Unknown distribution '{dist}'")
+
+def draw_samples(n_samples, seed=0, probability_distributions=None, time_distributions=None, tables=None):
+    """Draws the full uncertainty matrix: one row per sample, one column per uncertain input.
+
+    Probability ranges default to the complex-case probabilities in `tables`
+    (the active assumptions version); pass {} to hold an input group fixed.
+    """
+    if probability_distributions is None:
+        probability_distributions = default_probability_distributions(tables)
+    if time_distributions is None:
+        time_distributions = DEFAULT_TIME_DISTRIBUTIONS
+
+    rng = np.random.default_rng(seed)
+    specs = {**probability_distributions, **time_distributions}
+    return pd.DataFrame({name: _draw(rng, spec, n_samples) for name, spec in specs.items()})
+
+def samples_to_arrays(row, samples, simplified_mode=True, tables=None):
+    """Applies one sample matrix to a flattened clinic row, returning batch arrays and tables."""
+    tables = dict(tables or batch.TABLES)
+    n = len(samples)
+    data = dict(row)
+
+    for column in samples.columns:
+        if column in batch.VARIANTS:
+            continue
+        data[column] = row.get(column, 0) * samples[column].to_numpy()
+
+    probabilities = np.broadcast_to(tables["complex_probabilities"], (n, len(batch.VARIANTS))).copy()
+    for variant in samples.columns.intersection(batch.VARIANTS):
+        index = batch.VARIANTS.index(variant)
+        probabilities[:, index] = samples[variant].to_numpy()
+
+        # Simplified mode derives complex volume from the base volume and the probability
+        if simplified_mode:
+            base_slug = batch.VARIANT_SLUGS[tables["base_variant"][index]]
+            data[f"{batch.VARIANT_SLUGS[index]}_weekly_volume"] = (
+                row.get(f"{base_slug}_weekly_volume", 0) * probabilities[:, index]
+            )
+
+    tables["complex_probabilities"] = probabilities
+    data["simplified_mode"] = simplified_mode
+    return data, tables
+
+
+# -------------------- SIMULATION --------------------
+
+def summarize(metrics, percentiles=DEFAULT_PERCENTILES):
+    """Reduces per-sample metric arrays to a percentile band table (one row per metric)."""
+    columns = [f"P{p}" for p in percentiles]
+    bands = {
+        name: dict(zip(columns, np.percentile(values, percentiles)), Mean=float(np.mean(values)))
+        for name, values in metrics.items()
+    }
+    return pd.DataFrame.from_dict(bands, orient="index")[columns + ["Mean"]]
+
+def simulate(practice, staff, billing, test_configs, logistics=None, simplified_mode=True,
+             n_samples=100_000, seed=0, probability_distributions=None, time_distributions=None,
+             percentiles=DEFAULT_PERCENTILES, tables=None):
+    """Runs a seeded Monte Carlo over the uncertain assumptions and returns percentile bands."""
+    row = batch.profile_to_row(practice, staff, billing, test_configs, logistics, simplified_mode)
+    samples = draw_samples(n_samples, seed, probability_distributions, time_distributions, tables)
+    data, tables = samples_to_arrays(row, samples, simplified_mode, tables)
+    metrics = batch.evaluate_arrays(data, tables)
+    return summarize({name: metrics[name] for name in batch.OUTPUT_COLUMNS}, percentiles)
@@ -0,0 +1,196 @@
+"""
+Per-rerun stage timing for the dashboard.
+
+`start_run()` opens a timer for the current Streamlit rerun (held in a
+context variable, so concurrent sessions never share one). Code anywhere in
+the call stack then records stages with `with stage("name"):` or the
+`@timed("name")` decorator; nested stages are recorded as "outer/inner".
+Outside a run both are no-ops, so the engine can be instrumented without
+slowing batch jobs down.
+
+`finish_run()` emits the stage timings as one JSON log line on the
+"eugene_roi.timing" logger and adds the rerun total to a process-wide
+window used for p50/p95 latency. `start_profile()` and `profile_bytes()`
+capture a whole rerun with cProfile for download.
+"""
+
+import contextvars
+import functools
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+logger = logging.getLogger("eugene_roi.timing")
+
+# -------------------- CONSTANTS --------------------
+
+# ✅ Reruns kept for the rolling latency percentiles
+LATENCY_WINDOW = 1000
+
+_NO_STAGE = nullcontext()
+_current = contextvars.ContextVar("eugene_roi_timer", default=None)
+
+
+# -------------------- TIMER --------------------
+
+class StageTimer:
+    """Records named stage durations (in seconds) for one rerun."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished = None
+        self.stages = []
+        self._stack = []
+
+    @contextmanager
+    def stage(self, name):
+        self._stack.append(name)
+        # Reserve the slot on entry so stages are listed in the order they started
+        entry = ["/".join(self._stack), 0.0]
+        self.stages.append(entry)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry[1] = time.perf_counter() - start
+            self._stack.pop()
+
+    def total(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    def totals(self):
+        """Sums repeated stages; returns {stage path: seconds} in first-seen order."""
+        totals = {}
+        for path, seconds in self.stages:
+            totals[path] = totals.get(path, 0.0) + seconds
+        return totals
+
+    def rows(self):
+        """Stage rows for display, plus an "(other)" row for time outside any top-level stage."""
+        total = self.total()
+        totals = self.totals()
+        rows = [
+            {"Stage": path, "Time (ms)": seconds * 1000, "Share (%)": seconds / total * 100 if total else 0.0}
+            for path, seconds in totals.items()
+        ]
+        other = total - sum(seconds for path, seconds in totals.items() if "/" not in path)
+        rows.append({"Stage": "(other)", "Time (ms)": other * 1000, "Share (%)": other / total * 100 if total else 0.0})
+        return rows
+
+    def record(self, **fields):
+        """Structured form of the rerun for logs and metrics."""
+        return {
+            "event": "rerun",
+            "total_ms": round(self.total() * 1000, 3),
+            "stages": {path: round(seconds * 1000, 3) for path, seconds in self.totals().items()},
+            **fields
+        }
+
+
+# -------------------- LATENCY WINDOW --------------------
+
+def _nearest_rank(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    rank = -(-len(sorted_values) * q // 100)
+    return sorted_values[max(int(rank), 1) - 1]
+
+class LatencyWindow:
+    """Thread-safe rolling window of rerun latencies (seconds) with percentile summaries."""
+
+    def __init__(self, maxlen=LATENCY_WINDOW):
+        self._values = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def add(self, seconds):
+        with self._lock:
+            self._values.append(seconds)
+
+    def summary(self):
+        """Returns rerun count and p50/p95/max latency in milliseconds."""
+        with self._lock:
+            values = sorted(self._values)
+        if not values:
+            return {"reruns": 0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        return {
+            "reruns": len(values),
+            "p50_ms": _nearest_rank(values, 50) * 1000,
+            "p95_ms": _nearest_rank(values, 95) * 1000,
+            "max_ms": values[-1] * 1000
+        }
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+RERUN_LATENCY = LatencyWindow()
+
+
+# -------------------- RUN API --------------------
+
+def start_run():
+    """Starts timing a rerun in the current context and returns its timer."""
+    timer = StageTimer()
+    _current.set(timer)
+    return timer
+
+def current():
+    return _current.get()
+
+def stage(name):
+    """Times a block as a stage of the current rerun (no-op outside a run)."""
+    timer = _current.get()
+    if timer is None:
+        return _NO_STAGE
+    return timer.stage(name)
+
+def timed(name):
+    """Decorator form of `stage`."""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def finish_run(**fields):
+    """Closes the current rerun: logs its stage timings and adds it to the latency window."""
+    timer = _current.get()
+    if timer is None:
+        return None
+    timer.finished = time.perf_counter()
+    _current.set(None)
+    RERUN_LATENCY.add(timer.total())
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps(timer.record(**fields), separators=(",", ":")))
+    return timer
+
+
+# -------------------- PROFILING --------------------
+
+def start_profile():
+    """Starts a cProfile capture of the rest of the rerun."""
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+def profile_summary(profiler, limit=30, sort="cumulative"):
+    """Top `limit` functions of a finished capture, as pstats text."""
+    import io
+    import pstats
+
+    output = io.StringIO()
+    pstats.Stats(profiler, stream=output).strip_dirs().sort_stats(sort).print_stats(limit)
+    return output.getvalue()
+
+def profile_bytes(profiler):
+    """Serializes a finished capture in the .prof format read by pstats, snakeviz and similar tools."""
+    import marshal
+
+    profiler.create_stats()
+    return marshal.dumps(profiler.stats)
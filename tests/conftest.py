@@ -0,0 +1,10 @@
+"""
+Test suite configuration: makes the repository's modules importable.
+
+    python -m pytest tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
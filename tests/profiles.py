@@ -0,0 +1,62 @@
+"""
+Shared clinic profiles for the test suite.
+
+Profiles are the engine's input dicts, built the way the Simplified dashboard
+builds them, so every module under test sees the same clinics.
+"""
+
+import random
+
+import eugene_roi_engine as engine
+
+BILLING_MODELS = ["Bulk Bill", "Mixed", "Private"]
+
+TIME_FIELDS = ["admin_time", "nurse_time", "doctor_time", "research_time", "genetic_time"]
+
+
+def clinic(specialty="GP", billing_model="Bulk Bill", volumes=(20, 10, 5), private_hourly=300, bulk_rate=60,
+           weeks_year=48, consults_per_hour=3, simplified_mode=True):
+    """One clinic profile with Simplified test settings for the given weekly base volumes."""
+    billing = {"model": billing_model}
+    if billing_model != "Bulk Bill":
+        billing["private_hourly"] = private_hourly
+    if billing_model == "Mixed":
+        billing["bulk_rate"] = bulk_rate
+    return {
+        "practice": {"specialty": specialty, "operation_days": 5, "weeks_year": weeks_year,
+                     "consults_per_hour": consults_per_hour},
+        "staff": engine.default_staff(specialty),
+        "billing": billing,
+        "test_configs": {
+            category: engine.simplified_test_config(category, volume)
+            for category, volume in zip(engine.TEST_TYPES, volumes)
+        },
+        "logistics": dict(engine.LOGISTICS_COSTS),
+        "simplified_mode": simplified_mode
+    }
+
+def random_clinic(rng):
+    """A random clinic; Advanced-mode clinics also get random per-test minutes."""
+    profile = clinic(
+        specialty=rng.choice(list(engine.SPECIALTY_MBS)),
+        billing_model=rng.choice(BILLING_MODELS),
+        volumes=[rng.randint(0, 100) for _ in engine.TEST_TYPES],
+        private_hourly=rng.randint(100, 800),
+        bulk_rate=rng.randint(0, 100),
+        weeks_year=rng.randint(40, 52),
+        consults_per_hour=rng.randint(1, 6),
+        simplified_mode=rng.random() < 0.5
+    )
+    profile["staff"]["doctor_hourly"] = rng.randint(80, 300)
+    profile["logistics"] = rng.choice([{}, dict(engine.LOGISTICS_COSTS)])
+    if not profile["simplified_mode"]:
+        for variants in profile["test_configs"].values():
+            for params in variants.values():
+                for field in TIME_FIELDS:
+                    if rng.random() < 0.5:
+                        params[field] = rng.randint(0, 200)
+    return profile
+
+def random_clinics(n, seed=0):
+    rng = random.Random(seed)
+    return [random_clinic(rng) for _ in range(n)]
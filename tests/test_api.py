@@ -0,0 +1,133 @@
+"""The HTTP/JSON API, called in-process through its ASGI interface."""
+
+import asyncio
+import json
+
+import pytest
+
+import eugene_roi_api as api
+import eugene_roi_engine as engine
+from eugene_roi_cache import ResultCache
+
+CLINIC = {
+    "practice": {"specialty": "GP"},
+    "billing": {"model": "Mixed", "private_hourly": 200, "bulk_rate": 60},
+    "weekly_volumes": {"Core": 20, "Couples": 10, "Comprehensive": 5}
+}
+
+
+def request(app, method, path, body=b"", headers=()):
+    """Sends one request through the ASGI app; returns (status, parsed JSON body).
+
+    A list `body` arrives as separate chunks, the way a chunked upload does.
+    """
+    chunks = body if isinstance(body, list) else [body]
+    messages = [{"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+                for i, chunk in enumerate(chunks)]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method,
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": [(b"content-type", b"application/json"), *headers], "server": ("test", 80), "client": ("test", 1)
+    }
+    asyncio.run(app(scope, receive, send))
+    request.unread = len(messages)
+    status = next(message["status"] for message in sent if message["type"] == "http.response.start")
+    content = b"".join(message.get("body", b"") for message in sent if message["type"] == "http.response.body")
+    return status, json.loads(content)
+
+def post(app, path, body):
+    return request(app, "POST", path, body if isinstance(body, bytes) else json.dumps(body).encode())
+
+@pytest.fixture
+def app():
+    return api.create_app(api.ROIService(cache=ResultCache(maxsize=64, copy_values=False)))
+
+
+def test_roi_matches_engine(app):
+    status, body = post(app, "/v1/roi", CLINIC)
+    assert status == 200
+
+    practice = {**api.PRACTICE_DEFAULTS, "specialty": "GP"}
+    test_configs = {category: engine.simplified_test_config(category, volume)
+                    for category, volume in CLINIC["weekly_volumes"].items()}
+    expected = engine.run_calculations(practice, engine.default_staff("GP"), CLINIC["billing"], test_configs, {})
+    assert body["results"]["net_annual_benefit"] == pytest.approx(expected["net_annual_benefit"])
+
+def test_repeated_request_is_served_from_cache(app):
+    post(app, "/v1/roi", CLINIC)
+    post(app, "/v1/roi", CLINIC)
+    status, health = request(app, "GET", "/health")
+    assert status == 200
+    assert health["cache"]["hits"] == 1 and health["requests"] == 2
+
+def test_batch_and_sweep(app):
+    status, body = post(app, "/v1/roi/batch", {"clinics": [CLINIC, {**CLINIC, "billing": {"model": "Bulk Bill"}}]})
+    assert status == 200 and len(body["results"]) == 2
+
+    status, body = post(app, "/v1/roi/sweep", {"clinic": CLINIC, "parameter": "core_weekly_volume", "values": [0, 10, 20]})
+    assert status == 200
+    assert body["results"]["net_annual_benefit"][2] == pytest.approx(body["results"]["net_annual_benefit"][1] * 2 -
+                                                                     body["results"]["net_annual_benefit"][0])
+
+@pytest.mark.parametrize("body", [
+    b"[1",
+    b"[]",
+    b'{"practice": {"specialty": "GP"}, "weekly_volumes": {"Core": NaN}}',
+    b'{"practice": {"specialty": "GP"}, "weekly_volumes": {"Core": 1e999}}',
+    {},
+    {"practice": {"specialty": "Dentist"}, "weekly_volumes": {"Core": 1}},
+    {"practice": {"specialty": "GP"}, "billing": {"model": "Private"}, "weekly_volumes": {"Core": 1}},
+    {"practice": {"specialty": "GP"}, "billing": {"model": "Barter"}, "weekly_volumes": {"Core": 1}},
+    {"practice": {"specialty": "GP"}, "weekly_volumes": {"Core": "20"}},
+    {"practice": {"specialty": "GP"}, "weekly_volumes": {"Core": -1}},
+    {"practice": {"specialty": "GP"}, "weekly_volumes": {"Lab": 1}},
+    {"practice": {"specialty": "GP", "consults_per_hour": 0}, "weekly_volumes": {"Core": 1}},
+    {"practice": {"specialty": "GP"}, "staff": {"doctor_hourly": -10}, "weekly_volumes": {"Core": 1}},
+    {"practice": {"specialty": "GP"}, "billing": {"model": "Mixed", "private_hourly": 100, "bulk_rate": 150},
+     "weekly_volumes": {"Core": 1}},
+    {"practice": {"specialty": "GP"}, "weekly_volumes": {"Core": 1}, "simplified_mode": "false"},
+    {"practice": {"specialty": "GP"}, "test_configs": {"Core": {"Unknown": {"weekly_volume": 1}}}},
+    {**CLINIC, "assumptions_version": "1999.1"}
+])
+def test_bad_roi_requests_get_400(app, body):
+    status, response = post(app, "/v1/roi", body)
+    assert status == 400
+    assert response["error"]
+
+@pytest.mark.parametrize("path, body", [
+    ("/v1/roi/batch", {"clinics": []}),
+    ("/v1/roi/batch", {"clinics": [CLINIC, {"practice": {"specialty": "GP"}}]}),
+    ("/v1/roi/sweep", {"clinic": CLINIC, "parameter": "not_an_input", "values": [1]}),
+    ("/v1/roi/sweep", {"clinic": CLINIC, "parameter": "consults_per_hour", "values": [1, 0]}),
+    ("/v1/roi/sweep", {"clinic": CLINIC, "parameter": "core_weekly_volume", "values": "10"})
+])
+def test_bad_batch_and_sweep_requests_get_400(app, path, body):
+    status, _ = post(app, path, body)
+    assert status == 400
+
+def test_declared_oversize_body_is_rejected_before_reading(app, monkeypatch):
+    monkeypatch.setattr(api, "MAX_BODY_BYTES", 100)
+    status, body = request(app, "POST", "/v1/roi", [b"{}"] * 3, headers=[(b"content-length", b"101")])
+    assert status == 413
+    assert request.unread == 3
+
+def test_streamed_oversize_body_is_rejected_at_the_limit(app, monkeypatch):
+    monkeypatch.setattr(api, "MAX_BODY_BYTES", 100)
+    status, body = request(app, "POST", "/v1/roi", [b" " * 60] * 4)
+    assert status == 413
+    assert request.unread == 2
+    assert app.state.service.errors == 1
+
+def test_body_at_the_limit_is_accepted(app, monkeypatch):
+    body = json.dumps(CLINIC).encode()
+    monkeypatch.setattr(api, "MAX_BODY_BYTES", len(body))
+    status, _ = request(app, "POST", "/v1/roi", [body[:10], body[10:]])
+    assert status == 200
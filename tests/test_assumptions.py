@@ -0,0 +1,39 @@
+"""The versioned assumption store and its hot reload."""
+
+import json
+import os
+
+import pytest
+
+import eugene_roi_assumptions as assumptions
+
+
+def test_assumption_store_keeps_last_good_version_on_bad_reload(tmp_path):
+    path = tmp_path / "assumptions.json"
+    with open(assumptions.DEFAULT_PATH, encoding="utf-8") as f:
+        document = json.load(f)
+    path.write_text(json.dumps(document), encoding="utf-8")
+
+    store = assumptions.AssumptionStore(str(path), check_interval=0)
+    good = store.current()
+
+    path.write_text("{ not json", encoding="utf-8")
+    os.utime(path, ns=(0, 0))
+    assert store.refresh() is False
+    assert store.error is not None
+    assert store.current()["fingerprint"] == good["fingerprint"]
+
+    # A fixed file is picked up again
+    document["versions"].append({"version": "2099.1", "effective_date": "2099-07-01",
+                                 "genetic_counseling_private_cost": 999})
+    path.write_text(json.dumps(document), encoding="utf-8")
+    assert store.refresh() is True
+    assert store.error is None
+    assert store.get("2099.1")["genetic_counseling_private_cost"] == 999
+    assert store.current()["version"] == good["version"]
+
+def test_invalid_versions_are_rejected():
+    with pytest.raises(ValueError):
+        assumptions.parse_versions({"versions": []})
+    with pytest.raises(ValueError):
+        assumptions.parse_versions({"versions": [{"version": "x", "effective_date": "2024-01-01"}]})
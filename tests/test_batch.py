@@ -0,0 +1,62 @@
+"""The vectorized batch evaluator against the engine, row by row."""
+
+import copy
+
+import pytest
+
+import eugene_roi_batch as batch
+import eugene_roi_engine as engine
+from profiles import clinic, random_clinics
+
+
+def engine_results(profile, assumptions=None):
+    return engine.run_calculations(
+        profile["practice"], profile["staff"], profile["billing"], profile["test_configs"],
+        profile["logistics"], profile["simplified_mode"], assumptions=assumptions
+    )
+
+def assert_rows_match(metrics, profiles, assumptions=None):
+    assert list(metrics.columns) == batch.OUTPUT_COLUMNS
+    assert len(metrics) == len(profiles)
+    for (_, row), profile in zip(metrics.iterrows(), profiles):
+        expected = engine_results(profile, assumptions)
+        for name in batch.OUTPUT_COLUMNS:
+            assert row[name] == pytest.approx(expected[name], rel=1e-9, abs=1e-6), name
+
+
+def test_evaluate_batch_matches_engine_row_by_row():
+    profiles = random_clinics(300, seed=1)
+    assert_rows_match(batch.evaluate_batch(batch.profiles_to_frame(profiles)), profiles)
+
+def test_packed_arrays_match_frame():
+    frame = batch.profiles_to_frame(random_clinics(50, seed=2))
+    metrics = batch.evaluate_batch(frame)
+    packed = batch.evaluate_arrays(batch.pack(frame))
+    for name in batch.OUTPUT_COLUMNS:
+        assert packed[name] == pytest.approx(metrics[name].to_numpy())
+
+def test_simplified_defaults_fill_missing_columns():
+    profile = clinic("OB/GYN", "Mixed")
+    frame = batch.profiles_to_frame([profile])
+    base_columns = [column for column in frame if not column.endswith("_time") and "complex" not in column]
+    filled = batch.apply_simplified_defaults(frame[base_columns])
+    assert_rows_match(batch.evaluate_batch(filled), [profile])
+
+def test_unknown_specialty_is_rejected():
+    frame = batch.profiles_to_frame([clinic()])
+    frame["specialty"] = "Dentist"
+    with pytest.raises(ValueError, match="Dentist"):
+        batch.evaluate_batch(frame)
+
+def test_specialty_added_by_a_later_version():
+    assumptions = copy.deepcopy(engine.ASSUMPTIONS)
+    assumptions["specialty_mbs"]["Urologist"] = copy.deepcopy(assumptions["specialty_mbs"]["OB/GYN"])
+    assumptions["simplified_salary"]["Urologist"] = 260
+    assumptions["fingerprint"] = "test-urologist"
+    tables = batch.tables_for(assumptions)
+
+    profile = clinic("OB/GYN", "Mixed")
+    profile["practice"]["specialty"] = "Urologist"
+    metrics = batch.evaluate_batch(batch.profiles_to_frame([profile]), tables)
+    assert_rows_match(metrics, [profile], assumptions)
+    assert tables["specialties"][batch.specialty_code("Urologist", tables)] == "Urologist"
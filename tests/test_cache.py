@@ -0,0 +1,108 @@
+"""Result caches: the in-memory LRU and the SQLite disk cache."""
+
+import pytest
+
+import eugene_roi_cache as cache
+
+
+class Clock:
+    """Stands in for the `time` module inside eugene_roi_cache."""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache, "time", clock)
+    return clock
+
+@pytest.fixture
+def disk_cache(tmp_path, clock):
+    def open_cache(**options):
+        return cache.DiskCache(str(tmp_path / "cache.sqlite"), **options)
+    return open_cache
+
+
+# -------------------- MEMORY CACHE --------------------
+
+def test_result_cache_evicts_least_recently_used():
+    results = cache.ResultCache(maxsize=2)
+    results.put("a", 1)
+    results.put("b", 2)
+    assert results.get("a") == 1
+    results.put("c", 3)
+
+    assert "b" not in results
+    assert results.get("a") == 1 and results.get("c") == 3
+    assert results.stats()["evictions"] == 1
+
+def test_result_cache_counts_hits_and_copies_values():
+    results = cache.ResultCache(maxsize=4)
+    value = {"totals": [1, 2]}
+    results.put("key", value)
+    value["totals"].append(3)
+
+    assert results.get("key") == {"totals": [1, 2]}
+    assert results.get("missing", "default") == "default"
+    assert results.get_or_compute("other", lambda: 5) == 5
+    stats = results.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 2, 2)
+
+def test_canonical_key_ignores_dict_order():
+    assert cache.canonical_key({"a": 1, "b": [1, 2]}) == cache.canonical_key({"b": [1, 2], "a": 1})
+    assert cache.canonical_key({"a": 1}) != cache.canonical_key({"a": 2})
+
+
+# -------------------- DISK CACHE --------------------
+
+def test_disk_cache_round_trip_and_namespaces(disk_cache):
+    results = disk_cache(namespace="results")
+    reports = disk_cache(namespace="reports")
+    results.put("key", {"net": 1.5})
+
+    assert results.get("key") == {"net": 1.5}
+    assert reports.get("key") is None
+    assert len(results) == 1 and len(reports) == 0
+
+def test_disk_cache_expires_entries_after_ttl(disk_cache, clock):
+    results = disk_cache(ttl=60)
+    results.put("key", "value")
+    clock.now += 59
+    assert results.get("key") == "value"
+
+    clock.now += 2
+    assert "key" not in results
+    assert results.get("key") is None
+    assert results.stats()["expired"] == 1
+
+def test_disk_cache_evicts_least_recently_used_beyond_max_bytes(disk_cache, clock):
+    results = disk_cache(max_bytes=2500)
+    for key in ("a", "b"):
+        results.put(key, b"x" * 1000)
+        clock.now += 1
+    assert results.get("a") is not None
+    clock.now += 1
+    results.put("c", b"x" * 1000)
+
+    assert results.get("b") is None
+    assert results.get("a") is not None and results.get("c") is not None
+    assert results.stats()["evictions"] == 1
+
+def test_disk_cache_skips_values_larger_than_max_bytes(disk_cache):
+    results = disk_cache(max_bytes=100)
+    results.put("big", b"x" * 1000)
+    assert results.get("big") is None
+
+def test_result_cache_reads_through_disk_backend(disk_cache):
+    backend = disk_cache()
+    cache.ResultCache(maxsize=2, backend=backend).put("key", [1, 2, 3])
+
+    # A fresh process (empty memory cache) finds the value on disk
+    results = cache.ResultCache(maxsize=2, backend=backend)
+    assert results.get("key") == [1, 2, 3]
+    assert results.stats()["disk"]["hits"] == 1
+    assert "key" in results
@@ -0,0 +1,59 @@
+"""The command-line batch runner, end to end on small CSV files."""
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+import eugene_roi_batch as batch
+import eugene_roi_cli as cli
+from profiles import random_clinics
+
+
+@pytest.fixture
+def clinics_csv(tmp_path):
+    """Seven clinics with a pass-through `site` column that is blank for the whole first chunk of three."""
+    frame = batch.profiles_to_frame(random_clinics(7, seed=4))
+    frame.insert(0, "site", [None, None, None, "S4", "S5", "S6", "S7"])
+    path = tmp_path / "clinics.csv"
+    frame.to_csv(path, index=False)
+    return path
+
+def run_cli(*argv):
+    return cli.main([str(arg) for arg in argv] + ["--quiet"])
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_blank_text_column_in_first_chunk(clinics_csv, tmp_path, workers):
+    output = tmp_path / "results.parquet"
+    assert run_cli(clinics_csv, "-o", output, "--chunksize", 3, "--workers", workers) == 0
+
+    table = pq.read_table(output)
+    assert str(table.schema.field("site").type) == "string"
+    assert str(table.schema.field("net_annual_benefit").type) == "double"
+    assert table.column("site").to_pylist() == [None, None, None, "S4", "S5", "S6", "S7"]
+    results = table.to_pandas()
+
+    expected = batch.evaluate_batch(batch.apply_simplified_defaults(pd.read_csv(clinics_csv)))
+    for name in batch.OUTPUT_COLUMNS:
+        assert results[name].tolist() == pytest.approx(expected[name].tolist()), name
+    assert not (tmp_path / "results.parquet.partial").exists()
+
+def test_csv_output_matches_parquet(clinics_csv, tmp_path):
+    assert run_cli(clinics_csv, "-o", tmp_path / "results.csv", "--chunksize", 3) == 0
+    assert run_cli(clinics_csv, "-o", tmp_path / "results.parquet", "--chunksize", 3) == 0
+
+    from_csv = pd.read_csv(tmp_path / "results.csv")
+    from_parquet = pd.read_parquet(tmp_path / "results.parquet")
+    for name in batch.OUTPUT_COLUMNS:
+        assert from_csv[name].tolist() == pytest.approx(from_parquet[name].tolist()), name
+
+def test_failed_run_leaves_no_output(clinics_csv, tmp_path):
+    frame = pd.read_csv(clinics_csv)
+    frame.loc[5, "specialty"] = "Dentist"
+    frame.to_csv(clinics_csv, index=False)
+    output = tmp_path / "results.parquet"
+    output.write_bytes(b"previous results")
+
+    assert run_cli(clinics_csv, "-o", output, "--chunksize", 3) == 1
+    assert output.read_bytes() == b"previous results"
+    assert not (tmp_path / "results.parquet.partial").exists()
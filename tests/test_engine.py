@@ -0,0 +1,67 @@
+"""The headless engine against the baseline dashboard's figures."""
+
+import pytest
+
+import eugene_roi_engine as engine
+from profiles import BILLING_MODELS, clinic
+
+# Baseline dashboard results for `clinic(specialty, billing_model)`: (staff_costs, total_revenue, net_annual_benefit)
+BASELINE = {
+    ("GP", "Bulk Bill"): (161424.0, 144707.52, 123707.52),
+    ("GP", "Mixed"): (161424.0, 760024.512, 739024.512),
+    ("GP", "Private"): (161424.0, 792000.0, 771000.0),
+    ("OB/GYN", "Bulk Bill"): (189168.0, 222850.56, 201850.56),
+    ("OB/GYN", "Mixed"): (189168.0, 806910.336, 785910.336),
+    ("OB/GYN", "Private"): (189168.0, 792000.0, 771000.0),
+    ("Fertility Specialist", "Bulk Bill"): (209976.0, 262656.0, 241656.0),
+    ("Fertility Specialist", "Mixed"): (209976.0, 830793.6, 809793.6),
+    ("Fertility Specialist", "Private"): (209976.0, 792000.0, 771000.0)
+}
+
+
+def run(profile, calculate=engine.run_calculations):
+    return calculate(
+        profile["practice"], profile["staff"], profile["billing"], profile["test_configs"],
+        profile["logistics"], profile["simplified_mode"]
+    )
+
+
+@pytest.mark.parametrize("specialty", list(engine.SPECIALTY_MBS))
+@pytest.mark.parametrize("billing_model", BILLING_MODELS)
+def test_matches_baseline(specialty, billing_model):
+    results = run(clinic(specialty, billing_model))
+    staff_costs, total_revenue, net_annual_benefit = BASELINE[specialty, billing_model]
+
+    assert results["staff_costs"] == pytest.approx(staff_costs, rel=1e-12)
+    assert results["total_annual_savings"] == pytest.approx(staff_costs, rel=1e-12)
+    assert results["total_revenue"] == pytest.approx(total_revenue, rel=1e-12)
+    assert results["net_annual_benefit"] == pytest.approx(net_annual_benefit, rel=1e-12)
+    assert results["additional_revenue"] == (0.0 if billing_model == "Bulk Bill" else 594000.0)
+    assert results["logistical_costs"] == 21000
+    assert results["total_doctor_hours_saved"] == 660.0
+    assert results["total_staff_hours_saved"] == 1420.0
+    assert results["potential_patient_savings"] == 2400.0
+
+def test_matches_baseline_advanced_mode():
+    profile = clinic("Fertility Specialist", "Mixed", (40, 12, 6), private_hourly=450, bulk_rate=30,
+                     weeks_year=46, consults_per_hour=2, simplified_mode=False)
+    profile["practice"]["operation_days"] = 4
+    profile["staff"]["doctor_hourly"] = 250
+    profile["test_configs"]["Core"]["Core"].update(admin_time=25, nurse_time=10, doctor_time=20)
+    profile["test_configs"]["Couples"]["Couples Complex Cases"].update(weekly_volume=3, research_time=30, genetic_time=45)
+
+    results = run(profile)
+    assert results["staff_costs"] == pytest.approx(384239.5333333333, rel=1e-12)
+    assert results["total_revenue"] == pytest.approx(1454754.6, rel=1e-12)
+    assert results["additional_revenue"] == pytest.approx(986700.0, rel=1e-12)
+    assert results["total_doctor_hours_saved"] == pytest.approx(1096.3333333333333, rel=1e-12)
+    assert results["total_staff_hours_saved"] == pytest.approx(2827.9266666666667, rel=1e-12)
+    assert results["potential_patient_savings"] == pytest.approx(99590.0, rel=1e-12)
+    assert results["net_annual_benefit"] == pytest.approx(1433754.6, rel=1e-12)
+
+def test_variants_table_sums_to_totals():
+    results = run(clinic("OB/GYN", "Mixed"))
+    variants = results["variants"]
+    assert len(variants["test_type"]) == 2 * len(engine.TEST_TYPES)
+    assert sum(variants["total_savings"]) == pytest.approx(results["total_annual_savings"])
+    assert sum(variants["patient_savings"]) == pytest.approx(results["potential_patient_savings"])
@@ -0,0 +1,61 @@
+"""The incremental calculator against a full recompute with the engine."""
+
+import copy
+import random
+
+import eugene_roi_engine as engine
+import eugene_roi_incremental as incremental
+from profiles import BILLING_MODELS, clinic, random_clinic
+
+
+def run(profile, calculate=engine.run_calculations):
+    return calculate(
+        profile["practice"], profile["staff"], profile["billing"], profile["test_configs"],
+        profile["logistics"], profile["simplified_mode"]
+    )
+
+
+def _change_one_input(profile, rng):
+    """A copy of `profile` with one input changed, the way a dashboard widget changes it."""
+    profile = copy.deepcopy(profile)
+    choice = rng.randrange(8)
+    if choice == 0:
+        category = rng.choice(list(profile["test_configs"]))
+        variant = rng.choice(list(profile["test_configs"][category]))
+        field = rng.choice(["weekly_volume", "admin_time", "doctor_time", "research_time", "genetic_time"])
+        profile["test_configs"][category][variant][field] = rng.randint(0, 100)
+    elif choice == 1:
+        profile["billing"] = {"model": rng.choice(BILLING_MODELS), "private_hourly": rng.randint(100, 800),
+                              "bulk_rate": rng.randint(0, 100)}
+    elif choice == 2:
+        profile["practice"]["consults_per_hour"] = rng.randint(1, 6)
+    elif choice == 3:
+        profile["practice"]["weeks_year"] = rng.randint(40, 52)
+    elif choice == 4:
+        profile["staff"][rng.choice(["admin_hourly", "nurse_hourly", "doctor_hourly", "genetic_hourly"])] = rng.randint(20, 300)
+    elif choice == 5:
+        profile["simplified_mode"] = not profile["simplified_mode"]
+    elif choice == 6:
+        profile["practice"]["specialty"] = rng.choice(list(engine.SPECIALTY_MBS))
+    else:
+        profile["logistics"] = rng.choice([{}, dict(engine.LOGISTICS_COSTS)])
+    return profile
+
+def test_incremental_matches_full_recompute_after_each_change():
+    rng = random.Random(3)
+    calculator = incremental.IncrementalCalculator()
+    profile = random_clinic(rng)
+    for _ in range(500):
+        profile = _change_one_input(profile, rng)
+        assert run(profile, calculator.run) == run(profile)
+
+def test_incremental_reuses_unchanged_variants():
+    calculator = incremental.IncrementalCalculator()
+    profile = clinic("GP", "Mixed")
+    run(profile, calculator.run)
+    assert calculator.last_run == {"computed": 12, "reused": 0}
+
+    # One variant's volume: only its savings and revenue nodes are recomputed
+    profile["test_configs"]["Comprehensive"]["Comprehensive"]["weekly_volume"] += 5
+    assert run(profile, calculator.run) == run(profile)
+    assert calculator.last_run == {"computed": 2, "reused": 10}
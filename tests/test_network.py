@@ -0,0 +1,28 @@
+"""Network site preparation and the per-site results against the engine."""
+
+import pytest
+
+import eugene_roi_batch as batch
+import eugene_roi_engine as engine
+import eugene_roi_network as network
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("False", False), ("no", False), ("0", False), (0, False),
+    ("TRUE", True), (" yes ", True), (1.0, True), (None, True)
+])
+def test_site_simplified_mode_parsing(value, expected):
+    sites = network.example_sites().head(1).assign(simplified_mode=[value])
+    assert network.prepare_sites(sites)["simplified_mode"].tolist() == [expected]
+
+def test_site_simplified_mode_rejects_other_values():
+    sites = network.example_sites().head(1).assign(simplified_mode=["maybe"])
+    with pytest.raises(ValueError, match="simplified_mode"):
+        network.prepare_sites(sites)
+
+def test_network_sites_match_engine():
+    sites = network.evaluate_sites(network.example_sites())
+    for _, site in sites.iterrows():
+        expected = engine.run_calculations(*network.site_profile(site))
+        for name in batch.OUTPUT_COLUMNS:
+            assert site[name] == pytest.approx(expected[name], rel=1e-9, abs=1e-6), name
@@ -0,0 +1,71 @@
+"""The test-mix optimizer against a brute-force search over every whole-number mix."""
+
+import itertools
+
+import numpy as np
+import pytest
+
+import eugene_roi_batch as batch
+import eugene_roi_engine as engine
+import eugene_roi_optimizer as optimizer
+from profiles import clinic
+
+
+def feasible(mix, usage, limits):
+    return all(np.dot(mix, usage[name]) <= limit + 1e-9 for name, limit in limits.items())
+
+def brute_force(profile, result, max_weekly_volume, capacity_share):
+    """Best net annual benefit over all feasible mixes, each evaluated with `run_calculations`."""
+    row = batch.profile_to_row(**profile)
+    ratios = np.array([result["complex_ratios"][category] for category in optimizer.CATEGORIES])
+    usage = optimizer.usage_per_test(row, ratios)
+    limits = optimizer.capacity(profile["practice"], profile["staff"], capacity_share)
+
+    best = -np.inf
+    for mix in itertools.product(range(max_weekly_volume + 1), repeat=len(optimizer.CATEGORIES)):
+        if not feasible(mix, usage, limits):
+            continue
+        configs = optimizer.apply_mix(profile["test_configs"], {
+            "optimal": dict(zip(optimizer.CATEGORIES, mix)), "complex_ratios": result["complex_ratios"]
+        })
+        results = engine.run_calculations(**{**profile, "test_configs": configs})
+        best = max(best, results["net_annual_benefit"])
+    return best
+
+@pytest.mark.parametrize("specialty, billing_model", [
+    ("GP", "Bulk Bill"), ("OB/GYN", "Mixed"), ("Fertility Specialist", "Private")
+])
+def test_optimizer_matches_brute_force(specialty, billing_model):
+    profile = clinic(specialty, billing_model, volumes=(3, 2, 1), consults_per_hour=1)
+    # One of everyone and a small testing share, so capacity binds inside the search box
+    profile["staff"].update(num_admin=1, num_nurse=1, num_doctor=1)
+    result = optimizer.optimize(**profile, capacity_share=0.1, max_weekly_volume=8)
+
+    assert result["optimal_value"] == pytest.approx(brute_force(profile, result, 8, 0.1), rel=1e-9)
+    assert result["optimal_usage"]["doctor"] <= result["limits"]["doctor"] + 1e-9
+
+def test_optimal_mix_respects_capacity():
+    profile = clinic("Fertility Specialist", "Mixed")
+    result = optimizer.optimize(**profile, capacity_share=0.1)
+
+    for name, limit in result["limits"].items():
+        assert result["optimal_usage"][name] <= limit + 1e-9
+    configs = optimizer.apply_mix(profile["test_configs"], result)
+    results = engine.run_calculations(**{**profile, "test_configs": configs})
+    assert results["net_annual_benefit"] == pytest.approx(result["optimal_value"])
+
+def test_coarse_search_matches_full_grid():
+    profile = clinic("OB/GYN", "Mixed", volumes=(10, 5, 2))
+    result = optimizer.optimize(**profile, capacity_share=0.1, max_weekly_volume=120)
+
+    row = batch.profile_to_row(**profile)
+    ratios = np.array([result["complex_ratios"][category] for category in optimizer.CATEGORIES])
+    usage = optimizer.usage_per_test(row, ratios)
+    axis = np.arange(121, dtype=float)
+    grid = np.stack(np.meshgrid(axis, axis, axis, indexing="ij"), axis=-1).reshape(-1, 3)
+    mask = np.ones(len(grid), dtype=bool)
+    for name, limit in result["limits"].items():
+        mask &= grid @ usage[name] <= limit + 1e-9
+    values = optimizer.evaluate_mixes(row, grid[mask], ratios)
+
+    assert result["optimal_value"] == pytest.approx(values.max(), rel=1e-9)
@@ -0,0 +1,59 @@
+"""Multi-year projection: NPV, IRR and payback on known cash flows, and year rows against the engine."""
+
+import pytest
+
+import eugene_roi_engine as engine
+import eugene_roi_projection as projection
+from profiles import clinic
+
+# No ramp-up, growth or indexation: every year is the steady-state engine result
+FLAT_PROJECTION = {
+    "years": 4, "ramp": [], "volume_growth": 0.0, "mbs_indexation": 0.0, "private_fee_growth": 0.0,
+    "salary_inflation": 0.0, "cost_inflation": 0.0, "discount_rate": 0.1, "upfront_cost": 500_000.0
+}
+
+
+def test_npv():
+    assert projection.npv([-100, 110], 0.1) == pytest.approx(0.0, abs=1e-12)
+    assert projection.npv([-100, 60, 60], 0.1) == pytest.approx(-100 + 60 / 1.1 + 60 / 1.21)
+    assert projection.npv([100, 100, 100], 0.0) == 300
+
+def test_irr():
+    assert projection.irr([-100, 110]) == pytest.approx(0.1)
+    assert projection.irr([-1000, 500, 400, 300]) == pytest.approx(0.1065168124, rel=1e-8)
+    flows = [-250, 40, 80, 120, 160]
+    assert projection.npv(flows, projection.irr(flows)) == pytest.approx(0.0, abs=1e-8)
+
+def test_irr_without_a_sign_change():
+    assert projection.irr([100, 50]) is None
+    assert projection.irr([-100, -50]) is None
+
+def test_payback_period():
+    assert projection.payback_period([-100, 30, 30, 60]) == pytest.approx(2 + 40 / 60)
+    assert projection.payback_period([-100, 100]) == 1.0
+    assert projection.payback_period([0, 10]) == 0.0
+    assert projection.payback_period([-100, 20, 20]) is None
+
+def test_flat_projection_repeats_the_engine_result():
+    profile = clinic("Fertility Specialist", "Mixed")
+    expected = engine.run_calculations(**profile)["net_annual_benefit"]
+
+    yearly = projection.project(**profile, projection=FLAT_PROJECTION)
+    assert yearly["net_annual_benefit"].tolist() == pytest.approx([expected] * 4)
+
+    summary = projection.summarize(yearly, FLAT_PROJECTION)
+    flows = [-500_000.0] + [expected] * 4
+    assert summary["npv"] == pytest.approx(projection.npv(flows, 0.1))
+    assert summary["payback_years"] == pytest.approx(500_000.0 / expected)
+
+def test_ramp_scales_year_one_volumes():
+    profile = clinic("GP", "Private")
+    yearly = projection.project(**profile, projection={**FLAT_PROJECTION, "ramp": [0.5]})
+    assert yearly["volume_factor"].tolist() == [0.5, 1.0, 1.0, 1.0]
+    assert yearly["staff_costs"][0] == pytest.approx(yearly["staff_costs"][1] / 2)
+
+def test_invalid_settings_are_rejected():
+    with pytest.raises(ValueError):
+        projection.settings({"years": 0})
+    with pytest.raises(ValueError):
+        projection.settings({"discount_rate": -1})